@@ -6,9 +6,12 @@ from return_types.action import Bid
 class BidHandler:
     """Manages the auction round"""
 
-    def __init__(self, bid_master: int, num_players: int) -> None:
+    def __init__(
+        self, bid_master: int, num_players: int, cow_card: int | None = None
+    ) -> None:
         self.bid_master = bid_master
         self.num_players = num_players
+        self.cow_card = cow_card  # the revealed cow which is auctioned
         self.bids: list[Bid] = []
         self.remaining_players: list[int] = [
             idx % num_players for idx in range(bid_master + 1, bid_master + num_players)
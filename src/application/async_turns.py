@@ -0,0 +1,172 @@
+import asyncio
+
+from action_handlers.bidding import BidHandler
+from application.play_auction import MAX_MONEY_CARD_CHOICES, PlayBidTurn
+from application.play_trade import PlayTradeTurn
+from application.show_stats import StatsHandler
+from application.simulation import MAX_TURNS, count_failed_actions
+from game.event_log import EventType
+from game.game import Game
+from game_config.game_config import GameConfig
+from interface.async_player_interface import AsyncPlayerInterface
+from io_handler.console_outputs import OutputHandler
+from return_types.action import ActionType
+from return_types.results import Result, ResultType
+
+
+class AsyncPlayBidTurn(PlayBidTurn):
+    """PlayBidTurn for AsyncPlayerInterfaces.
+
+    Each round the remaining bidders decide at the same time, all of them against
+    the highest bid at the start of the round. The decisions are applied in seating
+    order: a bid which an earlier bidder of the round already topped keeps the
+    player in the auction for the next round, an invalid bid is a pass like in
+    PlayBidTurn. Buy back and payment stay sequential"""
+
+    player_interfaces: list[AsyncPlayerInterface]
+
+    async def execute(self):
+        if self.game.card_stack.is_empty():
+            return Result(ResultType.FAILURE, "Card stack is empty")
+
+        auctioneer_idx = self.game.get_current_player_idx()
+
+        cow_draw = self._draw_and_reveal_card()
+
+        bid_handler = BidHandler(auctioneer_idx, self.game.num_players, cow_draw)
+
+        return await self.run_auction(bid_handler)
+
+    async def run_auction(self, bid_handler: BidHandler):
+        while not bid_handler.is_complete():
+            await self._run_auction_round(bid_handler)
+
+        winner_bid = bid_handler.get_winner_bid()
+
+        auctioneer_idx = self.game.get_current_player_idx()
+        wants_buy_back = False
+        if self._can_buy_back(winner_bid):
+            wants_buy_back = await self.player_interfaces[
+                auctioneer_idx
+            ].make_buy_back_decision(
+                self.game.get_player_view(auctioneer_idx), winner_bid
+            )
+            self.game.log_event(EventType.BUY_BACK, auctioneer_idx, wants_buy_back)
+        buyer, seller = self._get_buyer_and_seller(winner_bid, wants_buy_back)
+
+        cow_draw = bid_handler.cow_card
+        if GameConfig.AUTOMATIC_MONEY_CARD_CHOICE:
+            money_cards = self.game.get_player(buyer).get_optimal_payment(
+                winner_bid.value
+            )
+            return self._finish_auction(
+                cow_draw, buyer, seller, money_cards, winner_bid.value
+            )
+
+        for _ in range(MAX_MONEY_CARD_CHOICES):
+            money_cards = await self.player_interfaces[buyer].choose_money_cards(
+                self.game.get_player_view(buyer), winner_bid, buyer
+            )
+            res = self._check_money_cards(buyer, money_cards, winner_bid.value)
+            if res is None:
+                return self._finish_auction(
+                    cow_draw, buyer, seller, money_cards, winner_bid.value
+                )
+            self.output_handler.show_message(res.message)
+        return res
+
+    async def _run_auction_round(self, bid_handler: BidHandler):
+        bidders = list(bid_handler.remaining_players)
+        round_bid = bid_handler.get_highest_bid()
+        bids = await asyncio.gather(
+            *(
+                self.player_interfaces[idx].make_bid_decision(
+                    self.game.get_player_view(idx), bid_handler
+                )
+                for idx in bidders
+            )
+        )
+
+        for idx, bid in zip(bidders, bids):
+            if (
+                bid.value is not None
+                and round_bid < bid.value <= bid_handler.get_highest_bid()
+            ):
+                continue  # topped earlier in this round, asked again
+            self._apply_bid(idx, bid, bid_handler)
+
+            if bid_handler.is_complete():  # early break
+                break
+
+
+class AsyncPlayTradeTurn(PlayTradeTurn):
+    """PlayTradeTurn for AsyncPlayerInterfaces.
+
+    The contender answers the card count of the challenger, so the two offers are
+    asked one after the other like in PlayTradeTurn"""
+
+    player_interfaces: list[AsyncPlayerInterface]
+
+    async def execute(self):
+        current_player_idx = self.game.get_current_player_idx()
+        current_player_view = self.game.get_player_view(current_player_idx)
+        current_interface = self.player_interfaces[current_player_idx]
+
+        joint_cows = current_player_view.private.joint_cows
+
+        if not joint_cows:
+            return Result(ResultType.FAILURE, "There are no joint cows.")
+
+        enemy_idx, cow_type, cow_amount = await current_interface.make_trade_decision(
+            current_player_view, joint_cows
+        )
+
+        res = self._start_trade(enemy_idx, cow_type, cow_amount)
+        if res is not None:
+            return res
+
+        trade_challenger = await current_interface.make_trade_offer(current_player_view)
+        res = self._set_challenger_offer(trade_challenger)
+        if res is not None:
+            return res
+
+        trade_contender = await self.player_interfaces[enemy_idx].make_trade_offer(
+            self.game.get_player_view(enemy_idx), trade_challenger.card_count
+        )
+        res = self._set_contender_offer(trade_contender)
+        if res is not None:
+            return res
+
+        return self._finish_trade()
+
+
+async def play_game_async(
+    game: Game,
+    player_interfaces: list[AsyncPlayerInterface],
+    output_handler: OutputHandler,
+    max_turns: int = MAX_TURNS,
+) -> bool:
+    """Async play_game. Returns False if the game did not finish"""
+    bid_turn = AsyncPlayBidTurn(player_interfaces, output_handler, game)
+    trade_turn = AsyncPlayTradeTurn(player_interfaces, output_handler, game)
+    stats_handler = StatsHandler(output_handler, game)
+    failed_actions = 0
+
+    while game.is_game_over() is None:
+        if game.get_current_turn() >= max_turns or game.is_stalled():
+            return False
+
+        current_player_idx = game.get_current_player_idx()
+        action = await player_interfaces[current_player_idx].choose_action(
+            game.get_player_view(current_player_idx)
+        )
+        match action:
+            case ActionType.BID:
+                res = await bid_turn.execute()
+            case ActionType.TRADE:
+                res = await trade_turn.execute()
+            case ActionType.STATS:
+                res = stats_handler.execute()
+        failed_actions = count_failed_actions(game, res, failed_actions)
+
+    return True
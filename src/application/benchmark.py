@@ -0,0 +1,233 @@
+import gc
+import json
+import platform
+import random
+import time
+from collections.abc import Callable
+
+from application.play_auction import PlayBidTurn
+from application.play_trade import PlayTradeTurn
+from application.simulation import play_game, simulate
+from game.game import Game
+from game_config.game_config import GameConfig
+from interface.bot_interface import BotPlayer
+from io_handler.console_outputs import NullOutputHandler
+from player.payment_index import PaymentIndex
+from player.payment_solver import MoneyPay
+
+MIN_TIME = 0.2  # seconds per repeat of a benchmark
+REPEATS = 5  # the fastest repeat counts, the others are noise
+THRESHOLD = 0.2  # slowdown against the baseline which counts as regression
+SEED = 0
+
+# A benchmark is set up once and returns a run function. A run does a fixed amount
+# of work with fixed seeds and returns its number of operations, reported as ops/s
+Benchmark = Callable[[], Callable[[], int]]
+
+
+def _new_game(seed: int, num_players: int = 4, turns: int = 0) -> Game:
+    game = Game(num_players, [f"Player {i}" for i in range(num_players)], seed=seed)
+    game.start_game()
+    bots = [BotPlayer(i, seed * 10 + i) for i in range(num_players)]
+    play_game(game, bots, NullOutputHandler(), max_turns=turns)
+    return game
+
+
+def _mid_games(n_games: int = 20) -> list[Game]:
+    """Games of fixed seeds at different stages"""
+    return [_new_game(seed, turns=seed % 10 * 4) for seed in range(n_games)]
+
+
+def bench_optimal_pay(max_cards: int) -> Benchmark:
+    def setup():
+        rng = random.Random(SEED)
+        values = GameConfig.MONEY_CARD_VALUES
+        payments = []
+        for _ in range(200):
+            cards = [0] * len(values)
+            for _ in range(rng.randint(1, max_cards)):
+                cards[rng.randrange(len(values))] += 1
+            value = sum(k * v for k, v in zip(cards, values))
+            payments.append((rng.randint(1, max(value, 1)), cards))
+        solver = MoneyPay()
+
+        def run():
+            MoneyPay.clear_cache()  # every payment is solved, not looked up
+            for target, cards in payments:
+                solver.optimal_pay(target, cards)
+            return len(payments)
+
+        return run
+
+    return setup
+
+
+def bench_payment_index():
+    """Payments and income of one inventory, with the min payment of a few bids
+    after every change"""
+    rng = random.Random(SEED)
+    changes = []
+    money = list(GameConfig.STARTING_MONEY)
+    for _ in range(100):
+        paid = [0] + [min(a, rng.randint(0, 1)) for a in money[1:]]
+        money = [a - b for a, b in zip(money, paid)]
+        income = [0] + [rng.randint(0, 1) for _ in money[1:]]
+        money = [a + b for a, b in zip(money, income)]
+        changes.append((paid, income))
+
+    def run():
+        index = PaymentIndex(GameConfig.STARTING_MONEY)
+        for paid, income in changes:
+            index.remove_money(paid)
+            for target in range(0, 200, 20):
+                index.min_payment(target)
+            index.add_money(income)
+        return len(changes)
+
+    return run
+
+
+def bench_player_view():
+    games = _mid_games()
+
+    def run():
+        for game in games:
+            game._view_version = None  # drops the cached views, as a move does
+            for idx in range(game.num_players):
+                game.get_player_view(idx)
+        return len(games)
+
+    return run
+
+
+def bench_cow_trades():
+    games = _mid_games()
+
+    def run():
+        for game in games:
+            for idx in range(game.num_players):
+                game.get_possible_cow_trades(idx)
+        return len(games) * 4
+
+    return run
+
+
+def _reseed_bots(bots: list[BotPlayer]):
+    """Every run makes the same decisions, like the first one"""
+    for i, bot in enumerate(bots):
+        bot.rng.seed(i)
+
+
+def bench_auction_round():
+    games = [game for game in _mid_games() if not game.card_stack.is_empty()]
+    turns = [
+        PlayBidTurn([BotPlayer(i, i) for i in range(4)], NullOutputHandler(), game)
+        for game in games
+    ]
+
+    def run():
+        for game, turn in zip(games, turns):
+            _reseed_bots(turn.player_interfaces)
+            game.push()
+            turn.execute()
+            game.pop()
+        return len(games)
+
+    return run
+
+
+def bench_trade_round():
+    games = [game for game in _mid_games() if game.get_possible_cow_trades()]
+    turns = [
+        PlayTradeTurn([BotPlayer(i, i) for i in range(4)], NullOutputHandler(), game)
+        for game in games
+    ]
+
+    def run():
+        for game, turn in zip(games, turns):
+            _reseed_bots(turn.player_interfaces)
+            game.push()
+            turn.execute()
+            game.pop()
+        return len(games)
+
+    return run
+
+
+def bench_games():
+    def run():
+        simulate(20, lambda seed: [BotPlayer(i, seed * 10 + i) for i in range(4)], SEED)
+        return 20
+
+    return run
+
+
+BENCHMARKS: dict[str, Benchmark] = {
+    "optimal_pay_small": bench_optimal_pay(5),
+    "optimal_pay_medium": bench_optimal_pay(15),
+    "optimal_pay_large": bench_optimal_pay(40),
+    "payment_index": bench_payment_index,
+    "player_view": bench_player_view,
+    "cow_trades": bench_cow_trades,
+    "auction_round": bench_auction_round,
+    "trade_round": bench_trade_round,
+    "games": bench_games,
+}
+
+
+def measure(run: Callable[[], int], min_time: float, repeats: int) -> float:
+    """Returns the ops/s of the fastest repeat. Like timeit, the garbage collector
+    is off while measuring"""
+    run()  # warm up
+    best = 0.0
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeats):
+            ops = 0
+            start = time.perf_counter()
+            while (duration := time.perf_counter() - start) < min_time:
+                ops += run()
+            best = max(best, ops / duration)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return best
+
+
+def run_benchmarks(
+    names: list[str] | None = None,
+    min_time: float = MIN_TIME,
+    repeats: int = REPEATS,
+) -> dict[str, float]:
+    """Returns the ops/s per benchmark, of all benchmarks by default"""
+    results = {}
+    for name in names or BENCHMARKS:
+        results[name] = measure(BENCHMARKS[name](), min_time, repeats)
+    return results
+
+
+def save_baseline(results: dict[str, float], path: str) -> None:
+    baseline = {"python": platform.python_version(), "ops_per_s": results}
+    with open(path, "w") as file:
+        json.dump(baseline, file, indent=2)
+
+
+def load_baseline(path: str) -> dict[str, float]:
+    with open(path) as file:
+        return json.load(file)["ops_per_s"]
+
+
+def compare(
+    results: dict[str, float], baseline: dict[str, float], threshold: float = THRESHOLD
+) -> dict[str, float]:
+    """Returns the ratio to the baseline of the benchmarks which got slower than
+    1 - threshold. Benchmarks missing on either side are skipped"""
+    regressions = {}
+    for name, ops in results.items():
+        if name not in baseline:
+            continue
+        ratio = ops / baseline[name]
+        if ratio < 1 - threshold:
+            regressions[name] = ratio
+    return regressions
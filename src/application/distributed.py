@@ -0,0 +1,215 @@
+import json
+import socket
+import threading
+import time
+from collections import deque
+from dataclasses import asdict
+
+from application.tournament import BotFactory, Tournament, play_batch
+from return_types.results import MatchupResult
+
+# Coordinator and workers exchange one JSON object per line over plain TCP.
+# worker -> coordinator: ready, heartbeat, result
+# coordinator -> worker: task, done
+HEARTBEAT_INTERVAL = 1.0  # seconds between heartbeats of a worker
+HEARTBEAT_TIMEOUT = 5.0  # a worker without message for this long is dead
+
+
+def send_message(
+    conn: socket.socket, message: dict, lock: "threading.Lock | None" = None
+):
+    data = (json.dumps(message) + "\n").encode()
+    if lock is None:
+        conn.sendall(data)
+    else:
+        with lock:
+            conn.sendall(data)
+
+
+class Coordinator:
+    """Hands out the batches of a tournament to connected workers"""
+
+    def __init__(
+        self,
+        tournament: Tournament,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        heartbeat_timeout: float = HEARTBEAT_TIMEOUT,
+    ):
+        self.tournament = tournament
+        self.heartbeat_timeout = heartbeat_timeout
+        self._server = socket.create_server((host, port))
+        self.address = self._server.getsockname()
+
+        self._tasks = dict(enumerate(tournament.get_batches()))
+        self._pending = deque(self._tasks)
+        self._results: dict[int, MatchupResult] = {}
+        self._workers: dict[socket.socket, tuple[float, set[int]]] = {}
+        self._condition = threading.Condition()
+        threading.Thread(target=self._accept_workers, daemon=True).start()
+
+    def run(self) -> dict[tuple[str, ...], MatchupResult]:
+        """Serves workers until every batch has a result. Returns merged results"""
+        with self._condition:
+            while len(self._results) < len(self._tasks):
+                self._condition.wait(timeout=self.heartbeat_timeout / 4)
+                self._drop_dead_workers()
+            self._condition.notify_all()  # idle workers are told that we are done
+        self._server.close()
+
+        matchups = {}
+        for batch in self._results.values():
+            if batch.lineup in matchups:
+                matchups[batch.lineup].merge(batch)
+            else:
+                matchups[batch.lineup] = batch
+        return matchups
+
+    def _accept_workers(self):
+        while True:
+            try:
+                conn, _ = self._server.accept()
+            except OSError:  # server was closed
+                return
+            with self._condition:
+                self._workers[conn] = (time.monotonic(), set())
+            threading.Thread(
+                target=self._serve_worker, args=(conn,), daemon=True
+            ).start()
+
+    def _drop_dead_workers(self):
+        """Closes busy workers without heartbeat. Their handlers requeue the tasks"""
+        now = time.monotonic()
+        for conn, (last_seen, assigned) in self._workers.items():
+            if assigned and now - last_seen > self.heartbeat_timeout:
+                try:
+                    conn.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+
+    def _serve_worker(self, conn: socket.socket):
+        try:
+            for line in conn.makefile("r"):
+                message = json.loads(line)
+                with self._condition:
+                    _, assigned = self._workers[conn]
+                    self._workers[conn] = (time.monotonic(), assigned)
+
+                match message["type"]:
+                    case "ready":
+                        task_id = self._next_task(conn)
+                        if task_id is None:
+                            send_message(conn, {"type": "done"})
+                            return
+                        lineup, seed, n_games = self._tasks[task_id]
+                        task = {
+                            "type": "task",
+                            "task_id": task_id,
+                            "lineup": lineup,
+                            "seed": seed,
+                            "n_games": n_games,
+                            "max_turns": self.tournament.max_turns,
+                        }
+                        send_message(conn, task)
+                    case "result":
+                        self._add_result(conn, message)
+        except (OSError, ValueError):
+            pass
+        finally:
+            self._remove_worker(conn)
+
+    def _next_task(self, conn: socket.socket) -> int | None:
+        """Waits for a pending task. Returns None if all tasks are finished"""
+        with self._condition:
+            while not self._pending:
+                if len(self._results) == len(self._tasks):
+                    return None
+                self._condition.wait()
+            task_id = self._pending.popleft()
+            _, assigned = self._workers[conn]
+            assigned.add(task_id)
+            # heartbeats were not read while waiting, the worker starts fresh
+            self._workers[conn] = (time.monotonic(), assigned)
+            return task_id
+
+    def _add_result(self, conn: socket.socket, message: dict):
+        result = message["result"]
+        result["lineup"] = tuple(result["lineup"])
+        with self._condition:
+            self._workers[conn][1].discard(message["task_id"])
+            self._results.setdefault(message["task_id"], MatchupResult(**result))
+            self._condition.notify_all()
+
+    def _remove_worker(self, conn: socket.socket):
+        """Requeues the unfinished tasks of a disconnected worker"""
+        with self._condition:
+            _, assigned = self._workers.pop(conn, (None, set()))
+            for task_id in assigned:
+                if task_id not in self._results:
+                    self._pending.appendleft(task_id)
+            self._condition.notify_all()
+        conn.close()
+
+
+class Worker:
+    """Plays the batches of a coordinator and sends back the results"""
+
+    def __init__(
+        self,
+        bots: dict[str, BotFactory],
+        host: str,
+        port: int,
+        heartbeat_interval: float = HEARTBEAT_INTERVAL,
+    ):
+        self.bots = bots
+        self.address = (host, port)
+        self.heartbeat_interval = heartbeat_interval
+
+    def run(self) -> int:
+        """Works until the coordinator is done. Returns the number of played batches"""
+        played_batches = 0
+        send_lock = threading.Lock()
+        stop = threading.Event()
+
+        with socket.create_connection(self.address) as conn:
+            heartbeat = threading.Thread(
+                target=self._send_heartbeats, args=(conn, send_lock, stop), daemon=True
+            )
+            heartbeat.start()
+            try:
+                reader = conn.makefile("r")
+                send_message(conn, {"type": "ready"}, send_lock)
+                for line in reader:
+                    message = json.loads(line)
+                    if message["type"] == "done":
+                        break
+
+                    lineup = tuple(message["lineup"])
+                    result = play_batch(
+                        lineup,
+                        [self.bots[name] for name in lineup],
+                        message["seed"],
+                        message["n_games"],
+                        message["max_turns"],
+                    )
+                    played_batches += 1
+                    reply = {
+                        "type": "result",
+                        "task_id": message["task_id"],
+                        "result": asdict(result),
+                    }
+                    send_message(conn, reply, send_lock)
+                    send_message(conn, {"type": "ready"}, send_lock)
+            except OSError:  # coordinator is gone
+                pass
+            finally:
+                stop.set()
+
+        return played_batches
+
+    def _send_heartbeats(self, conn, send_lock, stop):
+        while not stop.wait(self.heartbeat_interval):
+            try:
+                send_message(conn, {"type": "heartbeat"}, send_lock)
+            except OSError:
+                return
@@ -0,0 +1,297 @@
+from dataclasses import dataclass
+
+from game.game import Game
+from game_config.game_config import GameConfig
+from interface.transposition_table import TranspositionTable
+from player import packed_money
+from player.payment_solver import MoneyPay
+from player.players import get_cow_type_id, get_cow_type_value
+
+SEARCH_DEPTH = 2  # trade turns searched before the state is estimated
+OFFER_SHARES = (0.25, 0.5)  # searched challenger offers, share of own money
+MAX_PLAY_OUT_TURNS = 200  # play_out gives up on endgames which take longer
+
+# cow values by dense cow type id, see players.get_cow_type_id
+COW_CARDS = tuple(
+    get_cow_type_value(cow_type)
+    for cow_type in range(
+        len(set(GameConfig.COW_CARD_VALUES) | set(GameConfig.STARTING_COWS))
+    )
+)
+
+
+@dataclass(frozen=True)
+class TradeMove:
+    """One trade turn: the challenge, both offers and the winner (None on a draw).
+
+    Offers are packed money, see packed_money"""
+
+    challenger: int
+    enemy_idx: int
+    cow_card: int
+    cow_amount: int
+    challenger_offer: int
+    contender_offer: int
+    winner: int | None
+
+
+@dataclass(frozen=True)
+class EndgameState:
+    """Everything the trades after the stack is empty depend on.
+
+    Names, the stack and the bank do not matter any more, so equal positions of
+    different games are equal states. Hashable, it is the key of the memo"""
+
+    money: tuple[int, ...]  # packed money per player
+    cows: tuple[tuple[int, ...], ...]  # cow counts per player and cow type id
+    finished: tuple[tuple[int, int], ...]  # value and number of quartets per player
+    active_players: tuple[int, ...]
+    current_player: int
+
+    @classmethod
+    def from_game(cls, game: Game) -> "EndgameState":
+        players = game.get_all_players()
+        return cls(
+            tuple(player.get_packed_money() for player in players),
+            tuple(
+                tuple(player.get_cow_count(cow_card) for cow_card in COW_CARDS)
+                for player in players
+            ),
+            tuple(
+                (sum(player.get_finished_cows()), len(player.get_finished_cows()))
+                for player in players
+            ),
+            tuple(game.get_active_players()),
+            game.get_current_player_idx(),
+        )
+
+    def get_scores(self) -> tuple[int, ...]:
+        return tuple(value * 4 * number for value, number in self.finished)
+
+    def estimate_scores(self) -> tuple[float, ...]:
+        """Final scores if every held cow counted as a quarter of a quartet"""
+        scores = []
+        for (value, number), counts in zip(self.finished, self.cows):
+            for cow_card, count in zip(COW_CARDS, counts):
+                value += cow_card * count / 4
+                number += count / 4
+            scores.append(value * 4 * number)
+        return tuple(scores)
+
+    def is_over(self) -> bool:
+        return not any(any(counts) for counts in self.cows)
+
+    def is_stalled(self) -> bool:
+        """Returns True if no two players share a cow type"""
+        return all(
+            sum(1 for counts in self.cows if counts[cow_type]) < 2
+            for cow_type in range(len(COW_CARDS))
+        )
+
+    def get_joint_cow_types(self) -> dict[int, list[int]]:
+        """Returns the cow type ids the current player shares, per other player"""
+        own = self.cows[self.current_player]
+        joint = {}
+        for idx, counts in enumerate(self.cows):
+            if idx == self.current_player:
+                continue
+            cow_types = [t for t, count in enumerate(counts) if count and own[t]]
+            if cow_types:
+                joint[idx] = cow_types
+        return joint
+
+    def play(self, move: TradeMove | None) -> "EndgameState":
+        """Returns the state after the trade (None skips it) and the end of the turn"""
+        money = list(self.money)
+        cows = [list(counts) for counts in self.cows]
+        finished = list(self.finished)
+
+        if move is not None and move.winner is not None:
+            cow_type = get_cow_type_id(move.cow_card)
+            loser = (
+                move.enemy_idx if move.winner == move.challenger else move.challenger
+            )
+            cows[loser][cow_type] -= move.cow_amount
+            cows[move.winner][cow_type] += move.cow_amount
+            if cows[move.winner][cow_type] >= 4:
+                cows[move.winner][cow_type] -= 4
+                value, number = finished[move.winner]
+                finished[move.winner] = (value + move.cow_card, number + 1)
+
+            money[move.challenger] += move.contender_offer - move.challenger_offer
+            money[move.enemy_idx] += move.challenger_offer - move.contender_offer
+
+        # players without cows leave, the turn passes on like in Game.set_next_player
+        active_players = tuple(idx for idx in self.active_players if any(cows[idx]))
+        current_player = self.current_player
+        if len(active_players) > 1:
+            if current_player in active_players:
+                position = active_players.index(current_player) + 1
+            else:
+                position = sum(1 for idx in active_players if idx < current_player)
+            current_player = active_players[position % len(active_players)]
+
+        return EndgameState(
+            tuple(money),
+            tuple(tuple(counts) for counts in cows),
+            tuple(finished),
+            active_players,
+            current_player,
+        )
+
+
+def get_utility(scores: tuple[float, ...], player_idx: int) -> float:
+    """Lead of the player over the best other player"""
+    others = max(score for idx, score in enumerate(scores) if idx != player_idx)
+    return scores[player_idx] - others
+
+
+class EndgameSolver:
+    """Depth limited search over the trades once the stack is empty.
+
+    The solver sees all money. Every player maximizes its lead (max^n). The
+    challenger picks the enemy, cow and offer, the challenged player answers with
+    an empty offer or the cheapest payment which beats the offer. The search runs
+    on EndgameState instead of the Game and memoizes the states in a transposition
+    table, so it is much cheaper than playing the turns"""
+
+    def __init__(
+        self,
+        depth: int = SEARCH_DEPTH,
+        table: TranspositionTable | None = None,
+    ):
+        self.depth = depth
+        self.table = table if table is not None else TranspositionTable()
+        self.pay_solver = MoneyPay()
+        self.nodes = 0  # searched states, for statistics
+
+    def solve(self, game: Game) -> tuple[tuple[float, ...], TradeMove | None]:
+        """Returns the expected scores and the best move of the current player"""
+        if not game.card_stack.is_empty():
+            raise ValueError("The endgame starts once the stack is empty")
+        self.table.new_search()
+        return self._search(EndgameState.from_game(game), self.depth)
+
+    def play_out(self, game: Game, max_turns: int = MAX_PLAY_OUT_TURNS) -> bool:
+        """Plays the best moves until the game is over. Returns False if it did not
+        finish"""
+        for _ in range(max_turns):
+            if game.is_game_over() is not None:
+                return True
+            if game.is_stalled():
+                return False
+            _, move = self.solve(game)
+            if move is None:
+                game.end_turn()
+            else:
+                self.apply(game, move)
+        return game.is_game_over() is not None
+
+    @staticmethod
+    def apply(game: Game, move: TradeMove):
+        """Plays the trade like PlayTradeTurn and ends the turn"""
+        if move.winner is not None:
+            loser = (
+                move.enemy_idx if move.winner == move.challenger else move.challenger
+            )
+            game.handle_trade(
+                move.cow_card,
+                move.cow_amount,
+                move.enemy_idx,
+                packed_money.unpack(move.challenger_offer),
+                packed_money.unpack(move.contender_offer),
+                move.winner,
+                loser,
+            )
+        game.end_turn()
+
+    def get_moves(self, state: EndgameState) -> list[TradeMove]:
+        """Returns every searched trade of the current player and both answers"""
+        challenger = state.current_player
+        own = state.cows[challenger]
+        moves = []
+
+        for enemy_idx, cow_types in state.get_joint_cow_types().items():
+            enemy_money = state.money[enemy_idx]
+            enemy_value = packed_money.value(enemy_money)
+            for offer in self._get_offers(state.money[challenger], enemy_value):
+                value = packed_money.value(offer)
+                # an empty answer loses the trade, or draws against an empty offer
+                answers = [(0, challenger if value else None)]
+                if enemy_value > value:
+                    payment = self.pay_solver.optimal_pay_packed(value + 1, enemy_money)
+                    answers.append((packed_money.pack(payment), enemy_idx))
+
+                for cow_type in cow_types:
+                    amount = min(own[cow_type], state.cows[enemy_idx][cow_type])
+                    for answer, winner in answers:
+                        moves.append(
+                            TradeMove(
+                                challenger,
+                                enemy_idx,
+                                COW_CARDS[cow_type],
+                                amount,
+                                offer,
+                                answer,
+                                winner,
+                            )
+                        )
+        return moves
+
+    def _get_offers(self, money: int, enemy_value: int) -> list[int]:
+        """The offer which cannot be beaten if affordable, a few shares of the money
+        and the cheapest offer. An empty offer only draws or loses, so it is only
+        made without money.
+
+        The strongest offer comes first and wins ties, as real opponents do not see
+        the value of an offer and may answer it badly"""
+        money_value = packed_money.value(money)
+        if not money_value:
+            return [0]
+
+        targets = {1} | {int(money_value * share) for share in OFFER_SHARES}
+        if enemy_value < money_value:
+            targets.add(enemy_value + 1)
+
+        offers = []
+        for target in sorted(targets, reverse=True):
+            payment = self.pay_solver.optimal_pay_packed(target, money)
+            if payment is not None and packed_money.pack(payment) not in offers:
+                offers.append(packed_money.pack(payment))
+        return offers
+
+    def _search(
+        self, state: EndgameState, depth: int
+    ) -> tuple[tuple[float, ...], TradeMove | None]:
+        self.nodes += 1
+        if state.is_over() or state.is_stalled():
+            return state.get_scores(), None
+        if depth == 0:
+            return state.estimate_scores(), None
+
+        key = hash(state)
+        cached = self.table.get(key, depth)
+        if cached is not None and cached[0] == state:
+            return cached[1]
+
+        # the challenged player picks its answer, the challenger the best challenge
+        answers: dict[tuple, tuple[tuple[float, ...], TradeMove]] = {}
+        for move in self.get_moves(state):
+            values, _ = self._search(state.play(move), depth - 1)
+            challenge = (move.enemy_idx, move.cow_card, move.challenger_offer)
+            best = answers.get(challenge)
+            if best is None or get_utility(values, move.enemy_idx) > get_utility(
+                best[0], move.enemy_idx
+            ):
+                answers[challenge] = (values, move)
+
+        if answers:
+            result = max(
+                answers.values(),
+                key=lambda answer: get_utility(answer[0], state.current_player),
+            )
+        else:  # the current player cannot trade, the turn is skipped
+            result = (self._search(state.play(None), depth - 1)[0], None)
+
+        self.table.store(key, (state, result), depth)
+        return result
@@ -0,0 +1,462 @@
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from application.async_turns import play_game_async
+from application.simulation import MAX_TURNS
+from game.game import Game
+from game.player_view import PlayerView
+from interface.async_player_interface import AsyncPlayerAdapter, AsyncPlayerInterface
+from interface.player_interface import PlayerInterface
+from io_handler.console_inputs import ConsoleInputHandler
+from io_handler.console_outputs import OutputHandler
+from return_types.action import ActionType, Bid, Trade
+from return_types.results import GameResult, LatencyStats, Result, ResultType
+
+# Remote players talk to their table with one message per line.
+# client -> server: JOIN <table> <name>, then one answer line per ASK
+# server -> client: SEATED <idx> or REJECTED <reason>, INFO <text>, ASK <kind> <prompt>,
+#                   ERROR <message> (the question is asked again),
+#                   END <finished 0/1> <comma separated scores>
+# The kind of a question is the name of the console parser of the answer:
+# action, int, bid, idx_or_name, int_list or binary_choice
+ANSWER_TIMEOUT = 300.0  # seconds a remote player may think before the table stops
+MAX_TABLES = 256  # tables playing at the same time, further tables wait
+
+
+class RemoteSeat:
+    """Connection of a remote player, used by the table task on the event loop"""
+
+    def __init__(self, writer: asyncio.StreamWriter):
+        self._writer = writer
+        self._answers: asyncio.Queue[str | None] = asyncio.Queue()
+
+    def send(self, line: str):
+        if not self._writer.is_closing():
+            self._writer.write((line + "\n").encode())
+
+    def close(self):
+        self._writer.close()
+
+    async def ask(self, question: str, timeout: float) -> str:
+        """Sends the question and waits for the answer. Only the table of the seat
+        waits, the event loop keeps serving the other tables"""
+        self.send(question)
+        answer = await asyncio.wait_for(self._answers.get(), timeout)
+        if answer is None:
+            raise ConnectionError("The player disconnected")
+        return answer
+
+    def put_answer(self, answer: str | None):
+        """Called by the event loop for every line, None after the disconnect"""
+        self._answers.put_nowait(answer)
+
+
+class RemoteInputHandler(ConsoleInputHandler):
+    """Asks the questions of the console over the line protocol of a seat.
+
+    The questions are awaited instead of read from input(). Answers are checked
+    with the console parsers and validators, invalid answers are reported with
+    ERROR and the question is asked again"""
+
+    def __init__(
+        self, player_names: list[str], seat: RemoteSeat, answer_timeout: float
+    ):
+        super().__init__(player_names)
+        self.seat = seat
+        self.answer_timeout = answer_timeout
+
+    async def ask_for_action(self, player_idx: int) -> ActionType:
+        return await self._ask_until_valid(
+            "Choose an action: bid/trade/stats", self._parse_action
+        )
+
+    async def ask_for_bid(self, player_idx: int, highest_bid: int) -> Bid:
+        bid = await self._ask_until_valid(
+            f"{self.player_names[player_idx]}, the highest bid is {highest_bid}. "
+            "Enter your bid or pass (p):",
+            self._parse_bid,
+            self._validate_bid,
+        )
+        return Bid(player_idx, bid or None)
+
+    async def ask_for_buy_back(self, player_idx: int, highest_bid: Bid) -> bool:
+        return await self._ask_until_valid(
+            f"{self.player_names[player_idx]}, do you want to buy back the cow for "
+            f"{highest_bid.value}? (y/n):",
+            self._parse_binary_choice,
+        )
+
+    async def ask_for_money_cards(self, highest_bid: Bid, buyer: int) -> list[int]:
+        return await self._ask_until_valid(
+            f"{self.player_names[buyer]} choose your money cards to pay "
+            f'{highest_bid.value}? Separate with ",":',
+            self._parse_int_list,
+            self._validate_money_list,
+        )
+
+    async def ask_for_trade(self, joint_cows) -> tuple[int, int, int]:
+        for idx in joint_cows:
+            self._show(f"{self.player_names[idx]} ({idx}) has {joint_cows[idx]}")
+        contender = await self._ask_until_valid(
+            "Choose contender (idx or name):",
+            self._parse_idx_or_name,
+            self._validate_player_idx,
+        )
+        cow_type = await self._ask_until_valid(
+            "Choose cow type:", self._parse_int, self._validate_positive_int
+        )
+        amount = await self._ask_until_valid(
+            "Choose amount of cows:", self._parse_int, self._validate_positive_int
+        )
+        return contender, cow_type, amount
+
+    async def ask_for_trade_offer(
+        self, player_idx: int, card_count: int | None
+    ) -> Trade:
+        if card_count is None:
+            prompt = f"{self.player_names[player_idx]}, how much do you want to bid?"
+        else:
+            prompt = (
+                f"{self.player_names[player_idx]}, {card_count} cards were bidden, "
+                "what do you want to bid?"
+            )
+        offer = await self._ask_until_valid(
+            prompt, self._parse_int_list, self._validate_money_list
+        )
+        return Trade(player_idx, offer)
+
+    def _show(self, message: str):
+        self.seat.send(f"INFO {message}")
+
+    async def _ask_until_valid(
+        self,
+        prompt: str,
+        parser: Callable[[str], tuple[Result, Any]],
+        validator: Callable[[Any], Result] | None = None,
+    ) -> Any:
+        kind = parser.__name__.removeprefix("_parse_")
+        while True:
+            raw_input = await self.seat.ask(f"ASK {kind} {prompt}", self.answer_timeout)
+            parse_result, parsed_value = parser(raw_input.strip())
+            if parse_result.type == ResultType.FAILURE:
+                self.seat.send(f"ERROR {parse_result.message}")
+                continue
+            if validator:
+                validate_result = validator(parsed_value)
+                if validate_result.type == ResultType.FAILURE:
+                    self.seat.send(f"ERROR {validate_result.message}")
+                    continue
+            return parsed_value
+
+
+class RemotePlayer(AsyncPlayerInterface):
+    """HumanPlayer of a remote seat, the decisions are awaited answers"""
+
+    def __init__(self, player_idx: int, input_handler: RemoteInputHandler):
+        self.player_idx = player_idx
+        self.input_handler = input_handler
+
+    async def choose_action(self, view):
+        return await self.input_handler.ask_for_action(self.player_idx)
+
+    async def make_bid_decision(self, view, bid_handler):
+        return await self.input_handler.ask_for_bid(
+            self.player_idx, bid_handler.get_highest_bid()
+        )
+
+    async def make_buy_back_decision(self, view, highest_bid):
+        return await self.input_handler.ask_for_buy_back(self.player_idx, highest_bid)
+
+    async def choose_money_cards(self, view, highest_bid, buyer_idx):
+        return await self.input_handler.ask_for_money_cards(highest_bid, buyer_idx)
+
+    async def make_trade_decision(self, view, joint_cows):
+        return await self.input_handler.ask_for_trade(joint_cows)
+
+    async def make_trade_offer(self, view, card_count=None):
+        return await self.input_handler.ask_for_trade_offer(self.player_idx, card_count)
+
+
+class RemoteOutputHandler(OutputHandler):
+    """Shows the table events to its remote players, the stats only to their owner"""
+
+    def __init__(self, seats: dict[int, RemoteSeat]):
+        self.seats = seats
+
+    def show_message(self, message: str):
+        for seat in self.seats.values():
+            seat.send(f"INFO {message}")
+
+    def show_cow_draw(self, cow_value: int):
+        self.show_message(f"Bid for COW {cow_value}!")
+
+    def show_donkey_event(self, money_value: int):
+        self.show_message(
+            f"It's a donkey! The bank will give each player {money_value} money."
+        )
+
+    def show_last_card_drawn(self):
+        self.show_message("Last card was drawn.")
+
+    def show_stats(self, player_view: PlayerView, card_stack_count: int):
+        seat = self.seats.get(player_view.current_player_idx)
+        if seat is None:
+            return
+        seat.send(f"INFO Cards left: {card_stack_count}")
+        for pub_view in player_view.public:
+            seat.send(
+                f"INFO {pub_view.player_name} has {pub_view.money_cards_count} money "
+                f"cards, {pub_view.cow_cards} cows, {pub_view.score} score"
+            )
+        seat.send(f"INFO Your money cards: {player_view.private.money_card_values}")
+
+    def show_final_score(self, player_view: PlayerView):
+        for view in player_view.public:
+            self.show_message(f"{view.player_name} has {view.score} points.")
+
+
+class TimedPlayer(AsyncPlayerInterface):
+    """Adds the duration of every decision of a player interface to the samples"""
+
+    def __init__(self, interface: AsyncPlayerInterface, samples: list[float]):
+        self.interface = interface
+        self.samples = samples
+
+    async def _timed(self, decide: Callable[..., Awaitable], *args):
+        start = time.perf_counter()
+        try:
+            return await decide(*args)
+        finally:
+            self.samples.append(time.perf_counter() - start)
+
+    async def choose_action(self, view):
+        return await self._timed(self.interface.choose_action, view)
+
+    async def make_bid_decision(self, view, bid_handler):
+        return await self._timed(self.interface.make_bid_decision, view, bid_handler)
+
+    async def make_buy_back_decision(self, view, highest_bid):
+        return await self._timed(
+            self.interface.make_buy_back_decision, view, highest_bid
+        )
+
+    async def choose_money_cards(self, view, highest_bid, buyer_idx):
+        return await self._timed(
+            self.interface.choose_money_cards, view, highest_bid, buyer_idx
+        )
+
+    async def make_trade_decision(self, view, joint_cows):
+        return await self._timed(self.interface.make_trade_decision, view, joint_cows)
+
+    async def make_trade_offer(self, view, card_count=None):
+        return await self._timed(self.interface.make_trade_offer, view, card_count)
+
+
+class Table:
+    """A game of bots and remote players. It starts when every remote seat is taken"""
+
+    def __init__(
+        self,
+        table_id: str,
+        num_players: int,
+        bots: dict[int, PlayerInterface | AsyncPlayerInterface],
+        seed: int | None = None,
+        max_turns: int = MAX_TURNS,
+    ):
+        self.table_id = table_id
+        self.num_players = num_players
+        self.bots = bots
+        self.seed = seed
+        self.max_turns = max_turns
+        self.player_names = [f"Bot {i}" for i in range(num_players)]
+        self.seats: dict[int, RemoteSeat] = {}
+        self.latencies: list[float] = []  # seconds per decision of any player
+        self.ready = asyncio.Event()
+        self.result: GameResult | None = None
+        self.error: Exception | None = None  # what broke the game, if anything
+
+    def get_free_seat(self) -> int | None:
+        for idx in range(self.num_players):
+            if idx not in self.bots and idx not in self.seats:
+                return idx
+        return None
+
+    def join(self, idx: int, name: str, seat: RemoteSeat):
+        self.player_names[idx] = name
+        self.seats[idx] = seat
+        if self.get_free_seat() is None:
+            self.ready.set()
+
+    async def play(self, answer_timeout: float) -> GameResult:
+        """Plays the whole game on the event loop. A remote player who leaves or
+        does not answer in time ends the game unfinished"""
+        game = Game(self.num_players, self.player_names, seed=self.seed)
+        game.start_game()
+
+        player_interfaces = []
+        for idx in range(self.num_players):
+            interface = self.bots.get(idx)
+            if interface is None:
+                input_handler = RemoteInputHandler(
+                    self.player_names, self.seats[idx], answer_timeout
+                )
+                interface = RemotePlayer(idx, input_handler)
+            elif not isinstance(interface, AsyncPlayerInterface):
+                interface = AsyncPlayerAdapter(interface)
+            player_interfaces.append(TimedPlayer(interface, self.latencies))
+        output_handler = RemoteOutputHandler(self.seats)
+
+        try:
+            finished = await play_game_async(
+                game, player_interfaces, output_handler, self.max_turns
+            )
+        # asyncio.TimeoutError is only the builtin TimeoutError from Python 3.11 on
+        except (ConnectionError, asyncio.TimeoutError):
+            finished = False
+        if finished:
+            output_handler.show_final_score(game.get_player_view(0))
+
+        scores = [player.get_score() for player in game.get_all_players()]
+        return GameResult(self.seed, scores, game.get_current_turn(), finished)
+
+
+class GameServer:
+    """Hosts many tables in one process.
+
+    Every table is a task on the event loop which plays with the async turn
+    handlers, so no thread is held while a table waits for remote answers. A slow
+    player only holds up their own table. Bots decide on the event loop, slow bots
+    can be passed as AsyncPlayerAdapter with in_thread"""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        answer_timeout: float = ANSWER_TIMEOUT,
+        max_tables: int = MAX_TABLES,
+    ):
+        self.host = host
+        self.port = port
+        self.answer_timeout = answer_timeout
+        self.address: tuple[str, int] | None = None
+        self.tables: dict[str, Table] = {}
+        self._table_slots = asyncio.Semaphore(max_tables)
+        self._server: asyncio.Server | None = None
+        self._table_tasks: list[asyncio.Task] = []
+
+    def add_table(
+        self,
+        table_id: str,
+        num_players: int,
+        bots: dict[int, PlayerInterface | AsyncPlayerInterface] | None = None,
+        seed: int | None = None,
+        max_turns: int = MAX_TURNS,
+    ) -> Table:
+        """Adds a table, the seats without bot are taken by remote players"""
+        table = Table(table_id, num_players, bots or {}, seed, max_turns)
+        if table.get_free_seat() is None:
+            table.ready.set()
+        self.tables[table_id] = table
+        if self._server is not None:
+            self._table_tasks.append(asyncio.create_task(self._run_table(table)))
+        return table
+
+    async def start(self) -> tuple[str, int]:
+        """Opens the server and the tables. Returns the address"""
+        self._server = await asyncio.start_server(
+            self._serve_client, self.host, self.port
+        )
+        self.address = self._server.sockets[0].getsockname()[:2]
+        for table in self.tables.values():
+            self._table_tasks.append(asyncio.create_task(self._run_table(table)))
+        return self.address
+
+    async def run(self) -> dict[str, GameResult]:
+        """Waits until every table is over and closes the server. Returns the
+        result per table"""
+        if self._server is None:
+            await self.start()
+        await asyncio.gather(*self._table_tasks)
+        self._server.close()
+        await self._server.wait_closed()
+        return {table_id: table.result for table_id, table in self.tables.items()}
+
+    def get_latency_stats(self) -> tuple[dict[str, LatencyStats], LatencyStats]:
+        """Returns the decision latencies per table and of all tables"""
+        per_table = {
+            table_id: LatencyStats.from_samples(table.latencies)
+            for table_id, table in self.tables.items()
+        }
+        samples = [t for table in self.tables.values() for t in table.latencies]
+        return per_table, LatencyStats.from_samples(samples)
+
+    async def _run_table(self, table: Table):
+        await table.ready.wait()
+        # a broken table must not stop the others, so it ends unfinished
+        try:
+            async with self._table_slots:
+                table.result = await table.play(self.answer_timeout)
+        except Exception as error:  # noqa: BLE001
+            table.error = error
+            table.result = GameResult(table.seed, [0] * table.num_players, 0, False)
+        scores = ",".join(map(str, table.result.scores))
+        for seat in table.seats.values():
+            seat.send(f"END {int(table.result.finished)} {scores}")
+            seat.close()
+
+    async def _serve_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ):
+        seat = None
+        try:
+            words = (await reader.readline()).decode().split(maxsplit=2)
+            table = self.tables.get(words[1]) if len(words) == 3 else None
+            idx = None if table is None else table.get_free_seat()
+            if words[:1] != ["JOIN"] or idx is None:
+                writer.write(
+                    b"REJECTED Join with: JOIN <table> <name> at a free table\n"
+                )
+                await writer.drain()
+                writer.close()
+                return
+
+            seat = RemoteSeat(writer)
+            writer.write(f"SEATED {idx}\n".encode())
+            table.join(idx, words[2], seat)
+            while line := await reader.readline():
+                seat.put_answer(line.decode().rstrip("\r\n"))
+        except (ConnectionError, UnicodeDecodeError):
+            pass
+        finally:
+            if seat is not None:
+                seat.put_answer(None)
+
+
+async def play_remote(
+    host: str,
+    port: int,
+    table_id: str,
+    name: str,
+    answer: Callable[[str, str], Awaitable[str]],
+) -> tuple[bool, list[int]]:
+    """Joins a table and answers every question with await answer(kind, prompt).
+    Returns whether the game finished and the scores"""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        writer.write(f"JOIN {table_id} {name}\n".encode())
+        while line := await reader.readline():
+            command, _, rest = line.decode().rstrip("\n").partition(" ")
+            match command:
+                case "ASK":
+                    kind, _, prompt = rest.partition(" ")
+                    writer.write(f"{await answer(kind, prompt)}\n".encode())
+                case "END":
+                    finished, scores = rest.split()
+                    return finished == "1", [int(s) for s in scores.split(",")]
+                case "REJECTED":
+                    raise ConnectionError(rest)
+        raise ConnectionError("The server closed the connection")
+    finally:
+        writer.close()
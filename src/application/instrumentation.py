@@ -0,0 +1,334 @@
+import functools
+import json
+import threading
+import time
+import tracemalloc
+from collections import defaultdict
+from collections.abc import Callable
+
+from application.play_auction import PlayBidTurn
+from application.play_trade import PlayTradeTurn
+from game.game import Game
+from interface.player_interface import PlayerInterface
+from player.payment_solver import MoneyPay
+
+# (class, method) of the engine hot paths, timed under "Class.method"
+HOT_PATHS = [
+    (PlayBidTurn, "execute"),
+    (PlayBidTurn, "_run_auction_loop"),
+    (PlayTradeTurn, "execute"),
+    (Game, "end_turn"),
+    (Game, "get_player_view"),
+    (MoneyPay, "optimal_pay"),
+    (MoneyPay, "optimal_pay_packed"),
+]
+# decisions of the player interfaces, timed under "BotClass.method"
+PLAYER_METHODS = [
+    name
+    for name, member in vars(PlayerInterface).items()
+    if getattr(member, "__isabstractmethod__", False)
+]
+
+
+def _get_subclasses(cls: type) -> list[type]:
+    subclasses = []
+    for subclass in cls.__subclasses__():
+        subclasses.append(subclass)
+        subclasses.extend(_get_subclasses(subclass))
+    return subclasses
+
+
+def _get_bucket(duration: float) -> int:
+    """Histogram bucket of a duration: the power of two microseconds above it"""
+    return 1 << int(duration * 1e6).bit_length()
+
+
+class _MethodPatcher:
+    """Wraps methods while enabled and restores them when disabled"""
+
+    def __init__(self):
+        self._patched: list[tuple[type, str, object]] = []
+
+    def __enter__(self):
+        self.enable()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.disable()
+
+    def is_enabled(self) -> bool:
+        return bool(self._patched)
+
+    def enable(self):
+        pass
+
+    def disable(self):
+        for owner, name, original in reversed(self._patched):
+            setattr(owner, name, original)
+        self._patched.clear()
+
+    def _patch(self, owner: type, name: str, make_wrapper):
+        """Replaces the method by make_wrapper(original)"""
+        original = vars(owner)[name]
+        setattr(owner, name, functools.wraps(original)(make_wrapper(original)))
+        self._patched.append((owner, name, original))
+
+
+class Profiler(_MethodPatcher):
+    """Times and counts the calls of the hot paths and player decisions.
+
+    The methods are only wrapped while the profiler is enabled and restored
+    afterwards, so it costs nothing when off. Player interfaces are found as the
+    subclasses of PlayerInterface which are imported when it is enabled.
+
+    Every call is recorded under its stack of timed calls. Per function there is a
+    call count and a histogram of durations, the stacks with their self time give
+    a flame graph"""
+
+    def __init__(self):
+        super().__init__()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        # stack -> [calls, total seconds, seconds in timed children]
+        self._stacks: dict[tuple[str, ...], list] = defaultdict(lambda: [0, 0.0, 0.0])
+        # function -> bucket -> calls
+        self._histograms: dict[str, dict[int, int]] = defaultdict(
+            lambda: defaultdict(int)
+        )
+
+    def enable(self):
+        if self.is_enabled():
+            return
+        for owner, name in HOT_PATHS:
+            self._wrap(owner, name, f"{owner.__name__}.{name}")
+        for cls in _get_subclasses(PlayerInterface):
+            for name in PLAYER_METHODS:
+                if name in vars(cls):
+                    self._wrap(cls, name, None)
+
+    def reset(self):
+        with self._lock:
+            self._stacks.clear()
+            self._histograms.clear()
+
+    def _wrap(self, owner: type, name: str, key: str | None):
+        """Replaces the method with a timed one. Without key, the calls are keyed
+        by the class of the instance"""
+
+        def make_wrapper(original):
+            def timed(instance, *args, **kwargs):
+                call_key = key or f"{type(instance).__name__}.{name}"
+                return self._call(call_key, original, instance, args, kwargs)
+
+            return timed
+
+        self._patch(owner, name, make_wrapper)
+
+    def _call(self, key: str, func, instance, args, kwargs):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        if stack and stack[-1] == key:  # an override calling super
+            return func(instance, *args, **kwargs)
+
+        stack.append(key)
+        start = time.perf_counter()
+        try:
+            return func(instance, *args, **kwargs)
+        finally:
+            duration = time.perf_counter() - start
+            path = tuple(stack)
+            stack.pop()
+            with self._lock:
+                entry = self._stacks[path]
+                entry[0] += 1
+                entry[1] += duration
+                if len(path) > 1:
+                    self._stacks[path[:-1]][2] += duration
+                self._histograms[key][_get_bucket(duration)] += 1
+
+    # -- Export --
+    def get_summary(self) -> dict[str, dict]:
+        """Returns calls, total seconds and the histogram of microseconds (upper
+        bucket bound -> calls) per function"""
+        with self._lock:
+            totals = defaultdict(float)
+            for path, (_, total, _) in self._stacks.items():
+                if path[-1] not in path[:-1]:  # recursion is counted once
+                    totals[path[-1]] += total
+            return {
+                key: {
+                    "calls": sum(histogram.values()),
+                    "total_s": totals[key],
+                    "histogram_us": {
+                        str(bucket): histogram[bucket] for bucket in sorted(histogram)
+                    },
+                }
+                for key, histogram in self._histograms.items()
+            }
+
+    def get_folded_stacks(self) -> list[str]:
+        """Returns the stacks as "a;b;c microseconds" lines of self time, the input
+        format of flamegraph.pl and speedscope"""
+        with self._lock:
+            return [
+                f"{';'.join(path)} {round((total - children) * 1e6)}"
+                for path, (_, total, children) in sorted(self._stacks.items())
+            ]
+
+    def save_json(self, path: str) -> None:
+        with open(path, "w") as file:
+            json.dump(self.get_summary(), file, indent=2)
+
+    def save_folded(self, path: str) -> None:
+        with open(path, "w") as file:
+            file.write("\n".join(self.get_folded_stacks()) + "\n")
+
+
+# the allocations of the profiling itself are left out
+_UNTRACED_FILTERS = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, __file__),
+]
+OUTSIDE_HOT_PATHS = "other"  # key of the allocations between the hot paths
+
+
+class AllocationProfiler(_MethodPatcher):
+    """Counts the allocation churn of the hot paths with tracemalloc.
+
+    Whenever a hot path is entered or left, the memory which appeared since the
+    last look is added per source line to the hot path which ran in between.
+    Memory which is freed later is not subtracted, so a view which is built every
+    turn and dropped again counts every time. Allocations which are freed before
+    the next look are missed.
+
+    The traces are cleared at every look, so the snapshots stay small. Only one
+    thread is traced"""
+
+    def __init__(self):
+        super().__init__()
+        self._stack: list[str] = []
+        self._calls: dict[str, int] = defaultdict(int)
+        # hot path -> [bytes, blocks]
+        self._totals: dict[str, list] = defaultdict(lambda: [0, 0])
+        # hot path -> source line -> [bytes, blocks]
+        self._lines: dict[str, dict[str, list]] = defaultdict(
+            lambda: defaultdict(lambda: [0, 0])
+        )
+        self._started_tracing = False
+
+    def enable(self):
+        if self.is_enabled():
+            return
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        for owner, name in HOT_PATHS:
+            self._patch(owner, name, self._make_traced(f"{owner.__name__}.{name}"))
+        tracemalloc.clear_traces()
+
+    def disable(self):
+        if self.is_enabled():
+            self._add_allocations(OUTSIDE_HOT_PATHS)
+        super().disable()
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def _make_traced(self, key: str):
+        def make_wrapper(original):
+            def traced(instance, *args, **kwargs):
+                stack = self._stack
+                if stack and stack[-1] == key:  # an override calling super
+                    return original(instance, *args, **kwargs)
+                self._add_allocations(stack[-1] if stack else OUTSIDE_HOT_PATHS)
+                stack.append(key)
+                self._calls[key] += 1
+                try:
+                    return original(instance, *args, **kwargs)
+                finally:
+                    self._add_allocations(key)
+                    stack.pop()
+
+            return traced
+
+        return make_wrapper
+
+    def _add_allocations(self, key: str):
+        """Adds what was allocated since the last look and is still alive to key.
+        The traces are cleared after every look, so they only hold new memory"""
+        snapshot = tracemalloc.take_snapshot().filter_traces(_UNTRACED_FILTERS)
+        tracemalloc.clear_traces()
+        totals = self._totals[key]
+        lines = self._lines[key]
+        for stat in snapshot.statistics("lineno"):
+            frame = stat.traceback[0]
+            entry = lines[f"{frame.filename}:{frame.lineno}"]
+            entry[0] += stat.size
+            entry[1] += stat.count
+            totals[0] += stat.size
+            totals[1] += stat.count
+
+    def get_totals(self) -> tuple[int, int]:
+        """Returns the allocated bytes and blocks of everything traced"""
+        return (
+            sum(size for size, _ in self._totals.values()),
+            sum(count for _, count in self._totals.values()),
+        )
+
+    def get_report(self, limit: int = 10) -> dict[str, dict]:
+        """Returns per hot path the calls, the allocated bytes and blocks and the
+        source lines which allocated the most bytes"""
+        report = {}
+        for key, (size, count) in self._totals.items():
+            lines = sorted(self._lines[key].items(), key=lambda item: -item[1][0])
+            report[key] = {
+                "calls": self._calls[key],
+                "bytes": size,
+                "blocks": count,
+                "lines": [
+                    {"line": line, "bytes": line_size, "blocks": line_count}
+                    for line, (line_size, line_count) in lines[:limit]
+                ],
+            }
+        return report
+
+    def save_json(self, path: str, limit: int = 10) -> None:
+        with open(path, "w") as file:
+            json.dump(self.get_report(limit), file, indent=2)
+
+
+def get_peak_memory(run: Callable[[], object]) -> int:
+    """Returns the peak bytes which run allocated on top of the memory at its start.
+    That is the working memory of run, for its churn see get_allocations"""
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    start, _ = tracemalloc.get_traced_memory()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        if started_tracing:
+            tracemalloc.stop()
+    return peak - start
+
+
+def get_allocations(run: Callable[[], object]) -> tuple[int, int]:
+    """Returns the bytes and blocks which run allocated, freed or not. See
+    AllocationProfiler"""
+    with AllocationProfiler() as profiler:
+        run()
+    return profiler.get_totals()
+
+
+def assert_allocation_budget(run: Callable[[], object], budget_bytes: int) -> int:
+    """Fails if run allocates more than budget_bytes in total. Returns the bytes,
+    for headless games in tests"""
+    allocated, _ = get_allocations(run)
+    if allocated > budget_bytes:
+        raise AssertionError(
+            f"Allocated {allocated} bytes, {allocated - budget_bytes} over the budget"
+        )
+    return allocated
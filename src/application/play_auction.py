@@ -4,9 +4,12 @@ from io_handler.console_outputs import OutputHandler
 from return_types.results import ResultType, Result
 from return_types.action import Bid
 from game_config.game_config import GameConfig
+from game.event_log import EventType
 
 from game.game import Game
 
+MAX_MONEY_CARD_CHOICES = 3  # invalid money card choices before the auction fails
+
 
 class PlayBidTurn:
     def __init__(
@@ -28,10 +31,17 @@ class PlayBidTurn:
         cow_draw = self._draw_and_reveal_card()
 
         bid_handler = BidHandler(
-            auctioneer_idx, self.game.num_players
+            auctioneer_idx, self.game.num_players, cow_draw
         )  # TODO write getter
 
-        self._run_auction_loop(bid_handler)
+        return self.run_auction(bid_handler)
+
+    def run_auction(self, bid_handler: BidHandler, start_after: int | None = None):
+        """Runs the auction of the revealed cow and hands it to the buyer.
+
+        An auction which already started continues with the bidders after start_after"""
+        cow_draw = bid_handler.cow_card
+        self._run_auction_loop(bid_handler, start_after)
 
         winner_bid = bid_handler.get_winner_bid()
 
@@ -41,10 +51,55 @@ class PlayBidTurn:
             money_cards = self.game.get_player(buyer).get_optimal_payment(
                 winner_bid.value
             )
-        else:
+            return self._finish_auction(
+                cow_draw, buyer, seller, money_cards, winner_bid.value
+            )
+
+        for _ in range(MAX_MONEY_CARD_CHOICES):
             money_cards = self.player_interfaces[buyer].choose_money_cards(
                 self.game.get_player_view(buyer), winner_bid, buyer
             )
+            res = self._check_money_cards(buyer, money_cards, winner_bid.value)
+            if res is None:
+                return self._finish_auction(
+                    cow_draw, buyer, seller, money_cards, winner_bid.value
+                )
+            self.output_handler.show_message(res.message)
+        return res
+
+    def _check_money_cards(
+        self, buyer: int, money_cards: list[int], bid_value: int
+    ) -> Result | None:
+        """Checks that the buyer holds the money cards and that they cover the bid.
+        Returns the failure, if any"""
+        if len(money_cards) != len(GameConfig.MONEY_CARD_VALUES) or any(
+            amount < 0 for amount in money_cards
+        ):
+            return Result(ResultType.FAILURE, "Invalid money cards")
+
+        if not self.game.get_player(buyer).has_enough_money(money_cards):
+            return Result(ResultType.FAILURE, "You don't have these money cards")
+
+        if self.game.get_money_value(money_cards) < bid_value:
+            return Result(
+                ResultType.FAILURE,
+                f"The money cards do not cover the bid of {bid_value}",
+            )
+        return None
+
+    def _finish_auction(
+        self,
+        cow_draw: int,
+        buyer: int,
+        seller: int,
+        money_cards: list[int],
+        bid_value: int,
+    ) -> Result:
+        """Pays the seller and hands the cow to the buyer. Fails without any change
+        if the money cards are invalid"""
+        res = self._check_money_cards(buyer, money_cards, bid_value)
+        if res is not None:
+            return res
 
         self.game.handle_bid(cow_draw, buyer, seller, money_cards)
 
@@ -55,17 +110,29 @@ class PlayBidTurn:
     def _draw_and_reveal_card(self) -> int:
         """Draws and reveals a cow card from the stack, handling donkey events if necessary"""
         cow_draw = self.game.card_stack.draw_card()
+        self.game.log_event(EventType.CARD_DRAWN, cow_draw)
         self.output_handler.show_cow_draw(cow_draw)
 
         if self.game.card_stack.is_donkey_cow(cow_draw):
             self.game.bank.inflate_player_money(self.game.get_all_players())
+            self.game.log_event(EventType.DONKEY, self.game.bank._money_inflation_stage)
             self.output_handler.show_donkey_event(self.game.bank.get_inflation_value())
         return cow_draw
 
-    def _run_auction_loop(self, bid_handler: BidHandler):
+    def _run_auction_loop(
+        self, bid_handler: BidHandler, start_after: int | None = None
+    ):
         """Runs the auction loop until a winner is found"""
         while not bid_handler.is_complete():
             active_bidders = list(bid_handler.remaining_players)
+            if start_after is not None:  # finish the round which already started
+                active_bidders = [
+                    idx
+                    for idx in active_bidders
+                    if (idx - bid_handler.bid_master) % bid_handler.num_players
+                    > (start_after - bid_handler.bid_master) % bid_handler.num_players
+                ]
+                start_after = None
 
             for pl_idx in active_bidders:
                 self._handle_single_player_bid(pl_idx, bid_handler)
@@ -79,29 +146,46 @@ class PlayBidTurn:
         view = self.game.get_player_view(player_idx)
 
         bid = interface.make_bid_decision(view, bid_handler)
+        self._apply_bid(player_idx, bid, bid_handler)
 
+    def _apply_bid(self, player_idx: int, bid: Bid, bid_handler: BidHandler):
+        """Places the bid, a pass or an invalid bid removes the player"""
         if bid.value is None:  # player wants to pass
             bid_handler.pass_bid(player_idx)
+            self.game.log_event(EventType.PASS, player_idx)
         else:
             result = bid_handler.place_bid(self.game.get_player(player_idx), bid.value)
 
             if result.type == ResultType.FAILURE:
                 self.output_handler.show_message(result.message)
                 bid_handler.pass_bid(bid.player_idx)
+                self.game.log_event(EventType.PASS, bid.player_idx)
+            else:
+                self.game.log_event(EventType.BID, player_idx, bid.value)
 
     def _determine_buyer_and_seller(self, winner_bid: Bid) -> tuple[int, int]:
         """Determines the winner and seller based on the bid results and possible buy-back"""
         auctioneer_idx = self.game.get_current_player_idx()
 
-        if winner_bid.value < self.game.get_current_player().get_money_value():
+        if self._can_buy_back(winner_bid):
             wants_buy_back = self.player_interfaces[
                 auctioneer_idx
             ].make_buy_back_decision(
                 self.game.get_player_view(auctioneer_idx), winner_bid
             )
+            self.game.log_event(EventType.BUY_BACK, auctioneer_idx, wants_buy_back)
         else:
             wants_buy_back = False
 
+        return self._get_buyer_and_seller(winner_bid, wants_buy_back)
+
+    def _can_buy_back(self, winner_bid: Bid) -> bool:
+        return winner_bid.value < self.game.get_current_player().get_money_value()
+
+    def _get_buyer_and_seller(
+        self, winner_bid: Bid, wants_buy_back: bool
+    ) -> tuple[int, int]:
+        auctioneer_idx = self.game.get_current_player_idx()
         if wants_buy_back:
             return auctioneer_idx, winner_bid.player_idx
         else:
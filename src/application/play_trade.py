@@ -1,8 +1,10 @@
 from action_handlers.trading import TradeHandler
 from interface.player_interface import PlayerInterface
 from io_handler.console_outputs import OutputHandler
+from return_types.action import Trade
 from return_types.results import ResultType, Result
 
+from game.event_log import EventType
 from game.game import Game
 
 
@@ -30,6 +32,32 @@ class PlayTradeTurn:
             current_player_idx
         ].make_trade_decision(current_player_view, joint_cows)
 
+        res = self._start_trade(enemy_idx, cow_type, cow_amount)
+        if res is not None:
+            return res
+
+        trade_challenger = self.player_interfaces[current_player_idx].make_trade_offer(
+            current_player_view
+        )
+        res = self._set_challenger_offer(trade_challenger)
+        if res is not None:
+            return res
+
+        trade_contender = self.player_interfaces[enemy_idx].make_trade_offer(
+            self.game.get_player_view(enemy_idx), trade_challenger.card_count
+        )
+        res = self._set_contender_offer(trade_contender)
+        if res is not None:
+            return res
+
+        return self._finish_trade()
+
+    def _start_trade(
+        self, enemy_idx: int, cow_type: int, cow_amount: int
+    ) -> Result | None:
+        """Checks the challenge and opens the trade. Returns the failure, if any"""
+        current_player_idx = self.game.get_current_player_idx()
+
         if not self.game.get_player(enemy_idx).has_cow(cow_type, cow_amount):
             return Result(
                 ResultType.FAILURE,
@@ -48,32 +76,52 @@ class PlayTradeTurn:
         self.trade_handler = TradeHandler(
             cow_type, cow_amount, current_player_idx, enemy_idx
         )
-
-        trade_challenger = self.player_interfaces[current_player_idx].make_trade_offer(
-            current_player_view
+        self.game.log_event(
+            EventType.TRADE_CHALLENGE,
+            current_player_idx,
+            enemy_idx,
+            cow_type,
+            cow_amount,
         )
-        if not self.game.get_player(enemy_idx).has_enough_money(
-            trade_challenger.amount
-        ):
+        return None
+
+    def _set_challenger_offer(self, trade_challenger: Trade) -> Result | None:
+        if not self.game.get_current_player().has_enough_money(trade_challenger.amount):
             return Result(ResultType.FAILURE, "You don't have enough money")
 
         self.trade_handler.set_challenger_bid(trade_challenger)
-
-        trade_contender = self.player_interfaces[enemy_idx].make_trade_offer(
-            current_player_view, trade_challenger.card_count
+        self.game.log_event(
+            EventType.TRADE_OFFER,
+            self.trade_handler.challenger,
+            trade_challenger.amount,
         )
-        if not self.game.get_current_player().has_enough_money(trade_contender.amount):
+        return None
+
+    def _set_contender_offer(self, trade_contender: Trade) -> Result | None:
+        enemy_idx = self.trade_handler.contender
+        if not self.game.get_player(enemy_idx).has_enough_money(trade_contender.amount):
             return Result(ResultType.FAILURE, "You don't have enough money")
         self.trade_handler.set_contender_bid(trade_contender)
-
-        winner, looser = self.trade_handler.get_winner_and_loser()
+        self.game.log_event(EventType.TRADE_OFFER, enemy_idx, trade_contender.amount)
+        return None
+
+    def _finish_trade(self) -> Result:
+        """Hands over the cows and money, or ends in a draw"""
+        trade_handler = self.trade_handler
+        winner_and_loser = trade_handler.get_winner_and_loser()
+        if winner_and_loser is None:
+            self.game.log_event(
+                EventType.TRADE_DRAW, trade_handler.challenger, trade_handler.contender
+            )
+            return Result(ResultType.FAILURE, "The trade ended in a draw.")
+        winner, looser = winner_and_loser
 
         self.game.handle_trade(
-            cow_type,
-            cow_amount,
-            enemy_idx,
-            trade_challenger.amount,
-            trade_contender.amount,
+            trade_handler.cow_type,
+            trade_handler.cow_amount,
+            trade_handler.contender,
+            trade_handler.challenger_bid.amount,
+            trade_handler.contender_bid.amount,
             winner,
             looser,
         )  # TODO
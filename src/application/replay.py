@@ -0,0 +1,72 @@
+from game.event_log import EventLog, EventType
+from game.game import Game
+
+# events which change the state, the others are skipped by a replay
+STATE_EVENTS = {
+    EventType.CARD_DRAWN,
+    EventType.DONKEY,
+    EventType.PAYMENT,
+    EventType.TRADE_RESULT,
+    EventType.END_TURN,
+    EventType.KEYFRAME,
+}
+
+
+class ReplayEngine:
+    """Rebuilds games from an EventLog.
+
+    Only the events which change the state are applied, straight to the Game: no
+    player interfaces, views or turn handlers are involved. Bids, passes and offers
+    are kept in the log for its readers"""
+
+    def __init__(self, event_log: EventLog):
+        self.event_log = event_log
+
+    def replay(self, verify: bool = True) -> Game:
+        """Replays the whole log. With verify, the game has to match every
+        keyframe, otherwise a ValueError is raised"""
+        return self._run(0, None, verify)
+
+    def seek(self, turn: int, verify: bool = False) -> Game:
+        """Returns the game at the start of the turn, or at the end of the log.
+
+        Starts at the last keyframe before the turn instead of the first"""
+        return self._run(self.event_log.get_keyframe_offset(turn), turn, verify)
+
+    def _run(self, offset: int, turn: int | None, verify: bool) -> Game:
+        game = None
+        for event_type, fields, _ in self.event_log.iter_events(offset, STATE_EVENTS):
+            if game is None:
+                if event_type != EventType.KEYFRAME:
+                    raise ValueError("The log has to start with a keyframe")
+                game = Game.from_bytes(fields[1])
+                continue
+            if turn is not None and game.get_current_turn() >= turn:
+                break
+            self._apply(game, event_type, fields, verify)
+
+        if game is None:
+            raise ValueError("The log is empty")
+        game.is_game_over()  # updates game_is_ongoing like the game loop
+        return game
+
+    @staticmethod
+    def _apply(game: Game, event_type: EventType, fields: tuple, verify: bool):
+        match event_type:
+            case EventType.CARD_DRAWN:
+                cow_card = game.card_stack.draw_card()
+                if cow_card != fields[0]:
+                    raise ValueError(f"Drew {cow_card} instead of {fields[0]}")
+            case EventType.DONKEY:
+                game.bank.inflate_player_money(game.get_all_players())
+            case EventType.PAYMENT:
+                game.handle_bid(*fields)
+            case EventType.TRADE_RESULT:
+                game.handle_trade(*fields)
+            case EventType.END_TURN:
+                game.end_turn()
+            case EventType.KEYFRAME:
+                if verify and game.to_bytes() != fields[1]:
+                    raise ValueError(
+                        f"The replay differs from the keyframe of turn {fields[0]}"
+                    )
@@ -0,0 +1,117 @@
+from collections.abc import Callable
+
+from application.endgame_solver import EndgameSolver
+from application.play_auction import PlayBidTurn
+from application.play_trade import PlayTradeTurn
+from application.show_stats import StatsHandler
+from game.game import Game
+from interface.human_interface import HumanPlayer
+from interface.player_interface import PlayerInterface
+from io_handler.console_outputs import NullOutputHandler, OutputHandler
+from io_handler.scripted_inputs import ScriptedInputHandler
+from return_types.action import ActionType
+from return_types.results import GameResult, Result, ResultType
+
+MAX_TURNS = 1000  # games which take longer are stopped as unfinished
+MAX_FAILED_ACTIONS = 10  # failed actions in a row before the turn is skipped
+
+
+def play_game(
+    game: Game,
+    player_interfaces: list[PlayerInterface],
+    output_handler: OutputHandler,
+    max_turns: int = MAX_TURNS,
+    endgame_solver: EndgameSolver | None = None,
+) -> bool:
+    """Plays a started game until it is over. Returns False if it did not finish.
+
+    With an endgame_solver the trades after the stack is empty are solved instead
+    of asked from the player interfaces"""
+    turn_handlers = {
+        ActionType.BID: PlayBidTurn(player_interfaces, output_handler, game),
+        ActionType.TRADE: PlayTradeTurn(player_interfaces, output_handler, game),
+        ActionType.STATS: StatsHandler(output_handler, game),
+    }
+    failed_actions = 0
+
+    while game.is_game_over() is None:
+        if game.get_current_turn() >= max_turns or game.is_stalled():
+            return False
+        if endgame_solver is not None and game.card_stack.is_empty():
+            return endgame_solver.play_out(game, max_turns - game.get_current_turn())
+
+        current_player_idx = game.get_current_player_idx()
+        action = player_interfaces[current_player_idx].choose_action(
+            game.get_player_view(current_player_idx)
+        )
+        res = turn_handlers[action].execute()
+        failed_actions = count_failed_actions(game, res, failed_actions)
+
+    return True
+
+
+def count_failed_actions(game: Game, res: Result, failed_actions: int) -> int:
+    """Returns the failed actions in a row after the result. Skips the turn of a
+    player who cannot act"""
+    if res.type != ResultType.FAILURE:
+        return 0
+
+    failed_actions += 1
+    no_trade_possible = (
+        game.card_stack.is_empty() and not game.get_possible_cow_trades()
+    )
+    if no_trade_possible or failed_actions >= MAX_FAILED_ACTIONS:
+        game.end_turn()  # the player cannot act, skip the turn
+        return 0
+    return failed_actions
+
+
+def simulate(
+    n_games: int,
+    interfaces_factory: Callable[[int], list[PlayerInterface]],
+    seed: int = 0,
+    max_turns: int = MAX_TURNS,
+    endgame_solver: EndgameSolver | None = None,
+) -> list[GameResult]:
+    """Plays n_games without console I/O. Game i uses the seed seed + i.
+
+    interfaces_factory gets the game seed and returns one interface per player.
+    An endgame_solver shortcuts the trades after the stack is empty, see play_game"""
+    output_handler = NullOutputHandler()
+    results = []
+
+    for game_seed in range(seed, seed + n_games):
+        player_interfaces = interfaces_factory(game_seed)
+        num_players = len(player_interfaces)
+
+        names = [f"Player {i}" for i in range(num_players)]
+        game = Game(num_players, names, seed=game_seed)
+        game.start_game()
+
+        finished = play_game(
+            game, player_interfaces, output_handler, max_turns, endgame_solver
+        )
+        scores = [player.get_score() for player in game.get_all_players()]
+        results.append(GameResult(game_seed, scores, game.get_current_turn(), finished))
+
+    return results
+
+
+def play_scripted_game(
+    transcript_path: str, player_names: list[str], seed: int, max_turns: int = MAX_TURNS
+) -> tuple[Game, bool]:
+    """Plays a game with the answers of a console transcript, one answer per line.
+
+    Returns the game and whether it finished, a transcript which ends before the
+    game does is not finished"""
+    input_handler = ScriptedInputHandler(player_names, transcript_path)
+    player_interfaces = [
+        HumanPlayer(i, input_handler) for i in range(len(player_names))
+    ]
+    game = Game(len(player_names), player_names, seed=seed)
+    game.start_game()
+    try:
+        finished = play_game(game, player_interfaces, NullOutputHandler(), max_turns)
+    except EOFError:
+        finished = False
+    return game, finished
@@ -0,0 +1,124 @@
+import itertools
+from collections.abc import Callable, Iterator
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from application.simulation import MAX_TURNS, simulate
+from interface.player_interface import PlayerInterface
+from return_types.results import MatchupResult
+
+# A bot is created with (player_idx, seed). Must be picklable, e.g. a class or partial
+BotFactory = Callable[[int, int], PlayerInterface]
+
+BATCH_SIZE = 200  # games per worker task
+
+
+class LineupFactory:
+    """Creates the interfaces of one lineup for a game seed"""
+
+    def __init__(self, bot_factories: list[BotFactory]):
+        self.bot_factories = bot_factories
+
+    def __call__(self, game_seed: int) -> list[PlayerInterface]:
+        num_players = len(self.bot_factories)
+        return [
+            bot(i, game_seed * num_players + i)
+            for i, bot in enumerate(self.bot_factories)
+        ]
+
+
+def play_batch(
+    lineup: tuple[str, ...],
+    bot_factories: list[BotFactory],
+    seed: int,
+    n_games: int,
+    max_turns: int,
+) -> MatchupResult:
+    """Plays a batch of games of one lineup. Runs inside a worker process"""
+    matchup = MatchupResult(lineup)
+    for result in simulate(n_games, LineupFactory(bot_factories), seed, max_turns):
+        matchup.add_game(result)
+    return matchup
+
+
+class Tournament:
+    """Round-robin of bots over all seatings, played on a process pool"""
+
+    def __init__(
+        self,
+        bots: dict[str, BotFactory],
+        num_players: int,
+        games_per_lineup: int,
+        seed: int = 0,
+        batch_size: int = BATCH_SIZE,
+        max_workers: int | None = None,
+        max_turns: int = MAX_TURNS,
+    ):
+        self.bots = bots
+        self.num_players = num_players
+        self.games_per_lineup = games_per_lineup
+        self.seed = seed
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self.max_turns = max_turns
+
+    def get_lineups(self) -> list[tuple[str, ...]]:
+        """Returns every seating of the bots, a single bot only plays itself"""
+        lineups = itertools.product(self.bots, repeat=self.num_players)
+        if len(self.bots) == 1:
+            return list(lineups)
+        return [lineup for lineup in lineups if len(set(lineup)) > 1]
+
+    def get_batches(self) -> list[tuple[tuple[str, ...], int, int]]:
+        """Splits the seeds of every lineup into (lineup, seed, n_games) batches.
+
+        All lineups play the same seeds, so they get the same decks."""
+        batches = []
+        for lineup in self.get_lineups():
+            for start in range(0, self.games_per_lineup, self.batch_size):
+                n_games = min(self.batch_size, self.games_per_lineup - start)
+                batches.append((lineup, self.seed + start, n_games))
+        return batches
+
+    def iter_batches(self) -> Iterator[MatchupResult]:
+        """Yields the result of each batch as soon as it is finished"""
+        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [
+                executor.submit(
+                    play_batch,
+                    lineup,
+                    [self.bots[name] for name in lineup],
+                    seed,
+                    n_games,
+                    self.max_turns,
+                )
+                for lineup, seed, n_games in self.get_batches()
+            ]
+            for future in as_completed(futures):
+                yield future.result()
+
+    def run(self) -> dict[tuple[str, ...], MatchupResult]:
+        """Plays the whole tournament and returns the merged result per lineup"""
+        matchups = {}
+        for batch in self.iter_batches():
+            if batch.lineup in matchups:
+                matchups[batch.lineup].merge(batch)
+            else:
+                matchups[batch.lineup] = batch
+        return matchups
+
+
+def get_bot_standings(
+    matchups: dict[tuple[str, ...], MatchupResult],
+) -> dict[str, tuple[float, float]]:
+    """Returns (win rate, mean score) per bot over all seats and lineups"""
+    games = {}
+    wins = {}
+    scores = {}
+    for matchup in matchups.values():
+        for seat, name in enumerate(matchup.lineup):
+            games[name] = games.get(name, 0) + matchup.games
+            wins[name] = wins.get(name, 0) + matchup.wins[seat]
+            scores[name] = scores.get(name, 0) + matchup.score_sums[seat]
+    return {
+        name: (wins[name] / games[name], scores[name] / games[name]) for name in games
+    }
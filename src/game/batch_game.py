@@ -0,0 +1,275 @@
+import random
+
+from game_config.game_config import GameConfig
+
+try:
+    import numpy as np
+except ImportError:  # numpy is only needed for the batch engine
+    np = None
+
+
+class BatchGame:
+    """Structure-of-arrays engine which advances many games in lockstep.
+
+    All games share the number of players. Cows are stored as counts per dense cow
+    type id, see cow_values. Every mutation takes an index array of the games it is
+    applied to and works with vectorized numpy ops on all of them at once."""
+
+    def __init__(
+        self, num_players: int, decks: list[list[int]], starting_players: list[int]
+    ):
+        if np is None:
+            raise ImportError("BatchGame needs numpy: pip install numpy")
+
+        cow_values = set(GameConfig.COW_CARD_VALUES) | set(GameConfig.STARTING_COWS)
+        cow_values.add(GameConfig.DONKEY_COW)
+        for deck in decks:
+            cow_values.update(deck)
+        self.cow_values = np.array(sorted(cow_values), dtype=np.int64)
+        self.donkey_type = self.get_cow_type(GameConfig.DONKEY_COW)
+
+        n_games = len(decks)
+        self.num_games = n_games
+        self.num_players = num_players
+        self.money_values = np.array(GameConfig.MONEY_CARD_VALUES, dtype=np.int64)
+
+        self.money = np.tile(
+            np.array(GameConfig.STARTING_MONEY, dtype=np.int64),
+            (n_games, num_players, 1),
+        )  # (games, players, money card types)
+        self.cows = np.zeros((n_games, num_players, len(cow_values)), dtype=np.int64)
+        for cow in GameConfig.STARTING_COWS:
+            self.cows[:, :, self.get_cow_type(cow)] += 1
+        self.finished = np.zeros_like(self.cows)  # completed quartets per cow type
+
+        self.decks = np.searchsorted(self.cow_values, np.array(decks, dtype=np.int64))
+        self.deck_pos = np.zeros(n_games, dtype=np.int64)
+
+        self.current_player = np.array(starting_players, dtype=np.int64)
+        self.turn = np.zeros(n_games, dtype=np.int64)
+        self.inflation_stage = np.full(n_games, 2, dtype=np.int64)  # starting with 50
+        self.active = np.ones((n_games, num_players), dtype=bool)
+
+    @classmethod
+    def from_seeds(cls, seeds: list[int], num_players: int) -> "BatchGame":
+        """Deals the same decks and starting players as Game.start_game"""
+        stack = [cow for cow in GameConfig.COW_CARD_VALUES for _ in range(4)]
+        decks = []
+        starting_players = []
+        for seed in seeds:
+            rng = random.Random(seed)
+            decks.append(rng.sample(stack, len(stack)))
+            starting_players.append(rng.randint(0, num_players - 1))
+        return cls(num_players, decks, starting_players)
+
+    def get_cow_type(self, cow_value: int) -> int:
+        """Returns the dense type id of a cow value"""
+        return int(np.searchsorted(self.cow_values, cow_value))
+
+    # -- Card stack --
+    def is_empty(self, games=None):
+        """Returns True per game if its card stack is empty"""
+        if games is None:
+            return self.deck_pos >= self.decks.shape[1]
+        return self.deck_pos[games] >= self.decks.shape[1]
+
+    def draw_cards(self, games):
+        """Draws one cow type per game and pays the donkey inflation"""
+        cow_types = self.decks[games, self.deck_pos[games]]
+        self.deck_pos[games] += 1
+
+        donkey_games = games[cow_types == self.donkey_type]
+        self.inflate_player_money(donkey_games)
+        return cow_types
+
+    def inflate_player_money(self, games):
+        """Gives every player one money card of the current inflation stage"""
+        stages = self.inflation_stage[games]
+        self.money[games, :, stages] += 1
+        self.inflation_stage[games] += 1
+
+    # -- Auctions and trades --
+    def handle_bid(self, games, cow_types, buyers, sellers, payments):
+        """Moves the cow to the buyer and the payment to the seller"""
+        self.cows[games, buyers, cow_types] += 1
+        self.money[games, sellers] += payments
+        self.money[games, buyers] -= payments
+
+    def handle_trade(
+        self,
+        games,
+        cow_types,
+        cow_amounts,
+        challengers,
+        contenders,
+        challenger_offers,
+        contender_offers,
+    ):
+        """Exchanges the offers and moves the cows to the higher offer. Draws are skipped"""
+        challenger_values = challenger_offers @ self.money_values
+        contender_values = contender_offers @ self.money_values
+        valid = challenger_values != contender_values
+
+        games = games[valid]
+        cow_types = cow_types[valid]
+        cow_amounts = cow_amounts[valid]
+        challengers = challengers[valid]
+        contenders = contenders[valid]
+        challenger_offers = challenger_offers[valid]
+        contender_offers = contender_offers[valid]
+
+        challenger_wins = (challenger_values > contender_values)[valid]
+        winners = np.where(challenger_wins, challengers, contenders)
+        losers = np.where(challenger_wins, contenders, challengers)
+        self.cows[games, winners, cow_types] += cow_amounts
+        self.cows[games, losers, cow_types] -= cow_amounts
+
+        self.money[games, contenders] += challenger_offers - contender_offers
+        self.money[games, challengers] += contender_offers - challenger_offers
+        return valid
+
+    # -- Turn handling --
+    def update_scores(self, games):
+        """Moves every quartet of cows to the finished sets"""
+        complete = self.cows[games] >= 4
+        self.cows[games] -= 4 * complete
+        self.finished[games] += complete
+
+    def get_scores(self):
+        """Returns the scores of all players in all games"""
+        finished_sum = self.finished @ self.cow_values
+        return finished_sum * 4 * self.finished.sum(axis=2)
+
+    def end_turn(self, games):
+        """Updates the scores, removes finished players and moves to the next player"""
+        self.update_scores(games)
+
+        empty = self.is_empty(games)
+        no_cows = ~self.cows[games].any(axis=2)
+        self.active[games] &= ~(no_cows & empty[:, None])
+
+        games = games[self.active[games].sum(axis=1) > 1]
+        self.turn[games] += 1
+
+        # first active player after the current one
+        offsets = np.arange(1, self.num_players + 1)
+        candidates = (self.current_player[games, None] + offsets) % self.num_players
+        is_active = self.active[games[:, None], candidates]
+        self.current_player[games] = candidates[
+            np.arange(len(games)), is_active.argmax(axis=1)
+        ]
+
+    def is_game_over(self):
+        """Returns True per game if the stack is empty and nobody has cows"""
+        return self.is_empty() & ~self.cows.any(axis=(1, 2))
+
+    def get_shared_cows(self, games):
+        """Returns (games, players, cow types) True where a player shares the type
+        with the current player of the game"""
+        current = self.current_player[games]
+        current_cows = self.cows[games, current] > 0
+        shared = (self.cows[games] > 0) & current_cows[:, None, :]
+        shared[np.arange(len(games)), current] = False
+        return shared
+
+    def is_stalled(self):
+        """Returns True per game if the stack is empty and no type is shared"""
+        owners = (self.cows > 0).sum(axis=1)
+        return self.is_empty() & ~(owners > 1).any(axis=1)
+
+    # -- Random playout --
+    def play_random(self, rng, max_turns: int = 1000):
+        """Plays all games with random decisions until they are over or stalled.
+
+        Auctions go to a random player for a random part of his money. With an empty
+        stack the current player trades a random shared cow type for random offers."""
+        game_idx = np.arange(self.num_games)
+        while True:
+            ongoing = ~(self.is_game_over() | self.is_stalled())
+            ongoing &= self.turn < max_turns
+            if not ongoing.any():
+                return
+
+            games = game_idx[ongoing]
+            auctions = games[~self.is_empty(games)]
+            trades = games[self.is_empty(games)]
+
+            if len(auctions):
+                self._random_auction(rng, auctions)
+            if len(trades):
+                self._random_trade(rng, trades)
+            self.end_turn(games)
+
+    def _random_auction(self, rng, games):
+        cow_types = self.draw_cards(games)
+        buyers = rng.integers(0, self.num_players, size=len(games))
+        payments = rng.integers(0, self.money[games, buyers] + 1)
+        self.handle_bid(games, cow_types, buyers, self.current_player[games], payments)
+
+    def _random_trade(self, rng, games):
+        shared = self.get_shared_cows(games)
+        can_trade = shared.any(axis=(1, 2))
+        games = games[can_trade]  # the others skip their turn
+        shared = shared[can_trade]
+        if not len(games):
+            return
+
+        choice = (rng.random(shared.shape) * shared).reshape(len(games), -1).argmax(1)
+        contenders, cow_types = np.unravel_index(choice, shared.shape[1:])
+        challengers = self.current_player[games]
+        cow_amounts = np.minimum(
+            self.cows[games, challengers, cow_types],
+            self.cows[games, contenders, cow_types],
+        )
+        self.handle_trade(
+            games,
+            cow_types,
+            cow_amounts,
+            challengers,
+            contenders,
+            rng.integers(0, self.money[games, challengers] + 1),
+            rng.integers(0, self.money[games, contenders] + 1),
+        )
+
+    # -- Validation --
+    def get_state(self, game: int) -> dict:
+        """Returns the state of one game in the same form as get_game_state"""
+        return {
+            "money": self.money[game].tolist(),
+            "cows": [
+                {
+                    int(self.cow_values[t]): int(n)
+                    for t, n in enumerate(self.cows[game, p])
+                    if n
+                }
+                for p in range(self.num_players)
+            ],
+            "scores": self.get_scores()[game].tolist(),
+            "current_player": int(self.current_player[game]),
+            "turn": int(self.turn[game]),
+            "stack": self.cow_values[self.decks[game, self.deck_pos[game] :]].tolist(),
+            "inflation_stage": int(self.inflation_stage[game]),
+            "active_players": np.flatnonzero(self.active[game]).tolist(),
+        }
+
+
+def get_game_state(game) -> dict:
+    """Returns the state of a Game to compare it with a BatchGame"""
+    players = game.get_all_players()
+    cows = []
+    for player in players:
+        counts = {}
+        for cow in player.get_cow_inventory():
+            counts[cow] = counts.get(cow, 0) + 1
+        cows.append(counts)
+
+    return {
+        "money": [list(player.get_money_inventory()) for player in players],
+        "cows": cows,
+        "scores": [player.get_score() for player in players],
+        "current_player": game.get_current_player_idx(),
+        "turn": game.get_current_turn(),
+        "stack": list(game.card_stack._card_stack),
+        "inflation_stage": game.bank._money_inflation_stage,
+        "active_players": list(game._active_players),
+    }
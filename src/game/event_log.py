@@ -0,0 +1,170 @@
+import bisect
+import struct
+from collections.abc import Iterator
+from enum import IntEnum
+
+from player import packed_money
+
+KEYFRAME_INTERVAL = 10  # turns between two snapshots of the game
+
+
+class EventType(IntEnum):
+    CARD_DRAWN = 1
+    DONKEY = 2
+    BID = 3
+    PASS = 4
+    BUY_BACK = 5
+    PAYMENT = 6
+    TRADE_CHALLENGE = 7
+    TRADE_OFFER = 8
+    TRADE_RESULT = 9
+    TRADE_DRAW = 10
+    END_TURN = 11
+    KEYFRAME = 12
+
+
+# Fields of the events, "M" is a money list with one count per money card value.
+# A KEYFRAME is the turn followed by the bytes of Game.to_bytes
+_EVENT_FIELDS = {
+    EventType.CARD_DRAWN: "H",  # cow
+    EventType.DONKEY: "B",  # inflation stage after the donkey
+    EventType.BID: "BI",  # player, value
+    EventType.PASS: "B",  # player
+    EventType.BUY_BACK: "B?",  # bid master, bought back
+    EventType.PAYMENT: "HBBM",  # cow, buyer, seller, money
+    EventType.TRADE_CHALLENGE: "BBHB",  # challenger, contender, cow, amount
+    EventType.TRADE_OFFER: "BM",  # player, money
+    EventType.TRADE_RESULT: "HBBMMBB",  # cow, amount, contender, money x2, winner, loser
+    EventType.TRADE_DRAW: "BB",  # challenger, contender
+    EventType.END_TURN: "",
+    EventType.KEYFRAME: "I",  # turn
+}
+_EVENT_STRUCTS = {
+    event_type: struct.Struct("<" + fields.replace("M", f"{packed_money.NUM_LANES}H"))
+    for event_type, fields in _EVENT_FIELDS.items()
+}
+_RECORD_HEADER = struct.Struct("<BH")  # event type, length of the payload
+
+
+def _flatten(event_type: EventType, fields: tuple) -> list:
+    values = []
+    for code, field in zip(_EVENT_FIELDS[event_type], fields):
+        if code == "M":
+            values.extend(field)
+        else:
+            values.append(field)
+    return values
+
+
+def _group(event_type: EventType, values: tuple) -> tuple:
+    fields = []
+    pos = 0
+    for code in _EVENT_FIELDS[event_type]:
+        if code == "M":
+            fields.append(list(values[pos : pos + packed_money.NUM_LANES]))
+            pos += packed_money.NUM_LANES
+        else:
+            fields.append(values[pos])
+            pos += 1
+    return tuple(fields)
+
+
+class EventLog:
+    """Append only binary log of the state changes of a game.
+
+    A record is the event type, the payload length and the packed fields, see
+    _EVENT_FIELDS. Every keyframe_interval turns a snapshot of the game is
+    appended, the keyframe index maps turns to snapshots to seek without replaying
+    from the start. See application.replay"""
+
+    def __init__(self, keyframe_interval: int = KEYFRAME_INTERVAL):
+        self.keyframe_interval = keyframe_interval
+        self._data = bytearray()
+        self._keyframe_turns: list[int] = []
+        self._keyframe_offsets: list[int] = []
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def record(self, event_type: EventType, *fields) -> None:
+        """Appends an event with the fields of _EVENT_FIELDS"""
+        payload = _EVENT_STRUCTS[event_type].pack(*_flatten(event_type, fields))
+        self._data += _RECORD_HEADER.pack(event_type, len(payload))
+        self._data += payload
+
+    def add_keyframe(self, turn: int, snapshot: bytes) -> None:
+        """Appends the snapshot of the game at the start of the turn"""
+        self._keyframe_turns.append(turn)
+        self._keyframe_offsets.append(len(self._data))
+        payload = _EVENT_STRUCTS[EventType.KEYFRAME].pack(turn) + snapshot
+        self._data += _RECORD_HEADER.pack(EventType.KEYFRAME, len(payload))
+        self._data += payload
+
+    def is_keyframe_turn(self, turn: int) -> bool:
+        return turn % self.keyframe_interval == 0
+
+    def get_keyframe_offset(self, turn: int) -> int:
+        """Returns the offset of the last keyframe at or before the turn"""
+        pos = bisect.bisect_right(self._keyframe_turns, turn) - 1
+        if pos < 0:
+            raise ValueError(f"No keyframe at or before turn {turn}")
+        return self._keyframe_offsets[pos]
+
+    def iter_events(
+        self, offset: int = 0, event_types: set[EventType] | None = None
+    ) -> Iterator[tuple[EventType, tuple, int]]:
+        """Yields (event type, fields, offset) of the records from the offset on,
+        only of the given event types if any. Other records are skipped undecoded.
+
+        The fields of a KEYFRAME are the turn and the snapshot"""
+        data = self._data
+        header_size = _RECORD_HEADER.size
+        while offset < len(data):
+            event_type, length = _RECORD_HEADER.unpack_from(data, offset)
+            start = offset + header_size
+            if event_types is not None and event_type not in event_types:
+                offset = start + length
+                continue
+            event_type = EventType(event_type)
+            event_struct = _EVENT_STRUCTS[event_type]
+            if event_type == EventType.KEYFRAME:
+                (turn,) = event_struct.unpack_from(data, start)
+                snapshot = bytes(data[start + event_struct.size : start + length])
+                fields = (turn, snapshot)
+            else:
+                fields = _group(event_type, event_struct.unpack_from(data, start))
+            yield event_type, fields, offset
+            offset = start + length
+
+    # -- Files --
+    def to_bytes(self) -> bytes:
+        return bytes(self._data)
+
+    @classmethod
+    def from_bytes(
+        cls, data: bytes, keyframe_interval: int = KEYFRAME_INTERVAL
+    ) -> "EventLog":
+        """Reads a log and rebuilds the keyframe index from its records"""
+        log = cls(keyframe_interval)
+        log._data = bytearray(data)
+        header_size = _RECORD_HEADER.size
+        offset = 0
+        while offset < len(data):
+            event_type, length = _RECORD_HEADER.unpack_from(data, offset)
+            if event_type == EventType.KEYFRAME:
+                (turn,) = _EVENT_STRUCTS[EventType.KEYFRAME].unpack_from(
+                    data, offset + header_size
+                )
+                log._keyframe_turns.append(turn)
+                log._keyframe_offsets.append(offset)
+            offset += header_size + length
+        return log
+
+    def save(self, path: str) -> None:
+        with open(path, "wb") as file:
+            file.write(self._data)
+
+    @classmethod
+    def load(cls, path: str, keyframe_interval: int = KEYFRAME_INTERVAL) -> "EventLog":
+        with open(path, "rb") as file:
+            return cls.from_bytes(file.read(), keyframe_interval)
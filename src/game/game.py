@@ -1,33 +1,92 @@
 import random
-from player.players import Player
+import struct
+from collections.abc import Iterator
+from types import MappingProxyType
+from action_handlers.bidding import BidHandler
+from player.players import Player, get_cow_type_id, get_cow_type_value
+from player.cow_index import CowIndex
+from player import packed_money
+from player import zobrist
+from player.payment_solver import iter_offers, iter_payments
+from return_types.action import ActionType, Trade
 from game.player_view import PlayerView, PublicView, PrivateView
+from game.journal import Journal
+from game.event_log import EventLog, EventType
 from game_config.game_config import GameConfig
 
 # TODO public game info. kuh karten, wie viele geld karten, game view?
 
+# Layout of Game.to_bytes, little endian. The header is followed by the cow values,
+# the deck as indices into the cow values and one block per player: name, money
+# counts, cow counts per cow value and the finished quartets as cow value indices
+_STATE_MAGIC = b"KUH1"
+_STATE_HEADER = struct.Struct(
+    "<4s"  # magic
+    "BBB"  # number of players, current player, flags
+    "HH"  # active players, players whose cows changed this turn (bit masks)
+    "BIq"  # inflation stage, turn, seed
+    "BBB"  # number of cow values, cards in the deck, deck cursor
+)
+_STATE_MONEY = struct.Struct(f"<{packed_money.NUM_LANES}H")
+_FLAG_CHECKED_ALL_FINISHED = 1
+_FLAG_GAME_IS_ONGOING = 2
+_FLAG_HAS_SEED = 4
+
+# smallest raise of a bid, the smallest money card with a value
+BID_STEP = min(value for value in GameConfig.MONEY_CARD_VALUES if value)
+
 
 class Game:
     __player_limit = [2, 5]  # TODO optional
     game_is_ongoing = True
 
-    def __init__(self, num_players, player_names: list[str]):
+    def __init__(self, num_players, player_names: list[str], seed: int | None = None):
         self.num_players = num_players
         self.player_names = player_names
+        self.seed = seed  # stream id of the game, None for a random game
 
     def start_game(self):
-        self.card_stack = CardStack(GameConfig.COW_CARD_VALUES)
-        self.bank = Bank()
+        self.rng = random.Random(self.seed)  # same seed, same game in every process
+        self.journal = Journal()  # undo log of push and pop
+        self.card_stack = CardStack(GameConfig.COW_CARD_VALUES, self.rng, self.journal)
+        self.bank = Bank(self.journal)
 
+        self.event_log: EventLog | None = None  # see set_event_log
+        self.cow_index = CowIndex(self.num_players)
         self._players = self._create_players()
         self._current_player = self._get_random_starting_player()
         self._current_turn = 0
         self._active_players = list(range(self.num_players))
+        self._active_hash = self._get_active_hash()
+
+        # kept up to date while cows move, so the turn end only looks at changes
+        self._changed_players: set[int] = set()  # cows changed in this turn
+        self._players_with_cows = {
+            player.get_player_idx() for player in self._players if player.has_any_cow()
+        }
+        self._checked_all_finished = False  # all players checked with empty deck
+
+        # views are cached per version, see get_version and get_player_view
+        self._version = 0  # changes of the turn order
+        self._view_version = None
+        self._player_views: list[PlayerView | None] = [None] * self.num_players
+        self._public_views: list[tuple[int, PublicView] | None] = [
+            None
+        ] * self.num_players  # (player version, view)
+        self._private_money: list[tuple[int, tuple[int, ...], int] | None] = [
+            None
+        ] * self.num_players  # (player version, money cards, money value)
+        self._joint_cows_key = None  # (cow index version, current player)
+        self._remaining_version = None  # card stack version
 
     def _create_players(self) -> list[Player]:
-        return [Player(i, self.player_names[i]) for i in range(self.num_players)]
+        return [
+            Player(i, self.player_names[i], self.cow_index, self.journal)
+            for i in range(self.num_players)
+        ]
 
     def _get_random_starting_player(self) -> int:
-        return random.randint(0, self.num_players - 1)
+        return self.rng.randint(0, self.num_players - 1)
 
     def get_player(self, idx: int):
         return self._players[idx]
@@ -50,49 +109,328 @@ class Game:
 
     def set_current_player(self, idx: int):
         """Sets the new index of the current player"""
+        self.journal.record(self.set_current_player, self._current_player)
         self._current_player = idx
+        self._version += 1
 
     def get_current_turn(self):
         """Get the current count of turns"""
         return self._current_turn
 
+    def _set_current_turn(self, turn: int):
+        self._current_turn = turn
+
+    # -- Hypothetical moves --
+    def push(self):
+        """Saves the current state, every following change can be reverted with pop.
+
+        Changes are recorded in the journal and reverted in place, no state is copied.
+        Pushes can be nested"""
+        self.journal.push()
+
+    def pop(self):
+        """Restores the state of the matching push"""
+        self.journal.pop()
+
+    # -- Event log --
+    def set_event_log(self, event_log: EventLog):
+        """Records every following state change in the log, which starts with a
+        keyframe of the current state"""
+        self.event_log = event_log
+        event_log.add_keyframe(self._current_turn, self.to_bytes())
+
+    def log_event(self, event_type: EventType, *fields):
+        """Records an event, unless the change is hypothetical (see push)"""
+        if self.event_log is not None and not self.journal.get_depth():
+            self.event_log.record(event_type, *fields)
+
+    # -- Serialization --
+    def to_bytes(self) -> bytes:
+        """Packs the game state into a few hundred bytes, see _STATE_HEADER.
+
+        The random generator is only used to deal, it is restored from the seed"""
+        players = self._players
+        cow_values = set(self.card_stack._cards)
+        for player in players:
+            cow_values.update(player.get_cow_inventory())
+            cow_values.update(player._cow_cards.cow_finished)
+        cow_values = sorted(cow_values)
+        cow_value_idx = {cow: i for i, cow in enumerate(cow_values)}
+
+        flags = 0
+        if self._checked_all_finished:
+            flags |= _FLAG_CHECKED_ALL_FINISHED
+        if self.game_is_ongoing:
+            flags |= _FLAG_GAME_IS_ONGOING
+        if self.seed is not None:
+            flags |= _FLAG_HAS_SEED
+
+        parts = [
+            _STATE_HEADER.pack(
+                _STATE_MAGIC,
+                self.num_players,
+                self._current_player,
+                flags,
+                sum(1 << idx for idx in self._active_players),
+                sum(1 << idx for idx in self._changed_players),
+                self.bank._money_inflation_stage,
+                self._current_turn,
+                self.seed if self.seed is not None else 0,
+                len(cow_values),
+                len(self.card_stack._cards),
+                self.card_stack._position,
+            ),
+            struct.pack(f"<{len(cow_values)}H", *cow_values),
+            bytes(cow_value_idx[cow] for cow in self.card_stack._cards),
+        ]
+        for player in players:
+            name = player.get_player_name().encode()
+            finished = player._cow_cards.cow_finished
+            parts.append(bytes([len(name)]) + name)
+            parts.append(_STATE_MONEY.pack(*player.get_money_inventory()))
+            parts.append(bytes(player.get_cow_count(cow) for cow in cow_values))
+            parts.append(bytes([len(finished)] + [cow_value_idx[c] for c in finished]))
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "Game":
+        """Restores a game packed with to_bytes"""
+        (
+            magic,
+            num_players,
+            current_player,
+            flags,
+            active_players,
+            changed_players,
+            inflation_stage,
+            current_turn,
+            seed,
+            num_cow_values,
+            num_cards,
+            position,
+        ) = _STATE_HEADER.unpack_from(data)
+        if magic != _STATE_MAGIC:
+            raise ValueError("Not a packed game state")
+
+        offset = _STATE_HEADER.size
+        cow_values = struct.unpack_from(f"<{num_cow_values}H", data, offset)
+        offset += 2 * num_cow_values
+        cards = [cow_values[i] for i in data[offset : offset + num_cards]]
+        offset += num_cards
+
+        names, money, cows, finished = [], [], [], []
+        for _ in range(num_players):
+            name_len = data[offset]
+            names.append(data[offset + 1 : offset + 1 + name_len].decode())
+            offset += 1 + name_len
+            money.append(_STATE_MONEY.unpack_from(data, offset))
+            offset += _STATE_MONEY.size
+            cows.append(data[offset : offset + num_cow_values])
+            offset += num_cow_values
+            num_finished = data[offset]
+            finished.append(
+                [cow_values[i] for i in data[offset + 1 : offset + 1 + num_finished]]
+            )
+            offset += 1 + num_finished
+
+        game = cls.from_state(
+            names,
+            cards,
+            [list(player_money) for player_money in money],
+            [
+                [cow for cow, count in zip(cow_values, counts) for _ in range(count)]
+                for counts in cows
+            ],
+            finished,
+            current_player,
+            current_turn,
+            inflation_stage,
+            [i for i in range(num_players) if active_players & (1 << i)],
+            position,
+            seed if flags & _FLAG_HAS_SEED else None,
+        )
+        game._changed_players = {
+            i for i in range(num_players) if changed_players & (1 << i)
+        }
+        game._checked_all_finished = bool(flags & _FLAG_CHECKED_ALL_FINISHED)
+        if not flags & _FLAG_GAME_IS_ONGOING:
+            game.game_is_ongoing = False
+        return game
+
+    @classmethod
+    def from_state(
+        cls,
+        player_names: list[str],
+        cards: list[int],
+        money: list[list[int]],
+        cows: list[list[int]],
+        finished: list[list[int]],
+        current_player: int,
+        current_turn: int = 0,
+        inflation_stage: int = 2,
+        active_players: list[int] | None = None,
+        position: int = 0,
+        seed: int | None = None,
+    ) -> "Game":
+        """Creates a started game in the given state, e.g. a guess of the hidden cards.
+
+        cards is the stack from the bottom, position the number of drawn cards. money
+        are the money amounts, cows the cow inventories and finished the finished
+        quartets in order, all per player"""
+        # dealing again restores the random generator of a seeded game
+        game = cls(len(player_names), list(player_names), seed)
+        game.start_game()
+        game.card_stack._set_cards(list(cards), position)
+        game.bank._money_inflation_stage = inflation_stage
+
+        for idx, player in enumerate(game._players):
+            player.remove_packed_money(player.get_packed_money())
+            player.add_packed_money(packed_money.pack(money[idx]))
+            for cow in set(player.get_cow_inventory()):
+                player.remove_cow(cow, player.get_cow_count(cow))
+            for cow in finished[idx]:  # one at a time keeps the order of the quartets
+                player.add_cow(cow, 4)
+                player.update_score()
+            for cow in sorted(set(cows[idx])):
+                player.add_cow(cow, cows[idx].count(cow))
+            game._update_cow_owner(idx)
+
+        game._current_player = current_player
+        game._current_turn = current_turn
+        if active_players is not None:
+            game._active_players = list(active_players)
+            game._active_hash = game._get_active_hash()
+        return game
+
     def get_money_value(self, money_amount: list[int]) -> int:
         """Retrun the sum of money cards"""
         return sum([a * b for a, b in zip(money_amount, GameConfig.MONEY_CARD_VALUES)])
 
+    def get_active_players(self) -> list[int]:
+        """Returns the players which are still playing, in turn order. Must not be modified"""
+        return self._active_players
+
     def remove_active_player(self, idx):
         """Remove an player if he is not active anymore"""
+        self.journal.record(
+            self._insert_active_player, self._active_players.index(idx), idx
+        )
         self._active_players.remove(idx)
+        self._active_hash ^= zobrist.key(zobrist.ACTIVE_PLAYER, idx)
+        self._version += 1
+
+    def _insert_active_player(self, position: int, idx: int):
+        self._active_players.insert(position, idx)
+        self._active_hash ^= zobrist.key(zobrist.ACTIVE_PLAYER, idx)
+        self._version += 1
+
+    # -- Hashing --
+    def get_hash(self) -> int:
+        """Returns the Zobrist hash of the game state, see zobrist.
+
+        Covers money, cows and finished quartets of every player, the cards left in
+        the stack, the current and active players and the inflation stage. The parts
+        are updated with every change, so this only combines them"""
+        h = self._active_hash ^ self.card_stack.get_hash()
+        h ^= zobrist.key(zobrist.CURRENT_PLAYER, self._current_player)
+        h ^= zobrist.key(zobrist.INFLATION, self.bank._money_inflation_stage)
+        for player in self._players:
+            h ^= player.get_hash()
+        return h
+
+    def _get_active_hash(self) -> int:
+        h = 0
+        for idx in self._active_players:
+            h ^= zobrist.key(zobrist.ACTIVE_PLAYER, idx)
+        return h
+
+    def get_version(self) -> int:
+        """Returns a counter which grows with every change of the game state.
+
+        Players and the card stack count their own changes, so the sum only grows"""
+        version = self._version + self.card_stack.get_version()
+        for player in self._players:
+            version += player.get_version()
+        return version
 
     def get_player_view(self, player_idx: int) -> PlayerView:
-        """Return the player view for the given player index"""
-        player = self.get_player(player_idx)
-        all_players = self.get_all_players()
-
-        public_player_view = []
-        for player in all_players:
-            public_player_view.append(
-                PublicView(
-                    player.get_player_idx(),
-                    player.get_player_name(),
-                    player.get_cow_inventory(),
-                    player.get_money_cards_count(),
-                    player.get_score(),
+        """Return the player view for the given player index.
+
+        Views are cached until the game changes. The public part is shared by all
+        players and only rebuilt for players whose cows, money or score changed"""
+        version = self.get_version()
+        if version != self._view_version:
+            self._view_version = version
+            self._player_views = [None] * self.num_players
+            self._update_shared_views()
+
+        view = self._player_views[player_idx]
+        if view is None:
+            view = PlayerView(
+                player_idx,
+                self._shared_public,
+                PrivateView(*self._get_private_money(player_idx), self._joint_cows),
+                self._remaining_cows,
+                self._current_player,
+            )
+            self._player_views[player_idx] = view
+        return view
+
+    def _update_shared_views(self):
+        """Builds the parts of the views which are the same for every player"""
+        public = []
+        for idx, player in enumerate(self._players):
+            cached = self._public_views[idx]
+            player_version = player.get_version()
+            if cached is None or cached[0] != player_version:
+                cached = (
+                    player_version,
+                    PublicView(
+                        idx,
+                        player.get_player_name(),
+                        tuple(player.get_cow_inventory()),
+                        player.get_money_cards_count(),
+                        player.get_score(),
+                        player.get_finished_cows(),
+                    ),
                 )
+                self._public_views[idx] = cached
+            public.append(cached[1])
+        self._shared_public = tuple(public)
+
+        joint_cows_key = (self.cow_index.get_version(), self._current_player)
+        if joint_cows_key != self._joint_cows_key:
+            self._joint_cows_key = joint_cows_key
+            joint_cows = self.get_possible_cow_trades()
+            self._joint_cows = MappingProxyType(
+                {idx: tuple(cows) for idx, cows in joint_cows.items()}
+            )
+        if self.card_stack.get_version() != self._remaining_version:
+            self._remaining_version = self.card_stack.get_version()
+            self._remaining_cows = MappingProxyType(
+                self.card_stack.get_remaining_counts()
             )
 
-        private_view = PrivateView(
-            player.get_money_inventory(),
-            player.get_money_value(),
-            self.get_possible_cow_trades(),
-        )
-
-        return PlayerView(player.get_player_idx(), public_player_view, private_view)
+    def _get_private_money(self, player_idx: int) -> tuple[tuple[int, ...], int]:
+        """Returns the money cards and money value, cached per player version"""
+        player = self._players[player_idx]
+        cached = self._private_money[player_idx]
+        player_version = player.get_version()
+        if cached is None or cached[0] != player_version:
+            cached = (
+                player_version,
+                tuple(player.get_money_inventory()),
+                player.get_money_value(),
+            )
+            self._private_money[player_idx] = cached
+        return cached[1], cached[2]
 
     # -- Game Logik --
     def is_game_over(self) -> list[int] | None:
         """Returns the final scores if the game is over, otherwise None"""
         if self.card_stack.is_empty() and not self.have_players_cows():
+            if self.game_is_ongoing:
+                self.journal.record(self._set_game_is_ongoing, True)
             self.game_is_ongoing = False
 
             scores = []
@@ -103,58 +441,207 @@ class Game:
         else:
             return None
 
+    def _set_game_is_ongoing(self, is_ongoing: bool):
+        self.game_is_ongoing = is_ongoing
+
     def have_players_cows(self):
-        has_cow = False
-        for i in range(self.num_players):
-            if any(self._players[i]._cow_cards.get_cow_inventory()):
-                has_cow = True
-                break
-        return has_cow
+        return bool(self._players_with_cows)
+
+    def get_num_players_with_cows(self) -> int:
+        return len(self._players_with_cows)
+
+    def _mark_cows_changed(self, idx: int):
+        """Updates the cow bookkeeping after cows of a player moved"""
+        if idx not in self._changed_players:
+            self.journal.record(self._changed_players.discard, idx)
+            self._changed_players.add(idx)
+        self._update_cow_owner(idx)
+
+    def _update_cow_owner(self, idx: int):
+        has_cows = self._players[idx].has_any_cow()
+        if has_cows == (idx in self._players_with_cows):
+            return
+        if has_cows:
+            self._players_with_cows.add(idx)
+            self.journal.record(self._players_with_cows.discard, idx)
+        else:
+            self._players_with_cows.discard(idx)
+            self.journal.record(self._players_with_cows.add, idx)
+
+    def is_stalled(self) -> bool:
+        """Returns True if the deck is empty and no two players share a cow type"""
+        if not self.card_stack.is_empty():
+            return False
+        return not self.cow_index.has_joint_cow_type()
 
     def remove_finished_player(self):
-        """Check if a player has no cows and the deck is empty"""
-        if self.card_stack.is_empty():
-            for pl_idx in list(self._active_players):
-                if not any(self.get_player(pl_idx).get_cow_inventory()):
-                    self.remove_active_player(pl_idx)
-
-    def get_possible_cow_trades(self) -> dict[int, list[int]]:
-        """Returns a dict with player indices and the joint cows with respect the current player."""
-        curr_pl = self._players[self._current_player]
-        curr_cows = list(set(curr_pl._cow_cards.get_cow_inventory()))
-
-        ret = {}
-        for pl in self._players:
-            if pl.get_player_idx() == curr_pl.get_player_idx():
-                continue
-            cows = list(set(pl._cow_cards.get_cow_inventory()))
-            joint_cows = []
-
-            for cow in cows:
-                if cow in curr_cows:
-                    joint_cows.append(cow)
-            if any(joint_cows):
-                ret[pl.get_player_idx()] = joint_cows
-
-        if ret:
-            return ret
+        """Check if a player has no cows and the deck is empty.
+
+        Once every player was checked with an empty deck, only players whose cows
+        changed can have finished"""
+        if not self.card_stack.is_empty():
+            return
+
+        if self._checked_all_finished:
+            candidates = [i for i in self._active_players if i in self._changed_players]
         else:
-            return {}
+            candidates = list(self._active_players)
+            self.journal.record(self._set_checked_all_finished, False)
+            self._checked_all_finished = True
+
+        for pl_idx in candidates:
+            if pl_idx not in self._players_with_cows:
+                self.remove_active_player(pl_idx)
+
+    def _set_checked_all_finished(self, checked: bool):
+        self._checked_all_finished = checked
+
+    def get_possible_cow_trades(
+        self, player_idx: int | None = None
+    ) -> dict[int, list[int]]:
+        """Returns a dict with player indices and the joint cows with respect to the given player, by default the current player."""
+        if player_idx is None:
+            player_idx = self._current_player
+
+        return {
+            other: [get_cow_type_value(cow_type) for cow_type in cow_types]
+            for other, cow_types in self.cow_index.get_joint_cow_types(
+                player_idx
+            ).items()
+        }
+
+    def get_players_with_cow(self, cow_card: int, min_count: int = 1) -> list[int]:
+        """Returns the players which have at least min_count cows of the cow card"""
+        return self.cow_index.get_players_with(get_cow_type_id(cow_card), min_count)
+
+    # -- Legal actions --
+    # Generators, so a search can stop after the first actions. Cheap actions come
+    # first: passing before bidding, smaller bids, offers and payments before larger
+    def iter_legal_actions(
+        self,
+        phase: ActionType | None = None,
+        player_idx: int | None = None,
+        bid_handler: BidHandler | None = None,
+    ) -> Iterator:
+        """Yields the legal actions of the player, by default the current player.
+
+        phase None is the choice of the action, BID a bid or pass (None) in the
+        auction of bid_handler, BUY_BACK the buy back decision of its bid master and
+        TRADE a challenge with an offer"""
+        if player_idx is None:
+            player_idx = self._current_player
+
+        if phase is None:
+            yield from self.iter_actions(player_idx)
+        elif phase == ActionType.BID:
+            yield from self.iter_bids(player_idx, bid_handler)
+        elif phase == ActionType.BUY_BACK:
+            yield from self.iter_buy_backs(bid_handler)
+        elif phase == ActionType.TRADE:
+            yield from self.iter_trades(player_idx)
+        else:
+            raise ValueError(f"No legal actions for {phase}")
+
+    def iter_actions(self, player_idx: int | None = None) -> Iterator[ActionType]:
+        """Yields BID if a card is left and TRADE if the player shares a cow type"""
+        if player_idx is None:
+            player_idx = self._current_player
+        if not self.card_stack.is_empty():
+            yield ActionType.BID
+        if self.cow_index.get_joint_cow_types(player_idx):
+            yield ActionType.TRADE
+
+    def iter_bids(
+        self, player_idx: int, bid_handler: BidHandler, step: int = BID_STEP
+    ) -> Iterator[int | None]:
+        """Yields a pass (None), then the bids in steps up to the money of the player"""
+        if player_idx not in bid_handler.remaining_players:
+            return
+        yield None
+        money_value = self._players[player_idx].get_money_value()
+        yield from range(bid_handler.get_highest_bid() + step, money_value + 1, step)
+
+    def iter_buy_backs(self, bid_handler: BidHandler) -> Iterator[bool]:
+        """Yields False, then True if the bid master can buy the cow back"""
+        yield False
+        winner_bid = bid_handler.get_winner_bid()
+        bid_master = self._players[bid_handler.bid_master]
+        if winner_bid.player_idx != bid_handler.bid_master and (
+            winner_bid.value < bid_master.get_money_value()
+        ):  # the same condition as in PlayBidTurn
+            yield True
+
+    def iter_payments(self, player_idx: int, target_value: int) -> Iterator[list[int]]:
+        """Yields the money cards the player can pay at least target_value with.
+
+        Payments with a card which could be left out are skipped, see
+        payment_solver.iter_payments"""
+        packed = self._players[player_idx].get_packed_money()
+        for payment in iter_payments(target_value, packed):
+            yield list(payment)
+
+    def iter_trades(
+        self, player_idx: int | None = None
+    ) -> Iterator[tuple[int, int, int, Trade]]:
+        """Yields (contender, cow card, amount, offer) of the possible challenges.
+
+        The offers only differ by value and card count for the contender, so one
+        offer per value and count is yielded, see payment_solver.iter_offers"""
+        if player_idx is None:
+            player_idx = self._current_player
+        player = self._players[player_idx]
+        challenges = [
+            (enemy_idx, cow_card, amount)
+            for enemy_idx, cow_cards in sorted(
+                self.get_possible_cow_trades(player_idx).items()
+            )
+            for cow_card in cow_cards
+            for amount in range(
+                1,
+                min(
+                    player.get_cow_count(cow_card),
+                    self._players[enemy_idx].get_cow_count(cow_card),
+                )
+                + 1,
+            )
+        ]
+        if not challenges:
+            return
+
+        for offer in iter_offers(player.get_packed_money()):
+            for enemy_idx, cow_card, amount in challenges:
+                yield enemy_idx, cow_card, amount, Trade(player_idx, list(offer))
 
     # -- Turn handling --
     def end_turn(self):
         """Check if players have 4 cows, update the score and change to the next player"""
-        for player in self.get_all_players():
-            player.update_score()
+        self.log_event(EventType.END_TURN)
+        for idx in self._changed_players:
+            self._players[idx].update_score()
+            self._update_cow_owner(idx)
 
         self.remove_finished_player()
+        self.journal.record(self._set_changed_players, self._changed_players)
+        self._changed_players = set()
 
         if len(self._active_players) <= 1:
             return
 
+        self.journal.record(self._set_current_turn, self._current_turn)
         self._current_turn += 1
         self.set_next_player()
 
+        log = self.event_log
+        if (
+            log is not None
+            and not self.journal.get_depth()
+            and log.is_keyframe_turn(self._current_turn)
+        ):
+            log.add_keyframe(self._current_turn, self.to_bytes())
+
+    def _set_changed_players(self, changed_players: set[int]):
+        self._changed_players = changed_players
+
     def set_next_player(self):
         """Sets the next "current player" in the active player list"""
         current_player = self.get_current_player_idx()
@@ -184,9 +671,18 @@ class Game:
         player_who_gets_money: int,
         money_amount: list[int],
     ):
-        self._players[player_who_gets_cow].add_cow(cow_type, 1)
-        self._players[player_who_gets_money].add_money(money_amount)
+        # the removal raises if the cards are missing, before anything changed
         self._players[player_who_gets_cow].remove_money(money_amount)
+        self._players[player_who_gets_money].add_money(money_amount)
+        self._players[player_who_gets_cow].add_cow(cow_type, 1)
+        self._mark_cows_changed(player_who_gets_cow)
+        self.log_event(
+            EventType.PAYMENT,
+            cow_type,
+            player_who_gets_cow,
+            player_who_gets_money,
+            money_amount,
+        )
 
     def handle_trade(
         self,
@@ -198,48 +694,133 @@ class Game:
         winner_idx: int,
         loser_idx: int,
     ):
+        # the removals raise if cards are missing. The second one can only fail
+        # after the first changed the challenged player, so it is reverted then
+        challenger = self._players[self.get_current_player_idx()]
+        contender = self._players[challenged_player]
+        contender.remove_money(money_amount_contender)
+        try:
+            challenger.remove_money(money_amount_challenger)
+        except ValueError:
+            contender.add_money(money_amount_contender)
+            raise
+        contender.add_money(money_amount_challenger)
+        challenger.add_money(money_amount_contender)
+
         self._players[winner_idx].add_cow(cow_type, cow_amount)
         self._players[loser_idx].remove_cow(cow_type, cow_amount)
-
-        self._players[challenged_player].add_money(money_amount_challenger)
-        self._players[challenged_player].remove_money(money_amount_contender)
-
-        self._players[self.get_current_player_idx()].add_money(money_amount_contender)
-        self._players[self.get_current_player_idx()].remove_money(
-            money_amount_challenger
+        self._mark_cows_changed(winner_idx)
+        self._mark_cows_changed(loser_idx)
+        self.log_event(
+            EventType.TRADE_RESULT,
+            cow_type,
+            cow_amount,
+            challenged_player,
+            money_amount_challenger,
+            money_amount_contender,
+            winner_idx,
+            loser_idx,
         )
 
 
 class CardStack:
-    def __init__(self, cow_cards: list[int]):
-        self._card_stack = self.get_random_stack(cow_cards)
-        self._is_card_stack_empty = False
+    """Preshuffled cards with a cursor to the next card"""
 
-    def get_random_stack(self, cow_cards: list[int]) -> list[int]:
+    def __init__(
+        self,
+        cow_cards: list[int],
+        rng: random.Random = random,
+        journal: Journal | None = None,
+    ):
+        self._version = 0  # grows with every draw or new stack
+        self._journal = journal
+        self._set_cards(self.get_random_stack(cow_cards, rng))
+
+    def _set_cards(self, cards: list[int], position: int = 0):
+        self._version += 1
+        self._cards = cards
+        self._position = position
+        self._remaining = dict.fromkeys(cards, 0)  # cow value -> cards left
+        for cow in cards[position:]:
+            self._remaining[cow] += 1
+        self._hash: int | None = None  # kept up to date after the first get_hash
+
+    def _remaining_key(self, cow_card: int, count: int) -> int:
+        if not count:
+            return 0
+        return zobrist.key(zobrist.DECK, cow_card, count)
+
+    def get_hash(self) -> int:
+        """Returns the Zobrist hash of the cards left per cow type"""
+        if self._hash is None:
+            self._hash = 0
+            for cow, count in self._remaining.items():
+                self._hash ^= self._remaining_key(cow, count)
+        return self._hash
+
+    @property
+    def _card_stack(self) -> list[int]:
+        """The cards which are left. Can be replaced, e.g. with a stack for testing"""
+        return self._cards[self._position :]
+
+    @_card_stack.setter
+    def _card_stack(self, cards: list[int]):
+        self._set_cards(list(cards))
+
+    def get_random_stack(
+        self, cow_cards: list[int], rng: random.Random = random
+    ) -> list[int]:
         """Returns a random starting stack of cards for the given unique cow cards"""
         card_stack = []
         for i in range(len(cow_cards)):
             for j in range(4):
                 card_stack.append(cow_cards[i])
-        return random.sample(card_stack, len(card_stack))
+        return rng.sample(card_stack, len(card_stack))
 
     def draw_card(self) -> int:
         """Draws a cow card from the stack, removes it from the card stack and returns it"""
-        current_cow_draw = self._card_stack[0]
-        self._card_stack.pop(0)
-
-        if not any(self._card_stack):
-            self._is_card_stack_empty = True
-
+        current_cow_draw = self._cards[self._position]
+        self._position += 1
+        self._version += 1
+        count = self._remaining[current_cow_draw]
+        self._remaining[current_cow_draw] = count - 1
+        if self._hash is not None:
+            self._hash ^= self._remaining_key(current_cow_draw, count)
+            self._hash ^= self._remaining_key(current_cow_draw, count - 1)
+        if self._journal is not None:
+            self._journal.record(self._undo_draw_card)
         return current_cow_draw
 
+    def _undo_draw_card(self):
+        """Puts the last drawn card back on the stack"""
+        self._position -= 1
+        self._version += 1
+        cow = self._cards[self._position]
+        count = self._remaining[cow]
+        self._remaining[cow] = count + 1
+        if self._hash is not None:
+            self._hash ^= self._remaining_key(cow, count)
+            self._hash ^= self._remaining_key(cow, count + 1)
+
+    def get_version(self) -> int:
+        """Returns a counter which grows with every draw or new stack"""
+        return self._version
+
     def get_num_cards(self) -> int:
         """Returns the number of cards in the stack"""
-        return len(self._card_stack)
+        return len(self._cards) - self._position
+
+    def get_remaining_count(self, cow_card: int) -> int:
+        """Returns how many cards of a cow type are left in the stack"""
+        return self._remaining.get(cow_card, 0)
+
+    def get_remaining_counts(self) -> dict[int, int]:
+        """Returns a copy of the cards left per cow type"""
+        return dict(self._remaining)
 
     def is_empty(self) -> bool:
         """Returns True if the card stack is empty"""
-        return self._is_card_stack_empty
+        return self._position >= len(self._cards)
 
     def is_donkey_cow(self, drawn_card) -> bool:
         """Check if a donkey cow was drawn"""
@@ -250,8 +831,9 @@ class CardStack:
 
 
 class Bank:
-    def __init__(self):
+    def __init__(self, journal: Journal | None = None):
         self._money_inflation_stage = 2  # starting with 50 money
+        self._journal = journal
 
     def get_inflation_value(self):
         if self._money_inflation_stage >= len(GameConfig.MONEY_CARD_VALUES):
@@ -260,18 +842,20 @@ class Bank:
 
     def inflate_player_money(self, player_list: list[Player]):
         """Increases the money of all players by 1 in the current inflation stage"""
-        money = [0] * len(GameConfig.MONEY_CARD_VALUES)
-
-        money[self._money_inflation_stage] = 1
+        money = packed_money.unit(self._money_inflation_stage)
         for player in player_list:
-            player.add_money(money)
-        self._money_inflation_stage += 1
+            player.add_packed_money(money)
+        self._set_inflation_stage(self._money_inflation_stage + 1)
 
     def undo_inflation(self, player_list: list[Player]):
         """Decreases the money of all players by 1 in the latest inflation stage"""
-        money = [0, 0, 0, 0, 0, 0]
-        self._money_inflation_stage -= 1
+        self._set_inflation_stage(self._money_inflation_stage - 1)
 
-        money[self._money_inflation_stage] = 1
+        money = packed_money.unit(self._money_inflation_stage)
         for player in player_list:
-            player.remove_money(money)
+            player.remove_packed_money(money)
+
+    def _set_inflation_stage(self, stage: int):
+        if self._journal is not None:
+            self._journal.record(self._set_inflation_stage, self._money_inflation_stage)
+        self._money_inflation_stage = stage
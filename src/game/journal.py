@@ -0,0 +1,44 @@
+from collections.abc import Callable
+
+
+class Journal:
+    """Undo log for hypothetical moves.
+
+    While a frame is open, every mutation of the game records a function which
+    reverts it. pop runs them in reverse order, so no state has to be copied"""
+
+    def __init__(self):
+        self._entries: list[tuple[Callable, tuple]] = []  # (undo function, args)
+        self._frames: list[int] = []  # start of each open frame in _entries
+        self._is_undoing = False
+
+    def is_recording(self) -> bool:
+        """Returns True if mutations have to be recorded"""
+        return bool(self._frames) and not self._is_undoing
+
+    def record(self, undo: Callable, *args) -> None:
+        """Records the function and arguments which revert a mutation"""
+        if self._frames and not self._is_undoing:
+            self._entries.append((undo, args))
+
+    def push(self) -> None:
+        """Opens a frame, the game can be restored to this point with pop"""
+        self._frames.append(len(self._entries))
+
+    def pop(self) -> None:
+        """Reverts all mutations since the matching push"""
+        if not self._frames:
+            raise IndexError("pop without a matching push")
+        start = self._frames.pop()
+        entries = self._entries
+        self._is_undoing = True
+        try:
+            while len(entries) > start:
+                undo, args = entries.pop()
+                undo(*args)
+        finally:
+            self._is_undoing = False
+
+    def get_depth(self) -> int:
+        """Returns the number of open frames"""
+        return len(self._frames)
@@ -1,32 +1,39 @@
+from collections.abc import Mapping
 from dataclasses import dataclass
 
+# Views are cached by the game and shared between players and calls, so they are
+# frozen and hold tuples and read only mappings instead of the players inventories.
 
-@dataclass
+
+@dataclass(frozen=True)
 class PublicView:
     """Defines the attributes which each player is allowed to see publicly"""
 
     player_idx: int
     player_name: str
-    cow_cards: list[int] | None
+    cow_cards: tuple[int, ...] | None
     money_cards_count: int
     score: int
+    finished_cows: tuple[int, ...] = ()  # cow values of the finished quartets
 
 
-@dataclass
+@dataclass(frozen=True)
 class PrivateView:
     """Defines the attributes which only the current player is allowed to see"""
 
-    money_card_values: list[int]
+    money_card_values: tuple[int, ...]
     money_value: int
-    joint_cows: dict[int, list[int]] | None = (
+    joint_cows: Mapping[int, tuple[int, ...]] | None = (
         None  # cows which other players also own. This attribute is not actually private but needed here for convenience
     )
 
 
-@dataclass
+@dataclass(frozen=True)
 class PlayerView:
     """Defines the visible and not visible player attributes"""
 
     current_player_idx: int
-    public: list[PublicView]
+    public: tuple[PublicView, ...]
     private: PrivateView
+    remaining_cows: Mapping[int, int] | None = None  # cards left in the stack per cow
+    turn_player_idx: int | None = None  # player whose turn it is
@@ -2,6 +2,7 @@ class GameConfig:
     # Kartenwerte
     COW_CARD_VALUES = [10]  # , 20, 40, 70, 100]  # z. B.
     DONKEY_COW = COW_CARD_VALUES[0]
+    STARTING_COWS = (20,)  # Kühe pro Spieler zu Beginn
 
     # Geldkarten
     MONEY_CARD_VALUES = [0, 10, 50, 100, 200, 500]
@@ -0,0 +1,85 @@
+import asyncio
+from abc import ABC, abstractmethod
+
+from action_handlers.bidding import BidHandler
+from game.player_view import PlayerView
+from interface.player_interface import PlayerInterface
+from return_types.action import ActionType, Bid, Trade
+
+
+class AsyncPlayerInterface(ABC):
+    """PlayerInterface whose decisions are awaited, see application.async_turns.
+
+    Decisions which do not depend on each other are collected concurrently, so
+    remote or slow players think at the same time"""
+
+    # General
+    @abstractmethod
+    async def choose_action(self, view: PlayerView) -> ActionType:
+        pass
+
+    # Bidding
+    @abstractmethod
+    async def make_bid_decision(self, view: PlayerView, bid_handler: BidHandler) -> Bid:
+        pass
+
+    @abstractmethod
+    async def make_buy_back_decision(self, view: PlayerView, highest_bid: Bid) -> bool:
+        pass
+
+    @abstractmethod
+    async def choose_money_cards(
+        self, view: PlayerView, highest: Bid, buyer_idx: int
+    ) -> list[int]:
+        pass
+
+    # Trading
+    @abstractmethod
+    async def make_trade_decision(
+        self, view: PlayerView, joint_cows: list[int]
+    ) -> tuple[int, int, int]:
+        pass
+
+    @abstractmethod
+    async def make_trade_offer(
+        self, view: PlayerView, card_count: int | None = None
+    ) -> Trade:
+        pass
+
+
+class AsyncPlayerAdapter(AsyncPlayerInterface):
+    """Awaitable wrapper of a PlayerInterface.
+
+    With in_thread the decisions run on a worker thread, so the event loop and the
+    other players are not blocked while the interface thinks"""
+
+    def __init__(self, interface: PlayerInterface, in_thread: bool = False):
+        self.interface = interface
+        self.in_thread = in_thread
+
+    async def _decide(self, decide, *args):
+        if self.in_thread:
+            return await asyncio.to_thread(decide, *args)
+        return decide(*args)
+
+    async def choose_action(self, view):
+        return await self._decide(self.interface.choose_action, view)
+
+    async def make_bid_decision(self, view, bid_handler):
+        return await self._decide(self.interface.make_bid_decision, view, bid_handler)
+
+    async def make_buy_back_decision(self, view, highest_bid):
+        return await self._decide(
+            self.interface.make_buy_back_decision, view, highest_bid
+        )
+
+    async def choose_money_cards(self, view, highest_bid, buyer_idx):
+        return await self._decide(
+            self.interface.choose_money_cards, view, highest_bid, buyer_idx
+        )
+
+    async def make_trade_decision(self, view, joint_cows):
+        return await self._decide(self.interface.make_trade_decision, view, joint_cows)
+
+    async def make_trade_offer(self, view, card_count=None):
+        return await self._decide(self.interface.make_trade_offer, view, card_count)
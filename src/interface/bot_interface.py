@@ -0,0 +1,62 @@
+import random
+
+from interface.player_interface import PlayerInterface
+from player.payment_solver import MoneyPay
+from return_types.action import ActionType, Bid, Trade
+
+
+class BotPlayer(PlayerInterface):
+    """Random bot which only makes legal decisions"""
+
+    def __init__(
+        self,
+        player_idx: int,
+        seed: int | None = None,
+        trade_chance: float = 0.5,
+        bid_chance: float = 0.5,
+        bid_step: int = 10,
+    ):
+        self.player_idx = player_idx
+        self.rng = random.Random(seed)
+        self.trade_chance = trade_chance
+        self.bid_chance = bid_chance
+        self.bid_step = bid_step
+        self.pay_solver = MoneyPay()
+
+    def choose_action(self, view):
+        if not view.private.joint_cows:
+            return ActionType.BID
+        stack_is_empty = view.remaining_cows is not None and not any(
+            view.remaining_cows.values()
+        )
+        if stack_is_empty or self.rng.random() < self.trade_chance:
+            return ActionType.TRADE
+        return ActionType.BID
+
+    # Bid
+    def make_bid_decision(self, view, bid_handler):
+        bid = bid_handler.get_highest_bid() + self.bid_step
+        if bid <= view.private.money_value and self.rng.random() < self.bid_chance:
+            return Bid(self.player_idx, bid)
+        return Bid(self.player_idx, None)
+
+    def make_buy_back_decision(self, view, highest_bid):
+        return self.rng.random() < 0.5
+
+    def choose_money_cards(self, view, highest_bid, buyer_idx):
+        return self.pay_solver.optimal_pay(
+            highest_bid.value, view.private.money_card_values
+        )
+
+    # Trade
+    def make_trade_decision(self, view, joint_cows):
+        enemy_idx = self.rng.choice(list(joint_cows))
+        cow_type = self.rng.choice(joint_cows[enemy_idx])
+
+        own_cows = view.public[self.player_idx].cow_cards.count(cow_type)
+        enemy_cows = view.public[enemy_idx].cow_cards.count(cow_type)
+        return enemy_idx, cow_type, min(own_cows, enemy_cows)
+
+    def make_trade_offer(self, view, card_count=None):
+        offer = [self.rng.randint(0, a) for a in view.private.money_card_values]
+        return Trade(self.player_idx, offer)
@@ -0,0 +1,106 @@
+import random
+
+from application.endgame_solver import EndgameSolver, TradeMove
+from game.player_view import PlayerView
+from game_config.game_config import GameConfig
+from interface.bot_interface import BotPlayer
+from interface.ismcts_bot import Determinizer
+from interface.player_interface import PlayerInterface
+from player import packed_money
+from player.payment_solver import MoneyPay
+from return_types.action import ActionType, Trade
+
+
+class EndgameBot(PlayerInterface):
+    """Plays the trades of the endgame with the EndgameSolver.
+
+    Until the stack is empty every decision is left to the fallback bot. Afterwards
+    the hidden money is sampled (see Determinizer) and the sampled game is solved"""
+
+    def __init__(
+        self,
+        player_idx: int,
+        seed: int | None = None,
+        fallback: PlayerInterface | None = None,
+        solver: EndgameSolver | None = None,
+    ):
+        self.player_idx = player_idx
+        self.rng = random.Random(seed)
+        self.fallback = (
+            fallback if fallback is not None else BotPlayer(player_idx, seed)
+        )
+        self.solver = solver if solver is not None else EndgameSolver()
+        self.pay_solver = MoneyPay()
+        self._move: TradeMove | None = None  # own challenge of this turn
+
+    @staticmethod
+    def _is_endgame(view: PlayerView) -> bool:
+        return view.remaining_cows is not None and not any(view.remaining_cows.values())
+
+    def _solve(self, view: PlayerView, current_player: int) -> TradeMove | None:
+        """Returns the best move of the current player in a sampled game"""
+        game = Determinizer.from_view(view, self.player_idx).sample(
+            self.rng, current_player
+        )
+        if game.is_game_over() is not None or game.is_stalled():
+            return None
+        return self.solver.solve(game)[1]
+
+    # General
+    def choose_action(self, view):
+        if self._is_endgame(view) and view.private.joint_cows:
+            return ActionType.TRADE
+        return self.fallback.choose_action(view)
+
+    # Bid
+    def make_bid_decision(self, view, bid_handler):
+        return self.fallback.make_bid_decision(view, bid_handler)
+
+    def make_buy_back_decision(self, view, highest_bid):
+        return self.fallback.make_buy_back_decision(view, highest_bid)
+
+    def choose_money_cards(self, view, highest_bid, buyer_idx):
+        return self.fallback.choose_money_cards(view, highest_bid, buyer_idx)
+
+    # Trade
+    def make_trade_decision(self, view, joint_cows):
+        self._move = None
+        if self._is_endgame(view):
+            self._move = self._solve(view, self.player_idx)
+        if self._move is None:
+            return self.fallback.make_trade_decision(view, joint_cows)
+        return self._move.enemy_idx, self._move.cow_card, self._move.cow_amount
+
+    def make_trade_offer(self, view, card_count=None):
+        if card_count is None:  # challenger, after make_trade_decision
+            move, self._move = self._move, None
+            if move is None:
+                return self.fallback.make_trade_offer(view, card_count)
+            return Trade(self.player_idx, packed_money.unpack(move.challenger_offer))
+
+        # only the card count of the offer is public, so the answer beats the
+        # strongest offer with that many cards in a sampled game, if affordable
+        challenger = view.turn_player_idx
+        if not self._is_endgame(view) or challenger is None:
+            return self.fallback.make_trade_offer(view, card_count)
+
+        game = Determinizer.from_view(view, self.player_idx).sample(
+            self.rng, challenger
+        )
+        cards = sorted(
+            (
+                value
+                for value, amount in zip(
+                    GameConfig.MONEY_CARD_VALUES,
+                    game.get_player(challenger).get_money_inventory(),
+                )
+                for _ in range(amount)
+            ),
+            reverse=True,
+        )
+        payment = self.pay_solver.optimal_pay(
+            sum(cards[:card_count]) + 1, list(view.private.money_card_values)
+        )
+        if payment is None:  # the trade is lost anyway, keep the money
+            payment = [0] * len(view.private.money_card_values)
+        return Trade(self.player_idx, payment)
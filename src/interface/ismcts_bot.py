@@ -0,0 +1,614 @@
+import math
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any
+
+from action_handlers.bidding import BidHandler
+from action_handlers.trading import TradeHandler
+from application.play_auction import PlayBidTurn
+from application.play_trade import PlayTradeTurn
+from application.simulation import play_game
+from game.game import Game
+from game.player_view import PlayerView
+from game_config.game_config import GameConfig
+from interface.bot_interface import BotPlayer
+from interface.player_interface import PlayerInterface
+from io_handler.console_outputs import NullOutputHandler
+from player.payment_solver import MoneyPay
+from return_types.action import ActionType, Bid, Trade
+from return_types.results import ResultType
+
+ITERATIONS = 200  # iterations per decision and worker
+EXPLORATION = 0.7  # UCB exploration constant, rewards are in [0, 1]
+ROLLOUT_TURNS = 200  # rollouts which take longer are scored as they are
+BID_STEPS = [10, 20, 50, 100, 200]  # raises over the highest bid which are searched
+OFFER_SHARES = [0.1, 0.25, 0.5, 0.75, 1.0]  # searched trade offers, share of money
+SAMPLE_TRIES = 20  # deals of the hidden money until the bids of an auction fit
+
+# Kinds of decisions, see Decision
+ACTION = "action"
+BID = "bid"
+BUY_BACK = "buy_back"
+TRADE = "trade"
+OFFER = "offer"
+COUNTER_OFFER = "counter_offer"
+
+
+@dataclass
+class Decision:
+    """A decision of the searching player, plain data so it can be sent to workers.
+
+    context holds what is needed to play an option, e.g. the bids of an auction"""
+
+    kind: str
+    options: list[Any]
+    current_player: int  # whose turn it is in the sampled games
+    context: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class Determinizer:
+    """What a player knows about the game. Samples games which match it.
+
+    The money of the other players and the order of the stack are hidden. All money
+    cards which are in the game are known, so the cards the player does not hold
+    are dealt to the others by their public card counts"""
+
+    player_idx: int
+    money: list[int]
+    money_cards_counts: list[int]
+    cows: list[list[int]]
+    finished: list[list[int]]
+    remaining_cows: dict[int, int]
+
+    @classmethod
+    def from_view(cls, view: PlayerView, player_idx: int) -> "Determinizer":
+        return cls(
+            player_idx,
+            list(view.private.money_card_values),
+            [pub.money_cards_count for pub in view.public],
+            [list(pub.cow_cards) for pub in view.public],
+            [list(pub.finished_cows) for pub in view.public],
+            dict(view.remaining_cows or {}),
+        )
+
+    def get_inflation_stage(self) -> int:
+        """The bank starts at stage 2 and inflates with every drawn donkey"""
+        if GameConfig.DONKEY_COW not in self.remaining_cows:
+            return 2
+        drawn = GameConfig.COPIES_PER_COW - self.remaining_cows[GameConfig.DONKEY_COW]
+        return 2 + max(drawn, 0)
+
+    def get_hidden_money(self) -> list[int]:
+        """Returns the money indices of all cards the player can not see"""
+        num_players = len(self.money_cards_counts)
+        totals = [amount * num_players for amount in GameConfig.STARTING_MONEY]
+        for stage in range(2, min(self.get_inflation_stage(), len(totals))):
+            totals[stage] += num_players
+
+        hidden = []
+        for money_idx, (total, own) in enumerate(zip(totals, self.money)):
+            hidden.extend([money_idx] * max(total - own, 0))
+        return hidden
+
+    def deal_hidden_money(
+        self, rng: random.Random, min_money: dict[int, int]
+    ) -> list[list[int]]:
+        """Deals the hidden money cards to the other players.
+
+        min_money are the bids of an auction, which the bidders must be able to pay.
+        If random deals do not fit, the bidders get the most valuable cards first"""
+        values = GameConfig.MONEY_CARD_VALUES
+        hidden = self.get_hidden_money()
+        for attempt in range(SAMPLE_TRIES + 1):
+            if attempt < SAMPLE_TRIES:
+                rng.shuffle(hidden)
+                order = range(len(self.money_cards_counts))
+            else:
+                hidden.sort()
+                order = sorted(min_money, key=min_money.get, reverse=True)
+                order += [
+                    i for i in range(len(self.money_cards_counts)) if i not in order
+                ]
+
+            cards = list(hidden)
+            money = [None] * len(self.money_cards_counts)
+            for idx in order:
+                if idx == self.player_idx:
+                    money[idx] = list(self.money)
+                    continue
+                money[idx] = [0] * len(self.money)
+                for _ in range(self.money_cards_counts[idx]):
+                    money[idx][cards.pop() if cards else 0] += 1
+
+            if all(
+                sum(a * v for a, v in zip(money[idx], values)) >= value
+                for idx, value in min_money.items()
+            ):
+                break
+        return money
+
+    def sample(
+        self,
+        rng: random.Random,
+        current_player: int,
+        in_auction: bool = False,
+        min_money: dict[int, int] | None = None,
+    ) -> Game:
+        """Returns a started game with random hidden cards.
+
+        Players without cows only leave the game at the end of a turn in which the
+        stack is empty, so during an auction everyone is still playing"""
+        num_players = len(self.money_cards_counts)
+        money = self.deal_hidden_money(rng, min_money or {})
+
+        cards = [cow for cow, n in self.remaining_cows.items() for _ in range(n)]
+        rng.shuffle(cards)
+        active_players = [
+            idx
+            for idx in range(num_players)
+            if cards or in_auction or self.cows[idx] or idx == current_player
+        ]
+        return Game.from_state(
+            [f"Player {idx}" for idx in range(num_players)],
+            cards,
+            money,
+            self.cows,
+            self.finished,
+            current_player,
+            inflation_stage=self.get_inflation_stage(),
+            active_players=active_players,
+            seed=0,
+        )
+
+
+@dataclass
+class Node:
+    """Information set of the searching player in the search tree.
+
+    Information sets are told apart by the own decisions which lead to them, what
+    the other players did in between is not branched on. Children are keyed by
+    (kind, option), see _get_key. An option is only legal in some of the sampled
+    games, so UCB counts how often it was available instead of the parent visits"""
+
+    visits: int = 0
+    availability: int = 0
+    reward: float = 0.0
+    children: dict[tuple, "Node"] = field(default_factory=dict)
+
+
+def _get_key(kind: str, option: Any) -> tuple:
+    return kind, tuple(option) if isinstance(option, list) else option
+
+
+def get_action_options(view: PlayerView) -> list[ActionType]:
+    options = []
+    if view.remaining_cows and any(view.remaining_cows.values()):
+        options.append(ActionType.BID)
+    if view.private.joint_cows:
+        options.append(ActionType.TRADE)
+    return options
+
+
+def get_bid_options(view: PlayerView, highest_bid: int) -> list[int | None]:
+    """Passing or raising the highest bid by one of BID_STEPS"""
+    money_value = view.private.money_value
+    return [None] + [
+        highest_bid + step for step in BID_STEPS if highest_bid + step <= money_value
+    ]
+
+
+def get_trade_options(
+    view: PlayerView, player_idx: int, joint_cows: dict[int, list[int]]
+) -> list[tuple[int, int, int]]:
+    """(enemy, cow, amount) of every trade the player can challenge"""
+    own_cows = view.public[player_idx].cow_cards
+    options = []
+    for enemy_idx, cows in joint_cows.items():
+        enemy_cows = view.public[enemy_idx].cow_cards
+        for cow in cows:
+            amount = min(own_cows.count(cow), enemy_cows.count(cow))
+            options.append((enemy_idx, cow, amount))
+    return options
+
+
+def get_offers(view: PlayerView, pay_solver: MoneyPay) -> list[list[int]]:
+    """Payments for a few shares of the own money, the smallest first"""
+    money = list(view.private.money_card_values)
+    offers = [[0] * len(money)]
+    for share in OFFER_SHARES:
+        target = int(view.private.money_value * share)
+        offer = pay_solver.optimal_pay(target, money)
+        if offer is not None and offer not in offers:
+            offers.append(offer)
+    return offers
+
+
+class RolloutBot(BotPlayer):
+    """Random bot which plays the forced decisions of a search first"""
+
+    forced_trade: tuple[int, int, int] | None = None
+    forced_offer: list[int] | None = None
+
+    def make_trade_decision(self, view, joint_cows):
+        if self.forced_trade is not None:
+            trade, self.forced_trade = self.forced_trade, None
+            return trade
+        return super().make_trade_decision(view, joint_cows)
+
+    def make_trade_offer(self, view, card_count=None):
+        if self.forced_offer is not None:
+            offer, self.forced_offer = self.forced_offer, None
+            return Trade(self.player_idx, list(offer))
+        return super().make_trade_offer(view, card_count)
+
+
+class TreeBot(RolloutBot):
+    """The searching player in a sampled game.
+
+    Descends the tree by UCB while its decisions were tried before, adds the first
+    new one and plays randomly from there. update adds the reward to the path"""
+
+    def __init__(self, player_idx: int, seed: int, root: Node, exploration: float):
+        super().__init__(player_idx, seed)
+        self.node: Node | None = root  # None once the game left the tree
+        self.path: list[Node] = []
+        self.exploration = exploration
+
+    def choose(self, kind: str, options: list[Any]) -> Any:
+        """Returns the option to play at the current node"""
+        children = []
+        for option in options:
+            child = self.node.children.setdefault(_get_key(kind, option), Node())
+            child.availability += 1
+            children.append(child)
+
+        untried = [i for i, child in enumerate(children) if not child.visits]
+        if untried:
+            choice = self.rng.choice(untried)
+            self.node = None
+        else:
+            choice = max(
+                range(len(options)),
+                key=lambda i: (
+                    children[i].reward / children[i].visits
+                    + self.exploration
+                    * math.sqrt(math.log(children[i].availability) / children[i].visits)
+                ),
+            )
+            self.node = children[choice]
+        self.path.append(children[choice])
+        return options[choice]
+
+    def update(self, reward: float):
+        for node in self.path:
+            node.visits += 1
+            node.reward += reward
+
+    def choose_action(self, view):
+        options = [] if self.node is None else get_action_options(view)
+        if len(options) < 2:
+            return super().choose_action(view)
+        return self.choose(ACTION, options)
+
+    def make_bid_decision(self, view, bid_handler):
+        if self.node is None:
+            return super().make_bid_decision(view, bid_handler)
+        options = get_bid_options(view, bid_handler.get_highest_bid())
+        return Bid(self.player_idx, self.choose(BID, options))
+
+    def make_buy_back_decision(self, view, highest_bid):
+        if self.node is None:
+            return super().make_buy_back_decision(view, highest_bid)
+        return self.choose(BUY_BACK, [True, False])
+
+    def make_trade_decision(self, view, joint_cows):
+        if self.node is None or self.forced_trade is not None:
+            return super().make_trade_decision(view, joint_cows)
+        return self.choose(TRADE, get_trade_options(view, self.player_idx, joint_cows))
+
+    def make_trade_offer(self, view, card_count=None):
+        if self.node is None or self.forced_offer is not None:
+            return super().make_trade_offer(view, card_count)
+        kind = OFFER if card_count is None else COUNTER_OFFER
+        offer = self.choose(kind, get_offers(view, self.pay_solver))
+        return Trade(self.player_idx, list(offer))
+
+
+def _play_option(
+    game: Game,
+    decision: Decision,
+    option: Any,
+    player_idx: int,
+    bots: list[RolloutBot],
+    rng: random.Random,
+):
+    """Plays the rest of the turn in a sampled game with the option taken"""
+    output_handler = NullOutputHandler()
+    context = decision.context
+
+    if decision.kind == ACTION:
+        handler = PlayBidTurn if option == ActionType.BID else PlayTradeTurn
+        result = handler(bots, output_handler, game).execute()
+
+    elif decision.kind == BID:
+        bid_handler = BidHandler(
+            context["bid_master"], game.num_players, context["cow_card"]
+        )
+        bid_handler.bids = [Bid(idx, value) for idx, value in context["bids"]]
+        bid_handler.remaining_players = list(context["remaining_players"])
+        if option is None:
+            bid_handler.pass_bid(player_idx)
+        else:
+            bid_handler.place_bid(game.get_player(player_idx), option)
+        result = PlayBidTurn(bots, output_handler, game).run_auction(
+            bid_handler, start_after=player_idx
+        )
+
+    elif decision.kind == BUY_BACK:
+        winner_idx, value = context["winner_idx"], context["value"]
+        buyer, seller = (player_idx, winner_idx) if option else (winner_idx, player_idx)
+        payment = game.get_player(buyer).get_optimal_payment(value)
+        game.handle_bid(context["cow_card"], buyer, seller, payment)
+        game.end_turn()
+        return
+
+    elif decision.kind in (TRADE, OFFER):
+        bots[player_idx].forced_trade = context.get("trade", option)
+        if decision.kind == OFFER:
+            bots[player_idx].forced_offer = option
+        result = PlayTradeTurn(bots, output_handler, game).execute()
+
+    else:  # COUNTER_OFFER, the challenged cows and the challenger offer are hidden
+        challenger = decision.current_player
+        cow_card, cow_amount = rng.choice(context["cows"])
+        challenger_cards = [
+            money_idx
+            for money_idx, amount in enumerate(
+                game.get_player(challenger).get_money_inventory()
+            )
+            for _ in range(amount)
+        ]
+        challenger_offer = [0] * len(option)
+        for money_idx in rng.sample(
+            challenger_cards, min(context["card_count"], len(challenger_cards))
+        ):
+            challenger_offer[money_idx] += 1
+
+        trade_handler = TradeHandler(cow_card, cow_amount, challenger, player_idx)
+        trade_handler.set_challenger_bid(Trade(challenger, challenger_offer))
+        trade_handler.set_contender_bid(Trade(player_idx, list(option)))
+        winner_and_loser = trade_handler.get_winner_and_loser()
+        if winner_and_loser is not None:
+            game.handle_trade(
+                cow_card,
+                cow_amount,
+                player_idx,
+                challenger_offer,
+                list(option),
+                *winner_and_loser,
+            )
+        game.end_turn()
+        return
+
+    if result.type == ResultType.FAILURE:
+        game.end_turn()
+
+
+def _get_reward(game: Game, player_idx: int) -> float:
+    """Share of the win: 1 for a sole winner, split on a tie, 0 otherwise"""
+    scores = [player.get_score() for player in game.get_all_players()]
+    best = max(scores)
+    if scores[player_idx] != best:
+        return 0.0
+    return 1 / scores.count(best)
+
+
+def run_search(
+    determinizer: Determinizer,
+    decision: Decision,
+    iterations: int | None,
+    time_limit: float | None,
+    exploration: float,
+    seed: int | None,
+) -> list[tuple[int, float]]:
+    """Single observer ISMCTS from the decision.
+
+    Every iteration samples a game (see Determinizer), descends the tree of the
+    searching player in it (see TreeBot) and adds the reward of the finished game
+    to the nodes it passed. Returns the visits and summed rewards per option. Runs
+    inside worker processes for a root parallel search"""
+    rng = random.Random(seed)
+    player_idx = determinizer.player_idx
+    root = Node()
+    deadline = None if time_limit is None else time.perf_counter() + time_limit
+
+    iteration = 0
+    while iterations is None or iteration < iterations:
+        if deadline is not None and iteration and time.perf_counter() >= deadline:
+            break
+        iteration += 1
+
+        game = determinizer.sample(
+            rng,
+            decision.current_player,
+            decision.kind in (BID, BUY_BACK),
+            decision.context.get("min_money"),
+        )
+        bots = [RolloutBot(idx, rng.getrandbits(32)) for idx in range(game.num_players)]
+        tree_bot = bots[player_idx] = TreeBot(
+            player_idx, rng.getrandbits(32), root, exploration
+        )
+        option = tree_bot.choose(decision.kind, decision.options)
+        _play_option(game, decision, option, player_idx, bots, rng)
+        play_game(game, bots, NullOutputHandler(), ROLLOUT_TURNS)
+        tree_bot.update(_get_reward(game, player_idx))
+
+    children = [
+        root.children.get(_get_key(decision.kind, option), Node())
+        for option in decision.options
+    ]
+    return [(child.visits, child.reward) for child in children]
+
+
+class ISMCTSBot(PlayerInterface):
+    """Information set Monte Carlo tree search bot, see run_search.
+
+    Every iteration samples the hidden money and stack order, plays the own
+    decisions by the tree and the others randomly. With num_workers > 1 every
+    worker searches the full budget and the statistics of the options are added
+    up, so more cores give more iterations in the same time"""
+
+    def __init__(
+        self,
+        player_idx: int,
+        seed: int | None = None,
+        iterations: int | None = ITERATIONS,
+        time_limit: float | None = None,
+        num_workers: int = 1,
+        exploration: float = EXPLORATION,
+    ):
+        if iterations is None and time_limit is None:
+            raise ValueError("The search needs an iteration or time budget")
+        self.player_idx = player_idx
+        self.rng = random.Random(seed)
+        self.iterations = iterations
+        self.time_limit = time_limit
+        self.num_workers = num_workers
+        self.exploration = exploration
+        self.pay_solver = MoneyPay()
+
+        self._pool: ProcessPoolExecutor | None = None
+        self._last_remaining: dict[int, int] = {}  # stack seen when choosing an action
+        self._trade: tuple[int, int, int] | None = None  # own trade challenge
+
+    def _search(self, view: PlayerView, decision: Decision) -> Any:
+        """Returns the option with the most visits"""
+        if len(decision.options) == 1:
+            return decision.options[0]
+
+        determinizer = Determinizer.from_view(view, self.player_idx)
+        args = (determinizer, decision, self.iterations, self.time_limit)
+        if self.num_workers <= 1:
+            results = [run_search(*args, self.exploration, self.rng.getrandbits(32))]
+        else:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(self.num_workers)
+            futures = [
+                self._pool.submit(
+                    run_search, *args, self.exploration, self.rng.getrandbits(32)
+                )
+                for _ in range(self.num_workers)
+            ]
+            results = [future.result() for future in futures]
+
+        visits = [
+            sum(result[i][0] for result in results) for i in range(len(results[0]))
+        ]
+        rewards = [
+            sum(result[i][1] for result in results) for i in range(len(results[0]))
+        ]
+        best = max(
+            range(len(visits)),
+            key=lambda i: (visits[i], rewards[i] / visits[i] if visits[i] else 0),
+        )
+        return decision.options[best]
+
+    def close(self):
+        """Shuts the worker processes of the root parallel search down"""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    # General
+    def choose_action(self, view):
+        self._last_remaining = dict(view.remaining_cows or {})
+        options = get_action_options(view)
+        if not options:
+            return ActionType.BID
+
+        return self._search(view, Decision(ACTION, options, self.player_idx))
+
+    # Bid
+    def make_bid_decision(self, view, bid_handler):
+        if bid_handler.cow_card is None:  # the auctioned cow is not known
+            return Bid(self.player_idx, None)
+
+        decision = Decision(
+            BID,
+            get_bid_options(view, bid_handler.get_highest_bid()),
+            bid_handler.bid_master,
+            {
+                "bid_master": bid_handler.bid_master,
+                "cow_card": bid_handler.cow_card,
+                "bids": [(bid.player_idx, bid.value) for bid in bid_handler.bids],
+                "remaining_players": list(bid_handler.remaining_players),
+                "min_money": {bid.player_idx: bid.value for bid in bid_handler.bids},
+            },
+        )
+        return Bid(self.player_idx, self._search(view, decision))
+
+    def make_buy_back_decision(self, view, highest_bid):
+        remaining = view.remaining_cows or {}
+        drawn = [
+            cow
+            for cow, count in self._last_remaining.items()
+            if remaining.get(cow, 0) < count
+        ]
+        if len(drawn) != 1:  # the auctioned cow is not known
+            return False
+
+        decision = Decision(
+            BUY_BACK,
+            [True, False],
+            self.player_idx,
+            {
+                "cow_card": drawn[0],
+                "winner_idx": highest_bid.player_idx,
+                "value": highest_bid.value,
+                "min_money": {highest_bid.player_idx: highest_bid.value},
+            },
+        )
+        return self._search(view, decision)
+
+    def choose_money_cards(self, view, highest_bid, buyer_idx):
+        return self.pay_solver.optimal_pay(
+            highest_bid.value, list(view.private.money_card_values)
+        )
+
+    # Trade
+    def make_trade_decision(self, view, joint_cows):
+        options = get_trade_options(view, self.player_idx, joint_cows)
+        self._trade = self._search(view, Decision(TRADE, options, self.player_idx))
+        return self._trade
+
+    def make_trade_offer(self, view, card_count=None):
+        offers = get_offers(view, self.pay_solver)
+        if card_count is None:  # challenger, after make_trade_decision
+            if self._trade is None:
+                return Trade(self.player_idx, offers[-1])
+            decision = Decision(OFFER, offers, self.player_idx, {"trade": self._trade})
+            self._trade = None
+            return Trade(self.player_idx, list(self._search(view, decision)))
+
+        challenger = view.turn_player_idx
+        own_cows = view.public[self.player_idx].cow_cards
+        challenger_cows = (
+            view.public[challenger].cow_cards if challenger is not None else ()
+        )
+        cows = [
+            (cow, min(own_cows.count(cow), challenger_cows.count(cow)))
+            for cow in sorted(set(own_cows) & set(challenger_cows))
+        ]
+        if not cows:
+            return Trade(self.player_idx, offers[0])
+
+        decision = Decision(
+            COUNTER_OFFER,
+            offers,
+            challenger,
+            {"cows": cows, "card_count": card_count},
+        )
+        return Trade(self.player_idx, list(self._search(view, decision)))
@@ -0,0 +1,74 @@
+from typing import Any
+
+TABLE_SIZE = 1 << 16  # default number of slots
+
+
+class TranspositionTable:
+    """Fixed number of slots for search results, indexed by a game hash.
+
+    A slot holds one entry (hash, depth, generation, value). A new entry replaces
+    the old one if it was searched at least as deep or the old one is from an
+    earlier search, so memory stays bounded. See Game.get_hash"""
+
+    def __init__(self, num_slots: int = TABLE_SIZE):
+        if num_slots <= 0 or num_slots & (num_slots - 1):
+            raise ValueError("The number of slots must be a power of two")
+        self._mask = num_slots - 1
+        self._slots: list[tuple[int, int, int, Any] | None] = [None] * num_slots
+        self._generation = 0
+        self._num_entries = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.replacements = 0  # stores which overwrote another position
+
+    def __len__(self) -> int:
+        return self._num_entries
+
+    def get(self, key: int, min_depth: int = 0) -> Any | None:
+        """Returns the value stored for the hash if it was searched deep enough"""
+        entry = self._slots[key & self._mask]
+        if entry is not None and entry[0] == key and entry[1] >= min_depth:
+            self.hits += 1
+            return entry[3]
+        self.misses += 1
+        return None
+
+    def store(self, key: int, value: Any, depth: int = 0) -> bool:
+        """Stores the value for the hash. Returns False if the slot was kept"""
+        idx = key & self._mask
+        entry = self._slots[idx]
+        if entry is None:
+            self._num_entries += 1
+        else:
+            if depth < entry[1] and entry[2] == self._generation:
+                return False
+            if entry[0] != key:
+                self.replacements += 1
+
+        self._slots[idx] = (key, depth, self._generation, value)
+        self.stores += 1
+        return True
+
+    def new_search(self) -> None:
+        """Marks the stored entries as old, they are replaced first"""
+        self._generation += 1
+
+    def clear(self) -> None:
+        self._slots = [None] * len(self._slots)
+        self._num_entries = 0
+        self.hits = self.misses = self.stores = self.replacements = 0
+
+    def get_stats(self) -> dict[str, int | float]:
+        """Returns the counters and the hit rate of the lookups"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": self._num_entries,
+            "slots": len(self._slots),
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "replacements": self.replacements,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
@@ -31,15 +31,11 @@ class ConsoleInputHandler(InputHandler):
             try:
                 print(f"\n{self.player_names[player_idx]}! Its your turn!")
 
-                action = input("Choose an action: bid/trade/stats ").strip().lower()
+                action = input("Choose an action: bid/trade/stats ")
 
-                match action:
-                    case "bid" | "b":
-                        return ActionType.BID
-                    case "trade" | "t":
-                        return ActionType.TRADE
-                    case "stats" | "s":
-                        return ActionType.STATS
+                parse_result, parsed_action = self._parse_action(action)
+                if parse_result.type == ResultType.SUCCESS:
+                    return parsed_action
 
             except KeyboardInterrupt:
                 raise
@@ -87,7 +83,7 @@ class ConsoleInputHandler(InputHandler):
 
     def ask_for_trade(self, joint_cows: dict[int:int]):
         for idx in joint_cows:
-            print(f"{self.player_names[idx]} ({idx}) has {joint_cows[idx]}")
+            self._show(f"{self.player_names[idx]} ({idx}) has {joint_cows[idx]}")
 
         contender = self._ask_until_valid(
             "Choose contender (idx or name): ",
@@ -117,6 +113,9 @@ class ConsoleInputHandler(InputHandler):
 
         return Trade(player_idx, input)
 
+    def _show(self, message: str):
+        print(message)
+
     def _ask_until_valid(
         self,
         prompt: str,
@@ -148,6 +147,16 @@ class ConsoleInputHandler(InputHandler):
                 raise
 
     # ----- Parsers -----
+    def _parse_action(self, raw: str) -> tuple[Result, ActionType]:
+        match raw.strip().lower():
+            case "bid" | "b":
+                return Result(ResultType.SUCCESS), ActionType.BID
+            case "trade" | "t":
+                return Result(ResultType.SUCCESS), ActionType.TRADE
+            case "stats" | "s":
+                return Result(ResultType.SUCCESS), ActionType.STATS
+        return Result(ResultType.FAILURE, "Invalid input."), None
+
     def _parse_int(self, raw: str) -> tuple[Result, int]:
         try:
             return Result(ResultType.SUCCESS), int(raw.strip())
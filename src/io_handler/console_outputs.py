@@ -99,3 +99,27 @@ class ConsoleOutputHandler(OutputHandler):
         """
         for view in player_view.public:
             print(f"{view.player_name} has {view.score} points.")
+
+
+class NullOutputHandler(OutputHandler):
+    """
+    Output handler which shows nothing. Used for headless games.
+    """
+
+    def show_message(self, message: str):
+        pass
+
+    def show_cow_draw(self, cow_value: int):
+        pass
+
+    def show_donkey_event(self, money_value: int):
+        pass
+
+    def show_last_card_drawn(self):
+        pass
+
+    def show_stats(self, player_view: PlayerView, card_stack_count: int):
+        pass
+
+    def show_final_score(self, player_view: PlayerView):
+        pass
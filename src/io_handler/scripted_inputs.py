@@ -0,0 +1,77 @@
+import mmap
+from collections.abc import Callable
+from typing import Any
+
+from io_handler.console_inputs import ConsoleInputHandler
+from return_types.action import ActionType
+from return_types.results import Result, ResultType
+
+# every parser of ConsoleInputHandler, answers are parsed with all of them up front
+_PARSERS = [name for name in dir(ConsoleInputHandler) if name.startswith("_parse_")]
+
+
+class ScriptedInputHandler(ConsoleInputHandler):
+    """Answers the questions of the console from a transcript, one answer per line.
+
+    The transcript is memory mapped and every line is parsed up front with each of
+    the console parsers, so asking only looks the answer up. Invalid answers are
+    skipped like on the console, nothing is printed. At the end of the transcript
+    EOFError is raised, like input() does"""
+
+    def __init__(self, player_names: list[str], transcript_path: str):
+        super().__init__(player_names)
+        self._answers = [self._parse_line(line) for line in self._read(transcript_path)]
+        self._position = 0
+
+    @staticmethod
+    def _read(transcript_path: str) -> list[str]:
+        with open(transcript_path, "rb") as file:
+            try:
+                transcript = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # empty files can not be mapped
+                return []
+            with transcript:
+                return [
+                    line.decode().strip() for line in iter(transcript.readline, b"")
+                ]
+
+    def _parse_line(self, line: str) -> dict[str, tuple[Result, Any]]:
+        return {name: getattr(self, name)(line) for name in _PARSERS}
+
+    def get_num_remaining(self) -> int:
+        return len(self._answers) - self._position
+
+    def _next_answer(self, parser_name: str) -> tuple[Result, Any]:
+        if self._position >= len(self._answers):
+            raise EOFError("The transcript has no answers left")
+        answer = self._answers[self._position][parser_name]
+        self._position += 1
+        return answer
+
+    def _ask_until_valid(
+        self,
+        prompt: str,
+        parser: Callable[[str], tuple[Result, Any]],
+        validator: Callable[[Any], Result] | None = None,
+    ) -> Any:
+        """Returns the next answer which the parser and validator accept. A
+        transcript can not cancel a question, it only has answers"""
+        while True:
+            parse_result, parsed_value = self._next_answer(parser.__name__)
+            if parse_result.type == ResultType.FAILURE:
+                continue
+            if validator and validator(parsed_value).type == ResultType.FAILURE:
+                continue
+            return parsed_value
+
+    def ask_for_action(self, player_idx: int) -> ActionType:
+        return self._ask_until_valid("", self._parse_action)
+
+    def get_number_of_players(self, player_limit: list[int]):
+        while True:
+            num_players = self._ask_until_valid("", self._parse_int)
+            if player_limit[0] <= num_players < player_limit[1]:
+                return num_players
+
+    def _show(self, message: str):
+        pass
@@ -1,7 +1,14 @@
+import argparse
+import asyncio
+import sys
+import time
+from functools import partial
+
 from return_types.results import ResultType
 from return_types.action import ActionType
 from interface.human_interface import HumanPlayer
-# from interface.bot_interface import BotPlayer
+from interface.bot_interface import BotPlayer
+from interface.ismcts_bot import ISMCTSBot
 
 from io_handler.console_inputs import ConsoleInputHandler
 from io_handler.console_outputs import ConsoleOutputHandler
@@ -9,20 +16,51 @@ from io_handler.console_outputs import ConsoleOutputHandler
 from application.play_auction import PlayBidTurn
 from application.play_trade import PlayTradeTurn
 from application.show_stats import StatsHandler
+from application.simulation import simulate
+from application.endgame_solver import EndgameSolver
+from application.tournament import Tournament, get_bot_standings
+from application.distributed import Coordinator, Worker
+from application.game_server import GameServer
+from application.instrumentation import AllocationProfiler, Profiler
+from application import benchmark
+from application.replay import ReplayEngine
+from game.event_log import EventLog
 from game.game import Game
 
 
-if __name__ == "__main__":
+def play_console_game(record_path: str | None = None, bot_seconds: float | None = None):
+    """With bot_seconds an ISMCTSBot thinking that long per decision takes the
+    fourth seat"""
     player_names = ["Alice", "Bob", "Charlie", "David"]
 
     input_handler = ConsoleInputHandler(player_names)
     output_handler = ConsoleOutputHandler()
 
     input_interfaces = [HumanPlayer(i, input_handler) for i in range(3)]
-    # input_interfaces.append(BotPlayer(3))
+    search_bot = None
+    if bot_seconds is not None:
+        search_bot = ISMCTSBot(3, iterations=None, time_limit=bot_seconds)
+        input_interfaces.append(search_bot)
+    try:
+        play_console_turns(input_interfaces, output_handler, player_names, record_path)
+    finally:
+        if search_bot is not None:
+            search_bot.close()
+
 
+def play_console_turns(
+    input_interfaces: list,
+    output_handler: ConsoleOutputHandler,
+    player_names: list[str],
+    record_path: str | None,
+):
+    """Plays the console game until it is over"""
     game = Game(len(input_interfaces), list(player_names[: len(input_interfaces)]))
     game.start_game()
+    event_log = None
+    if record_path is not None:
+        event_log = EventLog()
+        game.set_event_log(event_log)
 
     while game.game_is_ongoing:
         current_player_idx = game.get_current_player_idx()
@@ -43,7 +81,282 @@ if __name__ == "__main__":
 
         if res.type == ResultType.FAILURE:
             output_handler.show_message(res.message)
+        if event_log is not None:  # saved every turn, so an aborted game is kept
+            event_log.save(record_path)
 
         scores = game.is_game_over()
 
     output_handler.show_final_score(scores)
+
+
+def run_replay(path: str, turn: int | None):
+    """Rebuilds a recorded game, verified against its keyframes, and shows it"""
+    engine = ReplayEngine(EventLog.load(path))
+    start = time.perf_counter()
+    game = engine.replay() if turn is None else engine.seek(turn)
+    duration = time.perf_counter() - start
+
+    print(f"Turn {game.get_current_turn()} rebuilt in {duration * 1000:.1f}ms")
+    for player in game.get_all_players():
+        print(
+            f"{player.get_player_name()}: {player.get_score()} points, "
+            f"cows {player.get_cow_inventory()}, money {player.get_money_value()}"
+        )
+
+
+def run_simulation(
+    n_games: int,
+    num_players: int,
+    seed: int,
+    endgame_depth: int | None = None,
+    profile_prefix: str | None = None,
+    allocations_path: str | None = None,
+) -> int:
+    """Plays bot games without console I/O and prints the throughput.
+
+    With a profile_prefix the hot paths are timed and written to
+    <prefix>.json and <prefix>.folded, with an allocations_path the allocations
+    of the hot paths are counted and written there. Returns 1 if a game did not
+    finish"""
+    endgame_solver = None if endgame_depth is None else EndgameSolver(endgame_depth)
+    profiler = Profiler()
+    if profile_prefix is not None:
+        profiler.enable()
+    allocation_profiler = AllocationProfiler()
+    if allocations_path is not None:
+        allocation_profiler.enable()
+    start = time.perf_counter()
+    results = simulate(
+        n_games,
+        lambda game_seed: [
+            BotPlayer(i, game_seed * 10 + i) for i in range(num_players)
+        ],
+        seed,
+        endgame_solver=endgame_solver,
+    )
+    duration = time.perf_counter() - start
+    allocation_profiler.disable()  # unwraps the methods in reverse order
+    profiler.disable()
+    if profile_prefix is not None:
+        profiler.save_json(profile_prefix + ".json")
+        profiler.save_folded(profile_prefix + ".folded")
+    if allocations_path is not None:
+        allocation_profiler.save_json(allocations_path)
+
+    finished = sum(res.finished for res in results)
+    turns = sum(res.turns for res in results)
+    print(f"{n_games} games ({finished} finished) in {duration:.2f}s")
+    print(f"{n_games / duration:.0f} games/s, {turns / n_games:.1f} turns per game")
+    if finished < n_games:
+        print(f"ERROR {n_games - finished} games did not finish")
+        return 1
+    return 0
+
+
+def get_tournament_bots():
+    """Bots with different trade behaviour"""
+    return {
+        "random": BotPlayer,
+        "trader": partial(BotPlayer, trade_chance=0.9),
+        "bidder": partial(BotPlayer, trade_chance=0.1, bid_chance=0.8),
+    }
+
+
+def show_tournament(matchups, duration: float):
+    n_games = sum(matchup.games for matchup in matchups.values())
+    print(f"{n_games} games in {duration:.2f}s ({n_games / duration:.0f} games/s)")
+    for name, (win_rate, mean_score) in get_bot_standings(matchups).items():
+        print(f"{name}: {win_rate:.1%} wins, {mean_score:.1f} mean score")
+
+
+def run_tournament(games_per_lineup: int, num_players: int, workers: int | None):
+    """Plays the bots against each other on all cores"""
+    tournament = Tournament(
+        get_tournament_bots(), num_players, games_per_lineup, max_workers=workers
+    )
+
+    start = time.perf_counter()
+    matchups = tournament.run()
+    show_tournament(matchups, time.perf_counter() - start)
+
+
+def run_coordinator(games_per_lineup: int, num_players: int, host: str, port: int):
+    """Hands out the tournament to workers connecting on host:port"""
+    tournament = Tournament(get_tournament_bots(), num_players, games_per_lineup)
+    coordinator = Coordinator(tournament, host, port)
+    print(f"Waiting for workers on {coordinator.address[0]}:{coordinator.address[1]}")
+
+    start = time.perf_counter()
+    matchups = coordinator.run()
+    show_tournament(matchups, time.perf_counter() - start)
+
+
+def run_server(n_tables: int, num_players: int, num_humans: int, host: str, port: int):
+    """Hosts tables with bots and remote seats until every table is over"""
+
+    async def serve():
+        server = GameServer(host, port)
+        for table in range(n_tables):
+            bots = {
+                idx: BotPlayer(idx, table * 10 + idx)
+                for idx in range(num_humans, num_players)
+            }
+            server.add_table(str(table), num_players, bots, seed=table)
+        address = await server.start()
+        print(f"Serving {n_tables} tables on {address[0]}:{address[1]}")
+        results = await server.run()
+        return server, results
+
+    start = time.perf_counter()
+    server, results = asyncio.run(serve())
+    duration = time.perf_counter() - start
+
+    finished = sum(result.finished for result in results.values())
+    print(f"{len(results)} tables ({finished} finished) in {duration:.2f}s")
+    per_table, total = server.get_latency_stats()
+    for table_id, stats in per_table.items():
+        if server.tables[table_id].seats:  # bot tables are summed up only
+            print(
+                f"Table {table_id}: {stats.count} decisions, "
+                f"mean {stats.mean * 1000:.2f}ms, p95 {stats.p95 * 1000:.2f}ms"
+            )
+    print(
+        f"All tables: {total.count} decisions, mean {total.mean * 1000:.3f}ms, "
+        f"p50 {total.p50 * 1000:.3f}ms, p95 {total.p95 * 1000:.3f}ms, "
+        f"max {total.max * 1000:.1f}ms"
+    )
+
+
+def run_benchmarks(
+    names: list[str] | None,
+    save_path: str | None,
+    compare_path: str | None,
+    threshold: float,
+) -> int:
+    """Runs the benchmarks, saves or compares them. Returns 1 on a regression"""
+    results = benchmark.run_benchmarks(names)
+    baseline = benchmark.load_baseline(compare_path) if compare_path else {}
+    for name, ops in results.items():
+        line = f"{name.ljust(20)} {ops:12.1f} ops/s"
+        if name in baseline:
+            line += f"  {ops / baseline[name]:6.2f}x baseline"
+        print(line)
+
+    if save_path is not None:
+        benchmark.save_baseline(results, save_path)
+    if compare_path is None:
+        return 0
+
+    regressions = benchmark.compare(results, baseline, threshold)
+    for name, ratio in regressions.items():
+        print(f"REGRESSION {name}: {ratio:.2f}x of the baseline")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Kuhhandel")
+    subparsers = parser.add_subparsers(dest="command")
+
+    sim_parser = subparsers.add_parser("simulate", help="play headless bot games")
+    sim_parser.add_argument("-n", "--games", type=int, default=1000)
+    sim_parser.add_argument("-p", "--players", type=int, default=4)
+    sim_parser.add_argument("-s", "--seed", type=int, default=0)
+    sim_parser.add_argument(
+        "--solve-endgame",
+        type=int,
+        metavar="DEPTH",
+        default=None,
+        help="solve the trades after the stack is empty with this search depth",
+    )
+    sim_parser.add_argument(
+        "--profile",
+        metavar="PREFIX",
+        default=None,
+        help="time the hot paths, written to PREFIX.json and PREFIX.folded",
+    )
+    sim_parser.add_argument(
+        "--allocations",
+        metavar="PATH",
+        default=None,
+        help="count the allocations of the hot paths per source line with "
+        "tracemalloc, written to PATH. Slow",
+    )
+
+    tour_parser = subparsers.add_parser("tournament", help="play bots against bots")
+    tour_parser.add_argument("-n", "--games", type=int, default=200)
+    tour_parser.add_argument("-p", "--players", type=int, default=4)
+    tour_parser.add_argument("-w", "--workers", type=int, default=None)
+
+    coord_parser = subparsers.add_parser("coordinator", help="serve a tournament")
+    coord_parser.add_argument("-n", "--games", type=int, default=200)
+    coord_parser.add_argument("-p", "--players", type=int, default=4)
+    coord_parser.add_argument("--host", default="0.0.0.0")
+    coord_parser.add_argument("--port", type=int, default=5555)
+
+    worker_parser = subparsers.add_parser("worker", help="play for a coordinator")
+    worker_parser.add_argument("--host", default="127.0.0.1")
+    worker_parser.add_argument("--port", type=int, default=5555)
+
+    serve_parser = subparsers.add_parser("serve", help="host tables for remote players")
+    serve_parser.add_argument("-n", "--tables", type=int, default=100)
+    serve_parser.add_argument("-p", "--players", type=int, default=4)
+    serve_parser.add_argument("--humans", type=int, default=1, help="remote seats")
+    serve_parser.add_argument("--host", default="0.0.0.0")
+    serve_parser.add_argument("--port", type=int, default=5556)
+
+    bench_parser = subparsers.add_parser("bench", help="measure the engine speed")
+    bench_parser.add_argument(
+        "names", nargs="*", help="benchmarks to run, all by default"
+    )
+    bench_parser.add_argument("--save", metavar="PATH", help="write a baseline")
+    bench_parser.add_argument("--compare", metavar="PATH", help="check a baseline")
+    bench_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=benchmark.THRESHOLD,
+        help="slowdown which fails the comparison, 0.2 is 20%% slower",
+    )
+
+    replay_parser = subparsers.add_parser("replay", help="rebuild a recorded game")
+    replay_parser.add_argument("path")
+    replay_parser.add_argument("-t", "--turn", type=int, default=None)
+
+    parser.add_argument("--record", metavar="PATH", help="record the console game")
+    parser.add_argument(
+        "--bot-seconds",
+        type=float,
+        metavar="SECONDS",
+        default=None,
+        help="seat an ISMCTS bot with this time per decision in the console game",
+    )
+
+    args = parser.parse_args()
+
+    if args.command == "simulate":
+        sys.exit(
+            run_simulation(
+                args.games,
+                args.players,
+                args.seed,
+                args.solve_endgame,
+                args.profile,
+                args.allocations,
+            )
+        )
+    elif args.command == "tournament":
+        run_tournament(args.games, args.players, args.workers)
+    elif args.command == "coordinator":
+        run_coordinator(args.games, args.players, args.host, args.port)
+    elif args.command == "worker":
+        Worker(get_tournament_bots(), args.host, args.port).run()
+    elif args.command == "serve":
+        run_server(args.tables, args.players, args.humans, args.host, args.port)
+    elif args.command == "bench":
+        unknown = set(args.names) - set(benchmark.BENCHMARKS)
+        if unknown:
+            parser.error(f"unknown benchmarks {sorted(unknown)}")
+        sys.exit(run_benchmarks(args.names, args.save, args.compare, args.threshold))
+    elif args.command == "replay":
+        run_replay(args.path, args.turn)
+    else:
+        play_console_game(args.record, args.bot_seconds)
@@ -0,0 +1,76 @@
+class CowIndex:
+    """Cow counts of all players per dense cow type id.
+
+    The players of a game share one index and keep it up to date when cows are
+    added, removed or finished, so trade partners are found without scanning the
+    inventories of every player"""
+
+    def __init__(self, num_players: int):
+        self.num_players = num_players
+        self._counts: list[list[int]] = []  # cow type id -> count per player
+        self._owners: list[set[int]] = []  # cow type id -> players with this type
+        self._owned_types: list[set[int]] = [set() for _ in range(num_players)]
+        self._version = 0  # grows with every change
+
+    def _add_cow_type(self, cow_type: int):
+        while cow_type >= len(self._counts):
+            self._counts.append([0] * self.num_players)
+            self._owners.append(set())
+
+    def add(self, player_idx: int, cow_type: int, amount: int):
+        """Adds cows of a type to a player"""
+        if not amount:
+            return
+        self._add_cow_type(cow_type)
+        self._version += 1
+        self._counts[cow_type][player_idx] += amount
+        self._owners[cow_type].add(player_idx)
+        self._owned_types[player_idx].add(cow_type)
+
+    def remove(self, player_idx: int, cow_type: int, amount: int):
+        """Removes cows of a type from a player"""
+        if not amount:
+            return
+        self._version += 1
+        counts = self._counts[cow_type]
+        counts[player_idx] -= amount
+        if not counts[player_idx]:
+            self._owners[cow_type].discard(player_idx)
+            self._owned_types[player_idx].discard(cow_type)
+
+    def get_version(self) -> int:
+        """Returns a counter which grows with every change of the counts"""
+        return self._version
+
+    def get_count(self, player_idx: int, cow_type: int) -> int:
+        if cow_type >= len(self._counts):
+            return 0
+        return self._counts[cow_type][player_idx]
+
+    def get_owners(self, cow_type: int) -> set[int]:
+        """Returns the players which have the cow type. Must not be modified"""
+        if cow_type >= len(self._owners):
+            return set()
+        return self._owners[cow_type]
+
+    def get_players_with(self, cow_type: int, min_count: int = 1) -> list[int]:
+        """Returns the sorted players with at least min_count cows of the type"""
+        if cow_type >= len(self._counts):
+            return []
+        counts = self._counts[cow_type]
+        return sorted(
+            idx for idx in self._owners[cow_type] if counts[idx] >= max(min_count, 1)
+        )
+
+    def get_joint_cow_types(self, player_idx: int) -> dict[int, list[int]]:
+        """Returns the other players, sorted, and the sorted cow types they share"""
+        joint = {}
+        for cow_type in sorted(self._owned_types[player_idx]):
+            for other in self._owners[cow_type]:
+                if other != player_idx:
+                    joint.setdefault(other, []).append(cow_type)
+        return {other: joint[other] for other in sorted(joint)}
+
+    def has_joint_cow_type(self) -> bool:
+        """Returns True if any cow type is owned by at least two players"""
+        return any(len(owners) > 1 for owners in self._owners)
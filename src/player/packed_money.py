@@ -0,0 +1,51 @@
+from game_config.game_config import GameConfig
+
+# Money inventories packed into a single int. Lane i holds the count of
+# GameConfig.MONEY_CARD_VALUES[i]. The top bit of every lane is a guard bit which
+# stays empty, so counts must stay below 2**15. Adding and subtracting whole
+# inventories is plain integer arithmetic, and packed inventories are hashable.
+LANE_BITS = 16
+LANE_MASK = (1 << LANE_BITS) - 1
+NUM_LANES = len(GameConfig.MONEY_CARD_VALUES)
+GUARD_MASK = sum(1 << (LANE_BITS * (i + 1) - 1) for i in range(NUM_LANES))
+
+
+def pack(money_list: list[int]) -> int:
+    """Packs money amounts [0s, 10s, 50s, ...] into one int"""
+    packed = 0
+    for i, amount in enumerate(money_list):
+        packed |= amount << (i * LANE_BITS)
+    return packed
+
+
+def unpack(packed: int) -> list[int]:
+    """Returns the money amounts [0s, 10s, 50s, ...] of a packed inventory"""
+    return [(packed >> (i * LANE_BITS)) & LANE_MASK for i in range(NUM_LANES)]
+
+
+def unit(money_idx: int) -> int:
+    """Returns a packed inventory with one card of the given money index"""
+    return 1 << (money_idx * LANE_BITS)
+
+
+def can_afford(packed_inventory: int, packed_cost: int) -> bool:
+    """Checks every lane at once: a lane which is too small borrows its guard bit"""
+    return ((packed_inventory | GUARD_MASK) - packed_cost) & GUARD_MASK == GUARD_MASK
+
+
+def count(packed: int) -> int:
+    """Returns the number of cards"""
+    total = 0
+    while packed:
+        total += packed & LANE_MASK
+        packed >>= LANE_BITS
+    return total
+
+
+def value(packed: int) -> int:
+    """Returns the total value of the cards"""
+    total = 0
+    for money_value in GameConfig.MONEY_CARD_VALUES:
+        total += (packed & LANE_MASK) * money_value
+        packed >>= LANE_BITS
+    return total
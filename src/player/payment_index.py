@@ -0,0 +1,105 @@
+from math import gcd
+
+from game_config.game_config import GameConfig
+
+_UNREACHABLE = 1 << 30  # card count of sums which cannot be paid
+
+
+class PaymentIndex:
+    """Precomputed reachable payments of one money inventory.
+
+    The subsets of cards are counted per sum s (in units), packed into one int with
+    the count of s in lane s. That is the product of (1 + 2**(step * lane_bits))
+    over the cards, so adding a card is a shift and an add and removing it the
+    exact division by the same factor. A sum is reachable if its lane is not empty.
+
+    The fewest cards per sum do not invert like this, they are built with the first
+    min_cards query after the cards changed."""
+
+    def __init__(self, money_cards_amount: list[int]):
+        self._unit = 0
+        for value in GameConfig.MONEY_CARD_VALUES:
+            self._unit = gcd(self._unit, value)
+        self._money_cards_amount = list(money_cards_amount)
+        self._build()
+
+    def _get_num_cards(self) -> int:
+        values = GameConfig.MONEY_CARD_VALUES
+        return sum(a for a, v in zip(self._money_cards_amount, values) if v)
+
+    def _build(self) -> None:
+        """Builds the counts from scratch"""
+        # a count is below 2**cards, with room to grow before the next rebuild
+        self._lane_bits = self._get_num_cards() + 8
+        self._ways = 1  # paying nothing
+        self._min_cards = None
+        for i, amount in enumerate(self._money_cards_amount):
+            factor = self._get_factor(i)
+            if factor is not None:
+                self._ways *= factor**amount
+
+    def _get_factor(self, money_idx: int) -> int | None:
+        """Returns 1 + 2**(step * lane_bits) of one card"""
+        value = GameConfig.MONEY_CARD_VALUES[money_idx]
+        if value == 0:  # zero cards never change a payment
+            return None
+        return 1 + (1 << (value // self._unit * self._lane_bits))
+
+    def _build_min_cards(self) -> None:
+        """Fewest cards per sum, adding single cards like a 0/1 knapsack"""
+        min_cards = [0]
+        for i, amount in enumerate(self._money_cards_amount):
+            value = GameConfig.MONEY_CARD_VALUES[i]
+            if value == 0:
+                continue
+            step = value // self._unit
+            for _ in range(amount):
+                min_cards.extend([_UNREACHABLE] * step)
+                # a comparison, min() would be about three times slower here
+                for s in range(len(min_cards) - 1, step - 1, -1):
+                    if min_cards[s - step] + 1 < min_cards[s]:  # noqa: PLR1730
+                        min_cards[s] = min_cards[s - step] + 1
+        self._min_cards = min_cards
+
+    def add_money(self, money_list: list[int]) -> None:
+        """Updates the index with new money cards"""
+        for i, amount in enumerate(money_list):
+            self._money_cards_amount[i] += amount
+        if self._get_num_cards() >= self._lane_bits:  # counts could overflow
+            self._build()
+            return
+        for i, amount in enumerate(money_list):
+            factor = self._get_factor(i)
+            if amount and factor is not None:
+                self._ways *= factor**amount
+                self._min_cards = None
+
+    def remove_money(self, money_list: list[int]) -> None:
+        """Updates the index with removed money cards"""
+        for i, amount in enumerate(money_list):
+            self._money_cards_amount[i] -= amount
+            factor = self._get_factor(i)
+            if amount and factor is not None:
+                self._ways //= factor**amount
+                self._min_cards = None
+
+    def min_payment(self, target_value: int) -> int | None:
+        """Returns the lowest payable amount which is at least target_value"""
+        start = max(0, -(-target_value // self._unit))  # round up
+        ways = self._ways >> (start * self._lane_bits)
+        if not ways:
+            return None
+        lowest_bit = (ways & -ways).bit_length() - 1
+        return (start + lowest_bit // self._lane_bits) * self._unit
+
+    def min_cards(self, payment_value: int) -> int | None:
+        """Returns the fewest cards to pay payment_value exactly, None if impossible"""
+        if self._min_cards is None:
+            self._build_min_cards()
+
+        if payment_value % self._unit:
+            return None
+        s = payment_value // self._unit
+        if s >= len(self._min_cards) or self._min_cards[s] == _UNREACHABLE:
+            return None
+        return self._min_cards[s]
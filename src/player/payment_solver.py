@@ -1,65 +1,183 @@
+import heapq
+from collections.abc import Callable, Iterator
+from functools import lru_cache
+from typing import Any
+
 from game_config.game_config import GameConfig
+from player import packed_money
+
+PAYMENT_CACHE_SIZE = 4096  # solved payments shared by all solvers of a process
+
+
+def overpay_then_cards(overpay: int, card_count: int) -> tuple[int, int]:
+    """Default cost: pay as little as possible, use fewer cards on a tie"""
+    return overpay, card_count
 
 
-class MoneyPay:  # TODO add cost function -> tradeoff amount of money cards vs overpay
+def cards_then_overpay(overpay: int, card_count: int) -> tuple[int, int]:
+    """Alternative cost: keep as many cards as possible, overpay on a tie"""
+    return card_count, overpay
+
+
+class MoneyPay:
+    def __init__(self, cost_fn: Callable[[int, int], Any] = overpay_then_cards):
+        # cost_fn(overpay, card_count) -> comparable, must not decrease if either grows
+        self.cost_fn = cost_fn
+
     def optimal_pay(
         self, target_value: int, money_cards_amount: list[int]
-    ) -> list[int]:
-        """Recursive solver for finding the best minimal payment for a given target_value"""
-        self.best_solution = []
-        self.min_overpay = float("inf")
-
-        money_cards_list = self.amount_to_list(money_cards_amount)
+    ) -> list[int] | None:
+        """Returns the money amounts with the lowest cost to pay at least target_value"""
+        return self.optimal_pay_packed(
+            target_value, packed_money.pack(money_cards_amount)
+        )
 
-        total_money = sum(money_cards_list)
-        if (
-            total_money < target_value
-        ):  # This should not be possible, as payment is checked during bidding
+    def optimal_pay_packed(self, target_value: int, packed: int) -> list[int] | None:
+        """Same as optimal_pay for a packed money inventory"""
+        payment = _solve_payment(target_value, packed, self.cost_fn)
+        if payment is None:  # not possible, as payment is checked during bidding
             return None
+        return list(payment)
+
+    @staticmethod
+    def clear_cache() -> None:
+        """Drops all cached payments"""
+        _solve_payment.cache_clear()
+
+    @staticmethod
+    def cache_info():
+        """Returns hits, misses and size of the shared payment cache"""
+        return _solve_payment.cache_info()
+
+
+@lru_cache(maxsize=PAYMENT_CACHE_SIZE)
+def _solve_payment(
+    target_value: int,
+    packed: int,
+    cost_fn: Callable[[int, int], Any],
+) -> tuple[int, ...] | None:
+    """Bounded knapsack over the money card counts of a packed inventory.
+
+    For every reachable sum only the payment with the fewest cards is kept. Sums which
+    already reach the target are not extended, more cards only increase the cost."""
+    values = GameConfig.MONEY_CARD_VALUES
+    money_cards_amount = packed_money.unpack(packed)
+    total_money = sum(a * b for a, b in zip(money_cards_amount, values))
+    if total_money < target_value:
+        return None
+
+    no_cards = (0,) * len(money_cards_amount)
+    best = {0: (0, no_cards)}  # sum -> (card count, money amounts)
+
+    for i in reversed(range(len(values))):
+        value = values[i]
+        amount = money_cards_amount[i]
+        if value == 0 or amount == 0:
+            continue
+
+        for current_sum, (card_count, payment) in list(best.items()):
+            if current_sum >= target_value:
+                continue
+            for k in range(1, amount + 1):
+                new_sum = current_sum + k * value
+                known = best.get(new_sum)
+                if known is None or card_count + k < known[0]:
+                    best[new_sum] = (
+                        card_count + k,
+                        payment[:i] + (k,) + payment[i + 1 :],
+                    )
+                if new_sum >= target_value:
+                    break
 
-        self._find_subset(money_cards_list, target_value, 0, [])
+    best_cost = None
+    best_payment = None
+    for current_sum in sorted(best):
+        if current_sum < target_value:
+            continue
+        card_count, payment = best[current_sum]
+        cost = cost_fn(current_sum - target_value, card_count)
+        if best_cost is None or cost < best_cost:
+            best_cost = cost
+            best_payment = payment
 
-        return self.list_to_amount(self.best_solution)
+    return best_payment
 
-    def _find_subset(self, cards, target, current_idx, current_selection):
-        """Checks the current selected path and adds or skipps the next card"""
-        current_sum = sum(current_selection)
-        if current_sum >= target:
-            overpay = current_sum - target
 
-            if overpay < self.min_overpay:
-                self.min_overpay = overpay
-                self.best_solution = current_selection.copy()
-            elif overpay == self.min_overpay:
-                if len(current_selection) < len(self.best_solution):
-                    self.best_solution = current_selection.copy()
+def iter_payments(target_value: int, packed: int) -> Iterator[tuple[int, ...]]:
+    """Yields every payment of at least target_value which is not dominated, i.e.
+    no card can be left out. Cheapest first: by overpay, then by card count.
 
-            return  # node is finished
+    Best-first over partial payments which choose the counts of the most valuable
+    cards first. A partial payment is keyed by a lower bound of its completions: no
+    overpay, and enough further cards of the next value to reach the target. So a
+    payment is yielded before anything more expensive is built"""
+    values = GameConfig.MONEY_CARD_VALUES
+    money_cards_amount = packed_money.unpack(packed)
+    no_cards = (0,) * len(money_cards_amount)
+    if target_value <= 0:
+        yield no_cards
+        return
 
-        if current_idx >= len(cards):
-            return
+    lanes = sorted(
+        (i for i, amount in enumerate(money_cards_amount) if amount and values[i]),
+        key=lambda i: values[i],
+        reverse=True,
+    )
+    # value of the cards from a lane position on
+    rest = [0] * (len(lanes) + 1)
+    for pos in reversed(range(len(lanes))):
+        i = lanes[pos]
+        rest[pos] = rest[pos + 1] + money_cards_amount[i] * values[i]
+    if rest[0] < target_value:
+        return
 
-        # Add the current card
-        current_card = cards[current_idx]
-        current_selection.append(current_card)
-        self._find_subset(cards, target, current_idx + 1, current_selection)
+    # (overpay, card count, is complete, cards, lane position, paid). Partial
+    # payments go first on a tie, so equal payments come out ordered by cards
+    heap = [(0, -(-target_value // values[lanes[0]]), False, no_cards, 0, 0)]
+    while heap:
+        _, _, is_complete, cards, pos, paid = heapq.heappop(heap)
+        if is_complete:
+            # the last card added is the smallest, and without it the target is
+            # missed, so no card can be left out
+            yield cards
+            continue
 
-        # Do not add the card
-        current_selection.pop()
-        self._find_subset(cards, target, current_idx + 1, current_selection)
+        i = lanes[pos]
+        card_count = sum(cards)
+        for k in range(money_cards_amount[i] + 1):
+            new_paid = paid + k * values[i]
+            new_cards = cards[:i] + (k,) + cards[i + 1 :]
+            if new_paid >= target_value:
+                overpay = new_paid - target_value
+                heapq.heappush(
+                    heap, (overpay, card_count + k, True, new_cards, pos, new_paid)
+                )
+                break
+            if rest[pos + 1] >= target_value - new_paid:
+                needed = -(-(target_value - new_paid) // values[lanes[pos + 1]])
+                heapq.heappush(
+                    heap,
+                    (0, card_count + k + needed, False, new_cards, pos + 1, new_paid),
+                )
 
-    def list_to_amount(self, money_list: list[int]) -> list[int]:
-        """List of sorted money, from highest to lowest. Returns money amounts [0s, 10s, 50s, ...]"""
-        money_amount = []
-        for money_val in GameConfig.MONEY_CARD_VALUES:
-            money_amount.append(money_list.count(money_val))
-        return money_amount
 
-    def amount_to_list(self, money_amount: list[int]) -> list[int]:
-        """Takes the money amounts and lists them from highest to lowest value"""
-        res = []
-        for i in range(len(money_amount)):
-            for _ in range(money_amount[i]):
-                res.append(GameConfig.MONEY_CARD_VALUES[i])
+def iter_offers(packed: int) -> Iterator[tuple[int, ...]]:
+    """Yields one trade offer per value and card count, as only these two differ for
+    the other player. Cheapest first: by value, then by card count.
 
-        return list(reversed(res))
+    Adding a card raises the value or the count, so offers are expanded best-first
+    from no cards. Cards are added in lane order, which builds every offer once"""
+    values = GameConfig.MONEY_CARD_VALUES
+    money_cards_amount = packed_money.unpack(packed)
+    # (value, card count, cards, first lane which may still grow)
+    heap = [(0, 0, (0,) * len(money_cards_amount), 0)]
+    last_key = None
+    while heap:
+        value, card_count, cards, first_lane = heapq.heappop(heap)
+        if (value, card_count) != last_key:
+            last_key = value, card_count
+            yield cards
+        for i in range(first_lane, len(cards)):
+            if cards[i] < money_cards_amount[i]:
+                new_cards = cards[:i] + (cards[i] + 1,) + cards[i + 1 :]
+                heapq.heappush(heap, (value + values[i], card_count + 1, new_cards, i))
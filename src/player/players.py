@@ -1,15 +1,72 @@
+from game.journal import Journal
 from game_config.game_config import GameConfig
+from player import packed_money, zobrist
+from player.cow_index import CowIndex
+from player.payment_index import PaymentIndex
 from player.payment_solver import MoneyPay
 
+# Dense ids of the cow values, cow counters are indexed by them
+_cow_type_values: list[int] = []
+_cow_type_ids: dict[int, int] = {}
+
+
+def get_cow_type_id(cow_card: int) -> int:
+    """Returns the dense id of a cow value. Unknown values get the next free id"""
+    cow_type = _cow_type_ids.get(cow_card)
+    if cow_type is None:
+        cow_type = len(_cow_type_values)
+        _cow_type_ids[cow_card] = cow_type
+        _cow_type_values.append(cow_card)
+    return cow_type
+
+
+def get_cow_type_value(cow_type: int) -> int:
+    """Returns the cow value of a dense id"""
+    return _cow_type_values[cow_type]
+
+
+for _cow in sorted(
+    set(GameConfig.COW_CARD_VALUES) | set(GameConfig.STARTING_COWS)
+):  # config values get the lowest ids
+    get_cow_type_id(_cow)
+
 
 class Player:
-    def __init__(self, player_idx: int, player_name: str):
+    __slots__ = (
+        "_cow_cards",
+        "_cow_index",
+        "_hash",
+        "_journal",
+        "_money_cards",
+        "_player_idx",
+        "_player_name",
+        "_score",
+        "_version",
+        "pay_solver",
+    )
+
+    def __init__(
+        self,
+        player_idx: int,
+        player_name: str,
+        cow_index: CowIndex | None = None,
+        journal: Journal | None = None,
+    ):
         self._player_idx = player_idx
         self._player_name = player_name
 
         self._money_cards = MoneyCards()
         self._cow_cards = CowCards()
         self._score = 0
+        self._version = 0  # counts the changes of money, cows and score
+
+        self._hash: int | None = None  # kept up to date after the first get_hash
+
+        self._cow_index = cow_index  # shared by the players of a game
+        if cow_index is not None:
+            for cow_type, count in enumerate(self._cow_cards.get_cow_counts()):
+                cow_index.add(player_idx, cow_type, count)
+        self._journal = journal  # records the undo of every change, see Journal
 
         if GameConfig.AUTOMATIC_MONEY_CARD_CHOICE:
             self.pay_solver = MoneyPay()
@@ -21,6 +78,36 @@ class Player:
     def get_player_name(self) -> str:
         return self._player_name
 
+    def get_version(self) -> int:
+        """Returns a counter which grows with every change of money, cows or score"""
+        return self._version
+
+    # Zobrist hash of money, cows and finished quartets, see zobrist. Games
+    # without a search never ask for it, so it is only updated after the first call
+    def get_hash(self) -> int:
+        if self._hash is None:
+            self._hash = self._money_key(self._money_cards.get_packed_money())
+            self._hash ^= self._finished_key()
+            for cow_card in set(self._cow_cards.get_cow_inventory()):
+                self._hash ^= self._cow_key(cow_card, self.get_cow_count(cow_card))
+        return self._hash
+
+    def _money_key(self, packed: int) -> int:
+        return zobrist.key(zobrist.MONEY, self._player_idx, packed)
+
+    def _cow_key(self, cow_card: int, count: int) -> int:
+        if not count:
+            return 0
+        return zobrist.key(zobrist.COWS, self._player_idx, cow_card, count)
+
+    def _finished_key(self) -> int:
+        return zobrist.key(
+            zobrist.FINISHED,
+            self._player_idx,
+            self._cow_cards.get_finished_value(),
+            len(self._cow_cards.cow_finished),
+        )
+
     # Money stuff
     def get_money_value(self) -> int:
         return self._money_cards.return_money_value()
@@ -29,21 +116,58 @@ class Player:
         return self._money_cards.has_enough_money(sub_money_list)
 
     def add_money(self, add_money_list) -> None:
-        self._money_cards.add_money(add_money_list)
+        self.add_packed_money(packed_money.pack(add_money_list))
 
     def remove_money(self, sub_money_list) -> None:
-        self._money_cards.remove_money(sub_money_list)
+        self.remove_packed_money(packed_money.pack(sub_money_list))
 
     def get_money_inventory(self) -> list[int]:
-        return self._money_cards._money_inventory
+        return self._money_cards.get_money_inventory()
+
+    # Packed money, see packed_money
+    def get_packed_money(self) -> int:
+        return self._money_cards.get_packed_money()
+
+    def has_enough_packed_money(self, packed: int) -> bool:
+        return self._money_cards.has_enough_packed_money(packed)
+
+    def add_packed_money(self, packed: int) -> None:
+        old_packed = self._money_cards.get_packed_money()
+        self._money_cards.add_packed_money(packed)
+        if self._hash is not None:
+            self._hash ^= self._money_key(old_packed)
+            self._hash ^= self._money_key(old_packed + packed)
+        self._version += 1
+        if self._journal is not None:
+            self._journal.record(self.remove_packed_money, packed)
+
+    def remove_packed_money(self, packed: int) -> None:
+        old_packed = self._money_cards.get_packed_money()
+        self._money_cards.remove_packed_money(packed)
+        if self._hash is not None:
+            self._hash ^= self._money_key(old_packed)
+            self._hash ^= self._money_key(old_packed - packed)
+        self._version += 1
+        if self._journal is not None:
+            self._journal.record(self.add_packed_money, packed)
 
     def get_optimal_payment(self, target_value) -> list[int]:
         """From a given target value, get the optimal amount of money cards"""
-        return self.pay_solver.optimal_pay(target_value, self.get_money_inventory())
+        return self.pay_solver.optimal_pay_packed(
+            target_value, self._money_cards.get_packed_money()
+        )
+
+    def get_min_payment(self, target_value) -> int | None:
+        """Returns the money the player would really pay for the target value"""
+        return self._money_cards.get_payment_index().min_payment(target_value)
+
+    def get_min_payment_cards(self, payment_value) -> int | None:
+        """Returns the fewest money cards to pay exactly the payment value"""
+        return self._money_cards.get_payment_index().min_cards(payment_value)
 
     def get_money_cards_count(self) -> int:
         """Returns the number of total cards in the players hand"""
-        return sum(self._money_cards._money_inventory)
+        return self._money_cards.get_money_cards_count()
 
     # Cow stuff
     def has_cow(self, cow_card, cow_card_amount) -> bool:
@@ -51,89 +175,281 @@ class Player:
         return has_cow
 
     def add_cow(self, cow_card, cow_card_amount) -> None:
+        num_candidates = self._cow_cards.get_num_quartet_candidates()
+        count = self._cow_cards.get_cow_count(cow_card)
         self._cow_cards.add_cow_to_inventory(cow_card, cow_card_amount)
+        if self._hash is not None:
+            self._hash ^= self._cow_key(cow_card, count)
+            self._hash ^= self._cow_key(cow_card, count + cow_card_amount)
+        self._version += 1
+        if self._cow_index is not None:
+            self._cow_index.add(
+                self._player_idx, get_cow_type_id(cow_card), cow_card_amount
+            )
+        if self._journal is not None:
+            self._journal.record(
+                self._undo_cow_change, cow_card, -cow_card_amount, num_candidates
+            )
 
     def remove_cow(self, cow_card, cow_card_amount) -> None:
+        num_candidates = self._cow_cards.get_num_quartet_candidates()
+        count = self._cow_cards.get_cow_count(cow_card)
         self._cow_cards.remove_cows(cow_card, cow_card_amount)
+        if self._hash is not None:
+            self._hash ^= self._cow_key(cow_card, count)
+            self._hash ^= self._cow_key(cow_card, count - cow_card_amount)
+        self._version += 1
+        if self._cow_index is not None:
+            self._cow_index.remove(
+                self._player_idx, get_cow_type_id(cow_card), cow_card_amount
+            )
+        if self._journal is not None:
+            self._journal.record(
+                self._undo_cow_change, cow_card, cow_card_amount, num_candidates
+            )
+
+    def _undo_cow_change(self, cow_card, cow_card_amount, num_candidates) -> None:
+        """Reverts add_cow (negative amount) or remove_cow (positive amount)"""
+        if cow_card_amount > 0:
+            self.add_cow(cow_card, cow_card_amount)
+        else:
+            self.remove_cow(cow_card, -cow_card_amount)
+        self._cow_cards.truncate_quartet_candidates(num_candidates)
 
     def get_cow_inventory(self) -> list[int]:
-        return self._cow_cards._cow_inventory
+        return self._cow_cards.get_cow_inventory()
+
+    def get_cow_count(self, cow_card) -> int:
+        """Returns how many cows of one type the player has"""
+        return self._cow_cards.get_cow_count(cow_card)
+
+    def get_cow_counts(self) -> list[int]:
+        """Returns the cow counts per dense cow type id. Must not be modified"""
+        return self._cow_cards.get_cow_counts()
+
+    def get_finished_cows(self) -> tuple[int, ...]:
+        """Returns the cow values of the finished quartets in order"""
+        return tuple(self._cow_cards.cow_finished)
+
+    def has_any_cow(self) -> bool:
+        return self._cow_cards.get_num_cows() > 0
 
     # Score stuff
     def update_score(self) -> None:
-        self._cow_cards.check_for_four_cows()
-        self._score = (
-            sum(self._cow_cards.cow_finished) * 4 * len(self._cow_cards.cow_finished)
-        )
+        num_finished = len(self._cow_cards.cow_finished)
+        if self._journal is not None:
+            self._journal.record(
+                self._undo_update_score,
+                self._score,
+                num_finished,
+                self._cow_cards.get_quartet_candidates(),
+            )
+        finished_key = None if self._hash is None else self._finished_key()
+        if self._cow_cards.check_for_four_cows():
+            self._score = (
+                self._cow_cards.get_finished_value()
+                * 4
+                * len(self._cow_cards.cow_finished)
+            )
+            self._version += 1
+            if self._hash is not None:
+                self._hash ^= finished_key ^ self._finished_key()
+            for cow_card in self._cow_cards.cow_finished[num_finished:]:
+                if self._hash is not None:
+                    count = self._cow_cards.get_cow_count(cow_card)
+                    self._hash ^= self._cow_key(cow_card, count + 4)
+                    self._hash ^= self._cow_key(cow_card, count)
+                if self._cow_index is not None:
+                    self._cow_index.remove(
+                        self._player_idx, get_cow_type_id(cow_card), 4
+                    )
+
+    def _undo_update_score(self, score, num_finished, quartet_candidates) -> None:
+        """Brings back the quartets finished by update_score"""
+        finished_key = None if self._hash is None else self._finished_key()
+        for cow_card in self._cow_cards.cow_finished[num_finished:]:
+            if self._hash is not None:
+                count = self._cow_cards.get_cow_count(cow_card)
+                self._hash ^= self._cow_key(cow_card, count)
+                self._hash ^= self._cow_key(cow_card, count + 4)
+            if self._cow_index is not None:
+                self._cow_index.add(self._player_idx, get_cow_type_id(cow_card), 4)
+        self._cow_cards.undo_quartets(num_finished, quartet_candidates)
+        if self._hash is not None:
+            self._hash ^= finished_key ^ self._finished_key()
+        self._score = score
+        self._version += 1
 
     def get_score(self) -> int:
         return self._score
 
 
 class MoneyCards:
+    """Money counts packed into one int, see packed_money.
+
+    The total value and card count are kept up to date"""
+
+    __slots__ = ("_card_count", "_money_value", "_packed_money", "_payment_index")
+
     def __init__(self):
-        self._money_inventory = (
-            GameConfig.STARTING_MONEY
-        )  # amount of 0, 10, 50, 100, 200, 500
+        # amount of 0, 10, 50, 100, 200, 500
+        self._packed_money = packed_money.pack(GameConfig.STARTING_MONEY)
+        self._money_value = packed_money.value(self._packed_money)
+        self._card_count = packed_money.count(self._packed_money)
+        self._payment_index = None  # built with the first payment query
 
     def get_money_inventory(self) -> list[int]:
-        return self._money_inventory
+        """Returns a copy of the money amounts"""
+        return packed_money.unpack(self._packed_money)
+
+    def get_packed_money(self) -> int:
+        return self._packed_money
+
+    def get_payment_index(self) -> PaymentIndex:
+        """Returns the reachable payments of the current inventory"""
+        if self._payment_index is None:
+            self._payment_index = PaymentIndex(self.get_money_inventory())
+        return self._payment_index
 
     def add_money(self, money_list: list[int]):
-        self._money_inventory = [
-            x + y for x, y in zip(self._money_inventory, money_list)
-        ]
+        self.add_packed_money(packed_money.pack(money_list))
+
+    def add_packed_money(self, packed: int):
+        self._packed_money += packed
+        self._money_value += packed_money.value(packed)
+        self._card_count += packed_money.count(packed)
+        if self._payment_index is not None:
+            self._payment_index.add_money(packed_money.unpack(packed))
 
     def has_enough_money(self, money_list: list[int]) -> bool:
         """Checks if the player has enough money"""
-        new_amount_money = [x - y for x, y in zip(self._money_inventory, money_list)]
-        negative_money_idx = []
-        for i in range(len(money_list)):
-            if new_amount_money[i] < 0:
-                negative_money_idx.append(i)
+        return packed_money.can_afford(
+            self._packed_money, packed_money.pack(money_list)
+        )
 
-        if any(negative_money_idx):
-            return False
-        else:
-            return True
+    def has_enough_packed_money(self, packed: int) -> bool:
+        return packed_money.can_afford(self._packed_money, packed)
 
     def remove_money(self, money_list) -> None:
         """Removes the money from the players inventory"""
-        new_amount_money = [x - y for x, y in zip(self._money_inventory, money_list)]
-        self._money_inventory = new_amount_money
+        self.remove_packed_money(packed_money.pack(money_list))
+
+    def remove_packed_money(self, packed: int) -> None:
+        """Removes the money. Raises ValueError if a card is missing"""
+        if not packed_money.can_afford(self._packed_money, packed):
+            raise ValueError("Player does not have these money cards")
+        self._packed_money -= packed
+        self._money_value -= packed_money.value(packed)
+        self._card_count -= packed_money.count(packed)
+        if self._payment_index is not None:
+            self._payment_index.remove_money(packed_money.unpack(packed))
 
     def return_money_value(self):
-        """Returns the total Fvalue of the players money cards"""
-        return sum(
-            [a * b for a, b in zip(self._money_inventory, GameConfig.MONEY_CARD_VALUES)]
-        )
+        """Returns the total value of the players money cards"""
+        return self._money_value
+
+    def get_money_cards_count(self) -> int:
+        return self._card_count
 
 
 class CowCards:
+    """Cow counts indexed by the dense cow type id"""
+
+    __slots__ = (
+        "_cow_counts",
+        "_finished_value",
+        "_num_cows",
+        "_quartet_candidates",
+        "cow_finished",
+    )
+
     def __init__(self):
-        self._cow_inventory = [20]  # list of current cows (unsorted)
+        self._cow_counts = [0] * len(_cow_type_values)
+        self._num_cows = 0
+        self._quartet_candidates = []  # types which reached 4 cows since the last check
+        self._finished_value = 0
         self.cow_finished = []
+        for cow_card in GameConfig.STARTING_COWS:
+            self.add_cow_to_inventory(cow_card, 1)
 
     def get_cow_inventory(self) -> list[int]:
-        return self._cow_inventory
+        """Returns a list of the current cows, sorted by cow type id"""
+        inventory = []
+        for cow_type, count in enumerate(self._cow_counts):
+            if count:
+                inventory.extend([_cow_type_values[cow_type]] * count)
+        return inventory
+
+    def get_cow_count(self, cow_card: int) -> int:
+        cow_type = _cow_type_ids.get(cow_card)
+        if cow_type is None or cow_type >= len(self._cow_counts):
+            return 0
+        return self._cow_counts[cow_type]
+
+    def get_cow_counts(self) -> list[int]:
+        """Returns the counts per dense cow type id. Must not be modified"""
+        return self._cow_counts
+
+    def get_num_cows(self) -> int:
+        return self._num_cows
+
+    def get_quartet_candidates(self) -> list[int]:
+        """Returns the types which reached 4 cows since the last check. Must not be modified"""
+        return self._quartet_candidates
+
+    def get_num_quartet_candidates(self) -> int:
+        return len(self._quartet_candidates)
+
+    def truncate_quartet_candidates(self, num_candidates: int) -> None:
+        """Forgets the candidates which were added after the first num_candidates"""
+        del self._quartet_candidates[num_candidates:]
+
+    def get_finished_value(self) -> int:
+        """Returns the sum of the values of all finished quartets"""
+        return self._finished_value
 
     def add_cow_to_inventory(self, cow_card, cow_card_amount) -> None:
-        for i in range(cow_card_amount):
-            self._cow_inventory.append(cow_card)
+        cow_type = get_cow_type_id(cow_card)
+        if cow_type >= len(self._cow_counts):
+            self._cow_counts.extend([0] * (cow_type + 1 - len(self._cow_counts)))
+        self._cow_counts[cow_type] += cow_card_amount
+        self._num_cows += cow_card_amount
+        if self._cow_counts[cow_type] >= 4:
+            self._quartet_candidates.append(cow_type)
 
     def has_cow(self, cow_card: int, cow_card_amount: int) -> bool:
-        if self._cow_inventory.count(cow_card) >= cow_card_amount:
-            return True
-        else:
-            return False
+        return self.get_cow_count(cow_card) >= cow_card_amount
 
     def remove_cows(self, cow_card, cow_card_amount) -> None:
-        for i in range(cow_card_amount):
-            self._cow_inventory.remove(cow_card)
-
-    def check_for_four_cows(self) -> None:
-        diff_cow_cards = list(set(self._cow_inventory))
-        for i in range(len(diff_cow_cards)):
-            if self.has_cow(diff_cow_cards[i], 4):
-                self.remove_cows(diff_cow_cards[i], 4)
-                self.cow_finished.append(diff_cow_cards[i])
+        if not cow_card_amount:
+            return
+        if not self.has_cow(cow_card, cow_card_amount):
+            raise ValueError(f"Not enough cows of {cow_card} to remove")
+        self._cow_counts[_cow_type_ids[cow_card]] -= cow_card_amount
+        self._num_cows -= cow_card_amount
+
+    def check_for_four_cows(self) -> bool:
+        """Finishes the quartets of the types which got cows. Returns True if any"""
+        if not self._quartet_candidates:
+            return False
+
+        finished_any = False
+        counts = self._cow_counts
+        for cow_type in sorted(set(self._quartet_candidates)):
+            if counts[cow_type] >= 4:
+                counts[cow_type] -= 4
+                self._num_cows -= 4
+                self._finished_value += _cow_type_values[cow_type]
+                self.cow_finished.append(_cow_type_values[cow_type])
+                finished_any = True
+        self._quartet_candidates = []  # the old list may be kept for an undo
+        return finished_any
+
+    def undo_quartets(self, num_finished: int, quartet_candidates: list[int]) -> None:
+        """Takes back the quartets finished after the first num_finished"""
+        while len(self.cow_finished) > num_finished:
+            cow_card = self.cow_finished.pop()
+            self._cow_counts[_cow_type_ids[cow_card]] += 4
+            self._num_cows += 4
+            self._finished_value -= cow_card
+        self._quartet_candidates = quartet_candidates
@@ -0,0 +1,36 @@
+from functools import lru_cache
+
+# Zobrist style keys for incremental hashing of game states. Every feature of a
+# state, e.g. "player 2 has 3 cows of 10", gets a pseudo random 64 bit key. The hash
+# of a state is the XOR of its keys, so a change XORs out the old key and XORs in
+# the new one. Keys are computed, the same in every process, and cached.
+KEY_CACHE_SIZE = 1 << 16
+MASK_64 = (1 << 64) - 1
+
+MONEY = 1
+COWS = 2
+FINISHED = 3
+DECK = 4
+CURRENT_PLAYER = 5
+INFLATION = 6
+ACTIVE_PLAYER = 7
+
+
+def _splitmix64(x: int) -> int:
+    x = (x + 0x9E3779B97F4A7C15) & MASK_64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & MASK_64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & MASK_64
+    return x ^ (x >> 31)
+
+
+@lru_cache(maxsize=KEY_CACHE_SIZE)
+def key(*parts: int) -> int:
+    """Returns the 64 bit key of a feature, e.g. key(COWS, player, cow, count)"""
+    h = 0
+    for part in parts:
+        h = _splitmix64(h ^ (part & MASK_64))
+        part >>= 64
+        while part:  # packed money has more than 64 bits
+            h = _splitmix64(h ^ (part & MASK_64))
+            part >>= 64
+    return h
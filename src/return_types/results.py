@@ -12,3 +12,72 @@ class ResultType(Enum):
 class Result:
     type: ResultType
     message: str = None
+
+
+@dataclass
+class GameResult:
+    seed: int
+    scores: list[int]
+    turns: int
+    finished: bool = True  # False if the game stalled or hit the turn limit
+
+
+@dataclass
+class MatchupResult:
+    lineup: tuple[str, ...]  # bot name per seat
+    games: int = 0
+    unfinished: int = 0
+    wins: list[float] = None  # a shared win counts 1 / number of winners
+    score_sums: list[int] = None
+
+    def __post_init__(self):
+        if self.wins is None:
+            self.wins = [0.0] * len(self.lineup)
+        if self.score_sums is None:
+            self.score_sums = [0] * len(self.lineup)
+
+    def add_game(self, result: GameResult):
+        """Counts the scores and winners of a single game"""
+        self.games += 1
+        self.unfinished += not result.finished
+
+        best = max(result.scores)
+        winners = [i for i, score in enumerate(result.scores) if score == best]
+        for i in winners:
+            self.wins[i] += 1 / len(winners)
+        for i, score in enumerate(result.scores):
+            self.score_sums[i] += score
+
+    def merge(self, other: "MatchupResult"):
+        """Adds the games of another batch of the same lineup"""
+        self.games += other.games
+        self.unfinished += other.unfinished
+        self.wins = [a + b for a, b in zip(self.wins, other.wins)]
+        self.score_sums = [a + b for a, b in zip(self.score_sums, other.score_sums)]
+
+    def get_win_rates(self) -> list[float]:
+        return [w / self.games if self.games else 0.0 for w in self.wins]
+
+    def get_mean_scores(self) -> list[float]:
+        return [s / self.games if self.games else 0.0 for s in self.score_sums]
+
+
+@dataclass
+class LatencyStats:
+    """Summary of decision times in seconds"""
+
+    count: int = 0
+    mean: float = 0.0
+    p50: float = 0.0
+    p95: float = 0.0
+    max: float = 0.0
+
+    @classmethod
+    def from_samples(cls, samples: list[float]) -> "LatencyStats":
+        if not samples:
+            return cls()
+        ordered = sorted(samples)
+        n = len(ordered)
+        return cls(
+            n, sum(ordered) / n, ordered[n // 2], ordered[int(n * 0.95)], ordered[-1]
+        )
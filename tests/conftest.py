@@ -0,0 +1,20 @@
+from application.play_auction import PlayBidTurn
+from application.play_trade import PlayTradeTurn
+from game.game import Game
+from interface.bot_interface import BotPlayer
+from io_handler.console_outputs import NullOutputHandler
+from return_types.action import ActionType
+
+
+def play_turns(game: Game, bots: list[BotPlayer], num_turns: int):
+    """Plays up to num_turns turns of the bots, stops early if the game is over"""
+    output = NullOutputHandler()
+    handlers = {
+        ActionType.BID: PlayBidTurn(bots, output, game),
+        ActionType.TRADE: PlayTradeTurn(bots, output, game),
+    }
+    for _ in range(num_turns):
+        if game.is_game_over() is not None or game.is_stalled():
+            return
+        idx = game.get_current_player_idx()
+        handlers[bots[idx].choose_action(game.get_player_view(idx))].execute()
@@ -0,0 +1,96 @@
+import asyncio
+import time
+
+from action_handlers.bidding import BidHandler
+from application.async_turns import AsyncPlayBidTurn, play_game_async
+from application.replay import ReplayEngine
+from game.event_log import EventLog
+from game.game import Game
+from interface.async_player_interface import AsyncPlayerAdapter, AsyncPlayerInterface
+from interface.bot_interface import BotPlayer
+from io_handler.console_outputs import NullOutputHandler
+from return_types.action import Bid
+
+
+class ScriptedBidder(AsyncPlayerInterface):
+    """Bids the values of the script, one per round, then passes"""
+
+    def __init__(self, player_idx: int, bids: list[int], delay: float = 0.0):
+        self.player_idx = player_idx
+        self.bids = list(bids)
+        self.delay = delay
+        self.decision_times: list[tuple[float, float]] = []  # (start, end)
+
+    async def make_bid_decision(self, view, bid_handler):
+        start = time.perf_counter()
+        await asyncio.sleep(self.delay)
+        self.decision_times.append((start, time.perf_counter()))
+        return Bid(self.player_idx, self.bids.pop(0) if self.bids else None)
+
+    async def make_buy_back_decision(self, view, highest_bid):
+        return False
+
+    async def choose_action(self, view):
+        pass
+
+    async def choose_money_cards(self, view, highest, buyer_idx):
+        pass
+
+    async def make_trade_decision(self, view, joint_cows):
+        pass
+
+    async def make_trade_offer(self, view, card_count=None):
+        pass
+
+
+def new_game() -> Game:
+    game = Game(4, ["A", "B", "C", "D"], seed=0)
+    game.start_game()
+    return game
+
+
+class TestAsyncTurns:
+    """Async turn handlers."""
+
+    def test_bidders_decide_concurrently(self):
+        game = new_game()
+        master = game.get_current_player_idx()
+        bidders = [ScriptedBidder(i, [], delay=0.01) for i in range(4)]
+        turn = AsyncPlayBidTurn(bidders, NullOutputHandler(), game)
+
+        asyncio.run(turn.run_auction(BidHandler(master, 4, 10)))
+        assert game.get_current_turn() == 1
+
+        # one round in which every bidder started before any of them finished
+        times = [t for bidder in bidders for t in bidder.decision_times]
+        assert len(times) == 3
+        assert max(start for start, _ in times) < min(end for _, end in times)
+
+    def test_topped_bid_stays_in_auction(self):
+        game = new_game()
+        master = game.get_current_player_idx()
+        first, second, third = [(master + i) % 4 for i in (1, 2, 3)]
+        scripts = {first: [40, 60], second: [30], third: []}
+        bidders = [ScriptedBidder(i, scripts.get(i, [])) for i in range(4)]
+        turn = AsyncPlayBidTurn(bidders, NullOutputHandler(), game)
+        bid_handler = BidHandler(master, 4, 10)
+
+        asyncio.run(turn._run_auction_round(bid_handler))
+        assert bid_handler.remaining_players == [first, second]
+        assert bid_handler.get_highest_bid() == 40
+
+        asyncio.run(turn._run_auction_round(bid_handler))
+        assert bid_handler.get_winner_bid() == Bid(first, 60)
+        assert bid_handler.is_complete()
+
+    def test_games_replay(self):
+        for seed in range(5):
+            game = Game(4, ["A", "B", "C", "D"], seed=seed)
+            game.start_game()
+            event_log = EventLog()
+            game.set_event_log(event_log)
+            interfaces = [
+                AsyncPlayerAdapter(BotPlayer(i, seed * 4 + i)) for i in range(4)
+            ]
+            asyncio.run(play_game_async(game, interfaces, NullOutputHandler()))
+            assert ReplayEngine(event_log).replay().to_bytes() == game.to_bytes()
@@ -0,0 +1,130 @@
+import random
+
+import pytest
+
+from game.game import Game
+from game_config.game_config import GameConfig
+
+np = pytest.importorskip("numpy")
+
+from game.batch_game import BatchGame, get_game_state
+
+NUM_PLAYERS = 3
+SEEDS = list(range(30))
+
+
+def random_payment(rng, player):
+    return [rng.randint(0, a) for a in player.get_money_inventory()]
+
+
+def play_lockstep_turn(rng, games, batch):
+    """Applies the same random turn to every Game and, vectorized, to the batch"""
+    auctions = [[], [], [], []]  # games, buyers, sellers, payments
+    trades = [[], [], [], [], [], []]
+    for g, game in enumerate(games):
+        if game.is_game_over() is not None or game.is_stalled():
+            continue
+        current = game.get_current_player_idx()
+
+        if not game.card_stack.is_empty():
+            cow = game.card_stack.draw_card()
+            if game.card_stack.is_donkey_cow(cow):
+                game.bank.inflate_player_money(game.get_all_players())
+            buyer = rng.randrange(NUM_PLAYERS)
+            payment = random_payment(rng, game.get_player(buyer))
+            game.handle_bid(cow, buyer, current, payment)
+            for values, value in zip(auctions, [g, buyer, current, payment]):
+                values.append(value)
+        else:
+            joint_cows = game.get_possible_cow_trades()
+            if joint_cows:
+                contender = rng.choice(sorted(joint_cows))
+                cow = rng.choice(sorted(joint_cows[contender]))
+                amount = min(
+                    game.get_player(current).get_cow_inventory().count(cow),
+                    game.get_player(contender).get_cow_inventory().count(cow),
+                )
+                offer = random_payment(rng, game.get_current_player())
+                counter = random_payment(rng, game.get_player(contender))
+                offer_value = game.get_money_value(offer)
+                counter_value = game.get_money_value(counter)
+                if offer_value != counter_value:
+                    winner, loser = (
+                        (current, contender)
+                        if offer_value > counter_value
+                        else (contender, current)
+                    )
+                    game.handle_trade(
+                        cow, amount, contender, offer, counter, winner, loser
+                    )
+                trade = [g, batch.get_cow_type(cow), amount, contender, offer, counter]
+                for values, value in zip(trades, trade):
+                    values.append(value)
+        game.end_turn()
+
+    return auctions, trades
+
+
+class TestBatchGame:
+    """The vectorized engine matches the object engine on the same seeds."""
+
+    def test_same_start(self):
+        """Decks, starting players and money are dealt like Game.start_game."""
+        batch = BatchGame.from_seeds(SEEDS, NUM_PLAYERS)
+        for g, seed in enumerate(SEEDS):
+            game = Game(NUM_PLAYERS, ["A", "B", "C"], seed=seed)
+            game.start_game()
+
+            assert batch.get_state(g) == get_game_state(game)
+
+    def test_lockstep_matches_game(self):
+        """Random auctions, trades and turns give the same states in both engines."""
+        rng = random.Random(0)
+        games = []
+        for seed in SEEDS:
+            game = Game(NUM_PLAYERS, ["A", "B", "C"], seed=seed)
+            game.start_game()
+            games.append(game)
+        batch = BatchGame.from_seeds(SEEDS, NUM_PLAYERS)
+
+        for _ in range(40):
+            ongoing = [
+                g
+                for g, game in enumerate(games)
+                if game.is_game_over() is None and not game.is_stalled()
+            ]
+            if not ongoing:
+                break
+            auctions, trades = play_lockstep_turn(rng, games, batch)
+
+            if auctions[0]:
+                idx = np.array(auctions[0])
+                cow_types = batch.draw_cards(idx)
+                batch.handle_bid(idx, cow_types, *map(np.array, auctions[1:]))
+            if trades[0]:
+                idx = np.array(trades[0])
+                batch.handle_trade(
+                    idx,
+                    np.array(trades[1]),
+                    np.array(trades[2]),
+                    batch.current_player[idx],
+                    *map(np.array, trades[3:]),
+                )
+            batch.end_turn(np.array(ongoing))
+
+            for g, game in enumerate(games):
+                assert batch.get_state(g) == get_game_state(game)
+
+    def test_play_random(self):
+        """Random lockstep playouts end every game or leave it stalled."""
+        batch = BatchGame.from_seeds(range(200), 4)
+        batch.play_random(np.random.default_rng(0))
+
+        done = batch.is_game_over() | batch.is_stalled()
+        assert done.all()
+        assert (batch.money >= 0).all()
+        assert (batch.get_scores().sum(axis=1)[batch.is_game_over()] > 0).all()
+        cows_per_game = 4 * len(GameConfig.COW_CARD_VALUES) + 4 * len(
+            GameConfig.STARTING_COWS
+        )  # deck plus the starting cows of 4 players
+        assert batch.cows.sum() + 4 * batch.finished.sum() == 200 * cows_per_game
@@ -0,0 +1,24 @@
+from application import benchmark
+
+
+class TestBenchmark:
+    """The benchmark suite and its baseline comparison."""
+
+    def test_every_benchmark_runs(self):
+        for name, setup in benchmark.BENCHMARKS.items():
+            assert setup()() > 0, name
+
+    def test_baseline_round_trip(self, tmp_path):
+        path = str(tmp_path / "baseline.json")
+        results = benchmark.run_benchmarks(["cow_trades"], min_time=0.01, repeats=1)
+        benchmark.save_baseline(results, path)
+        assert benchmark.load_baseline(path) == results
+
+    def test_compare(self):
+        baseline = {"a": 100.0, "b": 100.0, "c": 100.0}
+        results = {"a": 85.0, "b": 70.0, "new": 1.0}
+        assert benchmark.compare(results, baseline, threshold=0.2) == {"b": 0.7}
+        assert benchmark.compare(results, baseline, threshold=0.1) == {
+            "a": 0.85,
+            "b": 0.7,
+        }
@@ -2,18 +2,20 @@ import pytest
 from unittest.mock import Mock
 from game.game import Game
 from action_handlers.bidding import BidHandler
-from application.play_auction import PlayBidTurn
+from application.play_auction import MAX_MONEY_CARD_CHOICES, PlayBidTurn
 from return_types.action import Bid
 from return_types.results import ResultType
 from game_config.game_config import GameConfig
 
 
 @pytest.fixture
-def game_4_players():
+def game_4_players(monkeypatch):
     """Create a game with 3 players for testing."""
-    GameConfig.AUTOMATIC_MONEY_CARD_CHOICE = True
-    GameConfig.STARTING_MONEY_CARDS = [0, 3, 2, 0, 0, 0]  # 120
-    GameConfig.DONKEY_COW = 20
+    monkeypatch.setattr(GameConfig, "AUTOMATIC_MONEY_CARD_CHOICE", True)
+    monkeypatch.setattr(
+        GameConfig, "STARTING_MONEY_CARDS", [0, 3, 2, 0, 0, 0], raising=False
+    )  # 120
+    monkeypatch.setattr(GameConfig, "DONKEY_COW", 20)
 
     game = Game(4, ["Alice", "Bob", "Charlie", "David"])
     game.start_game()
@@ -23,11 +25,13 @@ def game_4_players():
 
 
 @pytest.fixture
-def game_3_players():
+def game_3_players(monkeypatch):
     """Create a game with 3 players for testing."""
-    GameConfig.AUTOMATIC_MONEY_CARD_CHOICE = True
-    GameConfig.STARTING_MONEY_CARDS = [0, 3, 2, 0, 0, 0]  # 120
-    GameConfig.DONKEY_COW = 20
+    monkeypatch.setattr(GameConfig, "AUTOMATIC_MONEY_CARD_CHOICE", True)
+    monkeypatch.setattr(
+        GameConfig, "STARTING_MONEY_CARDS", [0, 3, 2, 0, 0, 0], raising=False
+    )  # 120
+    monkeypatch.setattr(GameConfig, "DONKEY_COW", 20)
 
     game = Game(3, ["Alice", "Bob", "Charlie"])
     game.start_game()
@@ -322,3 +326,68 @@ class TestGameFlow:
         )
 
         assert game.get_current_player_idx() == 1  # test end turn
+
+
+class TestMoneyCardChoice:
+    """The chosen money cards are checked before anything is handed over."""
+
+    def _play_auction(self, game, monkeypatch, money_cards):
+        monkeypatch.setattr(GameConfig, "AUTOMATIC_MONEY_CARD_CHOICE", False)
+        p0 = make_player_interface_mock(0, bid_value=None, buy_back=False)
+        p1 = make_player_interface_mock(1, bid_value=40)
+        p2 = make_player_interface_mock(2, bid_value=None)
+        p1.choose_money_cards.return_value = money_cards
+        player_interfaces = [p0, p1, p2]
+        return PlayBidTurn(player_interfaces, Mock(), game).execute(), p1
+
+    @pytest.mark.parametrize(
+        "extra_cards, covers_bid",
+        [([0, 0, 0, 0, 0, 1], True), ([0, 0, 0, 0, 0, 0], False)],
+    )
+    def test_invalid_money_cards_fail_the_auction(
+        self, game_3_players, monkeypatch, extra_cards, covers_bid
+    ):
+        game = game_3_players
+        money = [p.get_money_inventory() for p in game.get_all_players()]
+        cows = [p.get_cow_inventory() for p in game.get_all_players()]
+        if covers_bid:  # one card more than the buyer holds
+            money_cards = [a + b for a, b in zip(money[1], extra_cards)]
+        else:
+            money_cards = extra_cards
+
+        res, buyer = self._play_auction(game, monkeypatch, money_cards)
+
+        assert res.type == ResultType.FAILURE
+        assert buyer.choose_money_cards.call_count == MAX_MONEY_CARD_CHOICES
+        assert [p.get_money_inventory() for p in game.get_all_players()] == money
+        assert [p.get_cow_inventory() for p in game.get_all_players()] == cows
+        assert game.get_current_player_idx() == 0
+
+    def test_valid_money_cards_pay_the_seller(self, game_3_players, monkeypatch):
+        game = game_3_players
+        money_cards = game.get_player(1).get_optimal_payment(40)
+        num_cows = len(game.get_player(1).get_cow_inventory())
+
+        res, buyer = self._play_auction(game, monkeypatch, money_cards)
+
+        assert res.type == ResultType.SUCCESS
+        assert buyer.choose_money_cards.call_count == 1
+        assert len(game.get_player(1).get_cow_inventory()) == num_cows + 1
+
+    def test_missing_cards_change_nothing(self, game_3_players):
+        game = game_3_players
+        money = [p.get_money_inventory() for p in game.get_all_players()]
+        too_much = [a + 1 for a in money[1]]
+        game.get_player(1).add_cow(20, 1)
+        game.get_player(0).add_cow(20, 1)
+        cows = [p.get_cow_inventory() for p in game.get_all_players()]
+
+        with pytest.raises(ValueError):
+            game.handle_bid(10, 1, 0, too_much)
+        with pytest.raises(ValueError):
+            game.handle_trade(20, 1, 1, money[0], too_much, 0, 1)
+        with pytest.raises(ValueError):
+            game.handle_trade(20, 1, 1, too_much, money[1], 0, 1)
+
+        assert [p.get_money_inventory() for p in game.get_all_players()] == money
+        assert [p.get_cow_inventory() for p in game.get_all_players()] == cows
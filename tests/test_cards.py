@@ -0,0 +1,166 @@
+import random
+
+import pytest
+
+from application.play_auction import PlayBidTurn
+from application.play_trade import PlayTradeTurn
+from game.game import Game
+from interface.bot_interface import BotPlayer
+from io_handler.console_outputs import NullOutputHandler
+from player import packed_money
+from player.players import Player
+from return_types.action import ActionType
+
+
+class TestPackedMoney:
+    """Tests for money inventories packed into one int."""
+
+    def test_round_trip(self):
+        """Packing and unpacking keeps every count."""
+        money = [3, 0, 7, 1, 0, 12]
+        assert packed_money.unpack(packed_money.pack(money)) == money
+
+    def test_arithmetic_matches_lists(self):
+        """Add, subtract and affordability agree with the list form."""
+        rng = random.Random(0)
+        for _ in range(500):
+            a = [rng.randint(0, 20) for _ in range(6)]
+            b = [rng.randint(0, 20) for _ in range(6)]
+            packed_a = packed_money.pack(a)
+            packed_b = packed_money.pack(b)
+
+            assert packed_money.unpack(packed_a + packed_b) == [
+                x + y for x, y in zip(a, b)
+            ]
+            can_afford = all(x >= y for x, y in zip(a, b))
+            assert packed_money.can_afford(packed_a, packed_b) == can_afford
+            if can_afford:
+                assert packed_money.unpack(packed_a - packed_b) == [
+                    x - y for x, y in zip(a, b)
+                ]
+
+    def test_player_money(self):
+        """Players keep value and card count up to date and refuse missing cards."""
+        player = Player(0, "Alice")
+        start_value = player.get_money_value()
+        start_count = player.get_money_cards_count()
+
+        player.add_packed_money(packed_money.unit(4))
+        assert player.get_money_value() == start_value + 200
+        assert player.get_money_cards_count() == start_count + 1
+
+        with pytest.raises(ValueError):
+            player.remove_money([0, 0, 0, 0, 0, 1])
+        assert player.get_money_value() == start_value + 200
+
+
+class TestGameBookkeeping:
+    """The incremental bookkeeping of Game matches a full rescan."""
+
+    def test_matches_rescan(self):
+        """Scores, cow owners and active players agree after every action."""
+        for seed in range(20):
+            game = Game(4, ["A", "B", "C", "D"], seed=seed)
+            game.start_game()
+            bots = [BotPlayer(i, seed * 4 + i) for i in range(4)]
+            output = NullOutputHandler()
+            handlers = {
+                ActionType.BID: PlayBidTurn(bots, output, game),
+                ActionType.TRADE: PlayTradeTurn(bots, output, game),
+            }
+
+            for _ in range(200):
+                if game.is_game_over() is not None or game.is_stalled():
+                    break
+                idx = game.get_current_player_idx()
+                action = bots[idx].choose_action(game.get_player_view(idx))
+                handlers[action].execute()
+
+                owners = [
+                    p.get_player_idx()
+                    for p in game.get_all_players()
+                    if p.get_cow_inventory()
+                ]
+                assert game.get_num_players_with_cows() == len(owners)
+                assert game.have_players_cows() == bool(owners)
+                for player in game.get_all_players():
+                    finished = player._cow_cards.cow_finished
+                    assert player.get_score() == sum(finished) * 4 * len(finished)
+                    assert all(
+                        player.get_cow_count(cow) < 4
+                        for cow in set(player.get_cow_inventory())
+                    )
+                    for cow in set(player.get_cow_inventory()):
+                        assert player.get_player_idx() in game.get_players_with_cow(
+                            cow, player.get_cow_count(cow)
+                        )
+                for idx in range(4):
+                    inventory = game.get_player(idx).get_cow_inventory()
+                    expected = {}
+                    for other in game.get_all_players():
+                        joint = sorted(set(inventory) & set(other.get_cow_inventory()))
+                        if other.get_player_idx() != idx and joint:
+                            expected[other.get_player_idx()] = joint
+                    assert game.get_possible_cow_trades(idx) == expected
+                if game.card_stack.is_empty():
+                    assert set(game._active_players) <= set(owners)
+
+
+class TestCardStack:
+    """Tests for the cursor based card stack and seeded games."""
+
+    def test_same_seed_same_game(self):
+        """Games with the same seed deal the same stack and starting player."""
+        games = [Game(4, ["A", "B", "C", "D"], seed=7) for _ in range(2)]
+        for game in games:
+            game.start_game()
+        assert games[0].card_stack._card_stack == games[1].card_stack._card_stack
+        assert games[0].get_current_player_idx() == games[1].get_current_player_idx()
+
+    def test_remaining_counts(self):
+        """Drawing a card lowers the remaining count of its cow type."""
+        game = Game(4, ["A", "B", "C", "D"], seed=0)
+        game.start_game()
+        stack = game.card_stack
+        num_cards = stack.get_num_cards()
+
+        cow = stack.draw_card()
+        assert stack.get_num_cards() == num_cards - 1
+        assert stack.get_remaining_count(cow) == 3
+        assert sum(stack.get_remaining_counts().values()) == num_cards - 1
+        assert game.get_player_view(0).remaining_cows == stack.get_remaining_counts()
+
+
+class TestPlayerViewCache:
+    """Tests for the views cached per game version."""
+
+    def test_cached_until_change(self):
+        """Views are reused until money or cows move, then rebuilt."""
+        game = Game(4, ["A", "B", "C", "D"], seed=0)
+        game.start_game()
+        view = game.get_player_view(1)
+        assert game.get_player_view(1) is view
+        assert game.get_player_view(2).public is view.public
+
+        version = game.get_version()
+        game.handle_bid(10, 1, 2, [1, 0, 0, 0, 0, 0])
+        assert game.get_version() > version
+
+        new_view = game.get_player_view(1)
+        assert new_view is not view
+        assert new_view.public[1].cow_cards == (10, 20)
+        assert new_view.public[0] is view.public[0]
+        assert (
+            new_view.private.money_card_values[0]
+            == view.private.money_card_values[0] - 1
+        )
+
+    def test_views_are_read_only(self):
+        """Shared views can not be changed by a player interface."""
+        game = Game(4, ["A", "B", "C", "D"], seed=0)
+        game.start_game()
+        view = game.get_player_view(0)
+        with pytest.raises(AttributeError):
+            view.public[0].score = 100
+        with pytest.raises(TypeError):
+            view.remaining_cows[10] = 0
@@ -0,0 +1,54 @@
+import json
+import socket
+import threading
+
+from application.distributed import Coordinator, Worker
+from application.tournament import Tournament, play_batch
+from interface.bot_interface import BotPlayer
+
+
+def start_workers(bots, coordinator, count):
+    threads = []
+    for _ in range(count):
+        worker = Worker(bots, *coordinator.address, heartbeat_interval=0.05)
+        thread = threading.Thread(target=worker.run, daemon=True)
+        thread.start()
+        threads.append(thread)
+    return threads
+
+
+class TestDistributed:
+    """Tests for the coordinator and workers on localhost."""
+
+    def test_workers_play_all_batches(self):
+        """Several workers together play every batch of the tournament."""
+        bots = {"a": BotPlayer, "b": BotPlayer}
+        tournament = Tournament(bots, 2, 20, batch_size=5)
+        coordinator = Coordinator(tournament)
+
+        threads = start_workers(bots, coordinator, 3)
+        matchups = coordinator.run()
+        for thread in threads:
+            thread.join(timeout=5)
+
+        assert set(matchups) == {("a", "b"), ("b", "a")}
+        for lineup, matchup in matchups.items():
+            assert matchup == play_batch(lineup, [BotPlayer] * 2, 0, 20, 1000)
+
+    def test_silent_worker_is_replaced(self):
+        """The task of a worker without heartbeat is given to another worker."""
+        bots = {"a": BotPlayer, "b": BotPlayer}
+        tournament = Tournament(bots, 2, 10, batch_size=10)
+        coordinator = Coordinator(tournament, heartbeat_timeout=0.2)
+
+        # takes a task and never answers again
+        silent = socket.create_connection(coordinator.address)
+        silent.sendall(b'{"type": "ready"}\n')
+        task = json.loads(silent.makefile("r").readline())
+        assert task["type"] == "task"
+
+        start_workers(bots, coordinator, 1)
+        matchups = coordinator.run()
+        silent.close()
+
+        assert sum(matchup.games for matchup in matchups.values()) == 20
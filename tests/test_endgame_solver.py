@@ -0,0 +1,64 @@
+import pytest
+from conftest import play_turns
+
+from application.endgame_solver import EndgameSolver, EndgameState
+from application.simulation import play_game, simulate
+from game.game import Game
+from interface.bot_interface import BotPlayer
+from interface.endgame_bot import EndgameBot
+from io_handler.console_outputs import NullOutputHandler
+
+
+def play_to_endgame(seed: int) -> Game:
+    game = Game(4, ["A", "B", "C", "D"], seed=seed)
+    game.start_game()
+    bots = [BotPlayer(i, seed * 4 + i) for i in range(4)]
+    while not game.card_stack.is_empty():
+        play_turns(game, bots, 1)
+    return game
+
+
+class TestEndgameSolver:
+    """The solver of the trades after the stack is empty."""
+
+    def test_state_follows_game(self):
+        """Moves change the EndgameState like they change the game."""
+        solver = EndgameSolver(depth=1)
+        for seed in range(10):
+            game = play_to_endgame(seed)
+            while game.is_game_over() is None and not game.is_stalled():
+                state = EndgameState.from_game(game)
+                _, move = solver.solve(game)
+                if move is None:
+                    game.end_turn()
+                else:
+                    solver.apply(game, move)
+                assert EndgameState.from_game(game) == state.play(move)
+
+    def test_play_out(self):
+        for seed in range(5):
+            game = play_to_endgame(seed)
+            assert EndgameSolver().play_out(game)
+            assert game.is_game_over() is not None
+
+    def test_needs_empty_stack(self):
+        game = Game(4, ["A", "B", "C", "D"], seed=0)
+        game.start_game()
+        with pytest.raises(ValueError):
+            EndgameSolver().solve(game)
+
+    def test_simulation_shortcut(self):
+        results = simulate(
+            10,
+            lambda seed: [BotPlayer(i, seed * 4 + i) for i in range(4)],
+            endgame_solver=EndgameSolver(),
+        )
+        assert all(result.finished for result in results)
+
+    def test_endgame_bot(self):
+        for seed in range(3):
+            game = Game(4, ["A", "B", "C", "D"], seed=seed)
+            game.start_game()
+            bots = [BotPlayer(i, seed * 4 + i) for i in range(3)]
+            bots.append(EndgameBot(3, seed))
+            assert play_game(game, bots, NullOutputHandler())
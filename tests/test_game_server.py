@@ -0,0 +1,129 @@
+import asyncio
+
+import pytest
+
+from application.game_server import GameServer, play_remote
+from interface.bot_interface import BotPlayer
+
+ANSWERS = {"action": "b", "bid": "p", "binary_choice": "n", "int_list": "0,0,0,0,0,0"}
+
+
+def make_answer(delay: float = 0.0):
+    async def answer(kind: str, prompt: str) -> str:
+        await asyncio.sleep(delay)
+        return ANSWERS.get(kind, "0")
+
+    return answer
+
+
+def add_tables(server: GameServer, table_ids: list[str]):
+    for i, table_id in enumerate(table_ids):
+        bots = {idx: BotPlayer(idx, i * 10 + idx) for idx in (1, 2)}
+        server.add_table(table_id, 3, bots, seed=i, max_turns=30)
+
+
+class BrokenBot(BotPlayer):
+    def choose_action(self, view):
+        raise RuntimeError("broken bot")
+
+
+class TestGameServer:
+    """Tables with loopback clients."""
+
+    def test_slow_player_does_not_block_other_tables(self):
+        async def main():
+            server = GameServer()
+            add_tables(server, ["slow", "a", "b"])
+            host, port = await server.start()
+            done = []
+
+            async def client(table_id, delay):
+                result = await play_remote(
+                    host, port, table_id, "Human", make_answer(delay)
+                )
+                done.append(table_id)
+                return result
+
+            results = await asyncio.gather(
+                client("slow", 0.02), client("a", 0), client("b", 0)
+            )
+            return server, await server.run(), results, done
+
+        server, table_results, client_results, done = asyncio.run(main())
+        assert done[-1] == "slow"
+        for table_id, (finished, scores) in zip(["slow", "a", "b"], client_results):
+            assert table_results[table_id].scores == scores
+            assert table_results[table_id].finished == finished
+
+        per_table, total = server.get_latency_stats()
+        assert per_table["slow"].mean > per_table["a"].mean
+        assert total.count == sum(stats.count for stats in per_table.values())
+
+    def test_invalid_answers_are_asked_again(self):
+        async def main():
+            server = GameServer()
+            add_tables(server, ["t"])
+            host, port = await server.start()
+            asked = []
+
+            async def answer(kind, prompt):
+                asked.append(kind)
+                return "nonsense" if len(asked) == 1 else ANSWERS.get(kind, "0")
+
+            result = await play_remote(host, port, "t", "Human", answer)
+            return asked, result, await server.run()
+
+        asked, (finished, scores), table_results = asyncio.run(main())
+        assert asked[0] == asked[1]  # the same question again
+        assert len(scores) == 3
+        assert finished == table_results["t"].finished
+
+    def test_join_and_disconnect(self):
+        async def main():
+            server = GameServer()
+            add_tables(server, ["t"])
+            host, port = await server.start()
+            with pytest.raises(ConnectionError):
+                await play_remote(host, port, "unknown", "Human", make_answer())
+
+            reader, writer = await asyncio.open_connection(host, port)
+            writer.write(b"JOIN t Human\n")
+            assert await reader.readline() == b"SEATED 0\n"
+            writer.close()  # leaves before the first answer
+            return await server.run()
+
+        assert not asyncio.run(main())["t"].finished
+
+    def test_answer_timeout(self):
+        """A player who does not answer ends the game unfinished, not broken."""
+
+        async def main():
+            server = GameServer(answer_timeout=0.05)
+            add_tables(server, ["t"])
+            host, port = await server.start()
+            _, writer = await asyncio.open_connection(host, port)
+            writer.write(b"JOIN t Human\n")
+            results = await server.run()  # the question is never answered
+            writer.close()
+            return server, results
+
+        server, table_results = asyncio.run(main())
+        assert not table_results["t"].finished
+        assert server.tables["t"].error is None
+
+    def test_broken_table(self):
+        """A table which raises ends unfinished, the others are played."""
+
+        async def main():
+            server = GameServer()
+            add_tables(server, ["a"])
+            server.add_table("broken", 2, {0: BrokenBot(0), 1: BrokenBot(1)})
+            host, port = await server.start()
+            result = await play_remote(host, port, "a", "Human", make_answer())
+            return server, result, await server.run()
+
+        server, (finished, _), table_results = asyncio.run(main())
+        assert not table_results["broken"].finished
+        assert isinstance(server.tables["broken"].error, RuntimeError)
+        assert table_results["a"].finished == finished
+        assert server.tables["a"].error is None
@@ -0,0 +1,95 @@
+import pytest
+from conftest import play_turns
+
+from game.game import Game
+from interface.bot_interface import BotPlayer
+from interface.transposition_table import TranspositionTable
+
+
+def new_game(seed: int = 0) -> Game:
+    game = Game(4, ["A", "B", "C", "D"], seed=seed)
+    game.start_game()
+    return game
+
+
+class TestGameHash:
+    """The incremental hash of Game."""
+
+    def test_matches_fresh_hash(self):
+        """The updated hash equals the hash of a freshly restored game."""
+        for seed in range(5):
+            game = new_game(seed)
+            bots = [BotPlayer(i, seed * 4 + i) for i in range(4)]
+            for _ in range(15):
+                assert Game.from_bytes(game.to_bytes()).get_hash() == game.get_hash()
+                play_turns(game, bots, 3)
+
+    def test_transposition(self):
+        """The same position reached in a different order has the same hash."""
+        first, second = new_game(), new_game()
+        first.handle_bid(10, 0, 1, [1, 1, 0, 0, 0, 0])
+        first.handle_bid(10, 2, 3, [0, 0, 1, 0, 0, 0])
+        second.handle_bid(10, 2, 3, [0, 0, 1, 0, 0, 0])
+        second.handle_bid(10, 0, 1, [1, 1, 0, 0, 0, 0])
+        assert first.get_hash() == second.get_hash()
+
+        first.handle_bid(10, 1, 0, [1, 0, 0, 0, 0, 0])
+        assert first.get_hash() != second.get_hash()
+
+    def test_pop_restores_hash(self):
+        """Reverting moves also reverts the hash."""
+        game = new_game(2)
+        bots = [BotPlayer(i, i) for i in range(4)]
+        for _ in range(10):
+            h = game.get_hash()
+            game.push()
+            play_turns(game, bots, 4)
+            game.pop()
+            assert game.get_hash() == h
+            play_turns(game, bots, 2)
+
+    def test_removal_changes_version(self):
+        """Removing a player and undoing it both invalidate the cached views."""
+        game = new_game()
+        version = game.get_version()
+        game.remove_active_player(1)
+        assert game.get_version() != version
+
+        versions = {game.get_version()}
+        for _ in range(3):
+            game.push()
+            game.remove_active_player(2)
+            versions.add(game.get_version())
+            game.pop()
+            versions.add(game.get_version())
+        assert len(versions) == 7
+
+
+class TestTranspositionTable:
+    """The bounded transposition table."""
+
+    def test_hits_and_misses(self):
+        table = TranspositionTable(16)
+        assert table.get(5) is None
+        table.store(5, "a", depth=2)
+        assert table.get(5) == "a"
+        assert table.get(5, min_depth=3) is None
+        assert (table.hits, table.misses) == (1, 2)
+
+    def test_replacement(self):
+        """Deeper entries are kept until a new search starts."""
+        table = TranspositionTable(16)
+        table.store(1, "deep", depth=5)
+        assert not table.store(17, "shallow", depth=1)  # same slot
+        assert table.get(1) == "deep"
+
+        table.new_search()
+        assert table.store(17, "shallow", depth=1)
+        assert table.get(1) is None
+        assert table.get(17) == "shallow"
+        assert len(table) == 1
+        assert table.get_stats()["replacements"] == 1
+
+    def test_size_must_be_power_of_two(self):
+        with pytest.raises(ValueError):
+            TranspositionTable(10)
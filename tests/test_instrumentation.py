@@ -0,0 +1,121 @@
+import tracemalloc
+from functools import partial
+
+import pytest
+
+from application.instrumentation import (
+    HOT_PATHS,
+    OUTSIDE_HOT_PATHS,
+    AllocationProfiler,
+    Profiler,
+    assert_allocation_budget,
+    get_allocations,
+)
+from application.play_auction import PlayBidTurn
+from application.simulation import play_game, simulate
+from game.game import Game
+from interface.bot_interface import BotPlayer
+from io_handler.console_outputs import NullOutputHandler
+
+# bytes allocated by the headless games of seeds 0 to 5, the most is the first game
+# of a fresh interpreter, whose caches are still empty. Measured on Python 3.11
+GAME_ALLOCATION_BASELINE = 77_000
+GAME_ALLOCATION_BUDGET = int(GAME_ALLOCATION_BASELINE * 1.25)
+
+
+def play_games(n_games: int = 20):
+    return simulate(
+        n_games, lambda seed: [BotPlayer(i, seed * 10 + i) for i in range(4)]
+    )
+
+
+def play_headless_game(seed: int = 0):
+    game = Game(4, ["A", "B", "C", "D"], seed=seed)
+    game.start_game()
+    play_game(
+        game, [BotPlayer(i, seed * 10 + i) for i in range(4)], NullOutputHandler()
+    )
+
+
+class TestProfiler:
+    """Opt-in timing of the hot paths."""
+
+    def test_off_leaves_methods_alone(self):
+        execute = PlayBidTurn.execute
+        get_player_view = Game.get_player_view
+        with Profiler() as profiler:
+            assert PlayBidTurn.execute is not execute
+        assert PlayBidTurn.execute is execute
+        assert Game.get_player_view is get_player_view
+        assert not profiler.is_enabled()
+
+    def test_counts_and_exports(self, tmp_path):
+        expected = play_games()
+        with Profiler() as profiler:
+            assert play_games() == expected  # timing does not change the games
+
+        summary = profiler.get_summary()
+        for key in (
+            "PlayBidTurn.execute",
+            "PlayBidTurn._run_auction_loop",
+            "Game.end_turn",
+            "Game.get_player_view",
+            "BotPlayer.choose_action",
+            "BotPlayer.make_bid_decision",
+        ):
+            assert summary[key]["calls"] > 0, key
+            assert sum(summary[key]["histogram_us"].values()) == summary[key]["calls"]
+
+        stacks = profiler.get_folded_stacks()
+        assert "PlayBidTurn.execute;PlayBidTurn._run_auction_loop" in {
+            line.rsplit(" ", 1)[0] for line in stacks
+        }
+        profiler.save_json(str(tmp_path / "profile.json"))
+        profiler.save_folded(str(tmp_path / "profile.folded"))
+        assert (tmp_path / "profile.folded").read_text().count("\n") == len(stacks)
+
+
+class TestAllocationProfiler:
+    """Allocation churn per hot path and the allocation budget of a game."""
+
+    def test_report(self):
+        with AllocationProfiler() as profiler:
+            play_games(3)
+        assert not tracemalloc.is_tracing()
+
+        report = profiler.get_report(limit=5)
+        hot_paths = {f"{owner.__name__}.{name}" for owner, name in HOT_PATHS}
+        assert "PlayBidTurn.execute" in report
+        assert "Game.get_player_view" in report
+        assert set(report) <= hot_paths | {OUTSIDE_HOT_PATHS}
+        for key, entry in report.items():
+            if key != OUTSIDE_HOT_PATHS:
+                assert entry["calls"] > 0, key
+            assert len(entry["lines"]) <= 5
+            for line in entry["lines"]:
+                assert "application/instrumentation.py" not in line["line"]
+        allocated, blocks = profiler.get_totals()
+        assert allocated == sum(entry["bytes"] for entry in report.values())
+        assert blocks == sum(entry["blocks"] for entry in report.values())
+
+    def test_counts_churn(self):
+        """Views which are dropped again count every time they are built"""
+        game = Game(4, ["A", "B", "C", "D"], seed=0)
+        game.start_game()
+        with AllocationProfiler() as profiler:
+            for _ in range(10):
+                game._view_version = None  # drops the cached views, as a move does
+                game.get_player_view(0)
+        once = profiler.get_report()["Game.get_player_view"]["bytes"] / 10
+        assert once > 0
+
+        allocated, _ = get_allocations(lambda: game.get_player_view(0))
+        assert allocated == 0  # cached, nothing new
+
+    def test_allocation_budget(self):
+        for seed in range(3):
+            assert_allocation_budget(
+                partial(play_headless_game, seed), GAME_ALLOCATION_BUDGET
+            )
+        with pytest.raises(AssertionError):
+            assert_allocation_budget(play_headless_game, 100)
@@ -0,0 +1,115 @@
+import random
+
+from conftest import play_turns
+
+from application.simulation import play_game
+from game.game import Game
+from interface.bot_interface import BotPlayer
+from interface.ismcts_bot import (
+    BID,
+    BUY_BACK,
+    EXPLORATION,
+    Determinizer,
+    ISMCTSBot,
+    Node,
+    TreeBot,
+)
+from io_handler.console_outputs import NullOutputHandler
+from return_types.action import ActionType
+
+
+def get_money_totals(game: Game) -> list[int]:
+    return [
+        sum(amounts)
+        for amounts in zip(*(p.get_money_inventory() for p in game.get_all_players()))
+    ]
+
+
+class TestDeterminizer:
+    """Sampled games match everything the player knows."""
+
+    def test_sample_matches_view(self):
+        rng = random.Random(0)
+        for seed in range(5):
+            game = Game(4, ["A", "B", "C", "D"], seed=seed)
+            game.start_game()
+            play_turns(game, [BotPlayer(i, seed * 4 + i) for i in range(4)], 6)
+
+            view = game.get_player_view(1)
+            sample = Determinizer.from_view(view, 1).sample(rng, 1)
+
+            assert (
+                sample.get_player(1).get_money_inventory()
+                == game.get_player(1).get_money_inventory()
+            )
+            assert get_money_totals(sample) == get_money_totals(game)
+            remaining = {cow: n for cow, n in view.remaining_cows.items() if n}
+            sampled_remaining = sample.card_stack.get_remaining_counts()
+            assert {cow: n for cow, n in sampled_remaining.items() if n} == remaining
+            assert (
+                sample.bank._money_inflation_stage == game.bank._money_inflation_stage
+            )
+            for real, sampled in zip(game.get_all_players(), sample.get_all_players()):
+                assert sampled.get_money_cards_count() == real.get_money_cards_count()
+                assert sampled.get_cow_inventory() == real.get_cow_inventory()
+                assert sampled.get_score() == real.get_score()
+
+    def test_bidders_can_pay(self):
+        """Opponents get enough money for the bids they made."""
+        game = Game(4, ["A", "B", "C", "D"], seed=0)
+        game.start_game()
+        determinizer = Determinizer.from_view(game.get_player_view(0), 0)
+        rng = random.Random(0)
+        for _ in range(20):
+            sample = determinizer.sample(rng, 0, True, {2: 200})
+            assert sample.get_player(2).get_money_value() >= 200
+
+
+class TestTree:
+    """The information set tree of the searching player."""
+
+    def test_availability_and_expansion(self):
+        root = Node()
+        for seed in range(3):
+            bot = TreeBot(0, seed, root, EXPLORATION)
+            bot.choose(BID, [None, 10, 20])
+            assert bot.node is None  # left the tree after adding a node
+            bot.update(1.0)
+
+        bot = TreeBot(0, 0, root, EXPLORATION)
+        option = bot.choose(BID, [None, 10])  # 20 is not legal in this game
+        assert option in (None, 10)
+        assert root.children[(BID, 20)].availability == 3
+        assert root.children[(BID, None)].availability == 4
+        assert root.children[(BID, 10)].availability == 4
+
+        bot.choose(BUY_BACK, [True, False])  # a later decision in the same game
+        bot.update(0.0)
+        child = root.children[(BID, option)]
+        assert child.visits == 2
+        assert sorted(node.visits for node in child.children.values()) == [0, 1]
+
+
+class TestISMCTSBot:
+    """The search bot plays legal games."""
+
+    def test_plays_full_games(self):
+        for seed in range(3):
+            game = Game(4, ["A", "B", "C", "D"], seed=seed)
+            game.start_game()
+            bots = [BotPlayer(i, seed * 4 + i) for i in range(3)]
+            bots.append(ISMCTSBot(3, seed, iterations=4))
+            assert play_game(game, bots, NullOutputHandler())
+            assert game.is_game_over() is not None
+
+    def test_root_parallel(self):
+        """Workers search in parallel and their statistics are merged."""
+        game = Game(4, ["A", "B", "C", "D"], seed=0)
+        game.start_game()
+        idx = game.get_current_player_idx()
+        bot = ISMCTSBot(idx, 0, iterations=4, num_workers=2)
+        try:
+            action = bot.choose_action(game.get_player_view(idx))
+        finally:
+            bot.close()
+        assert action in (ActionType.BID, ActionType.TRADE)
@@ -0,0 +1,111 @@
+from conftest import play_turns
+
+from game.game import Game
+from interface.bot_interface import BotPlayer
+
+
+def get_state(game: Game) -> tuple:
+    """Everything push and pop have to restore"""
+    players = []
+    for player in game.get_all_players():
+        cow_cards = player._cow_cards
+        players.append(
+            (
+                player.get_money_inventory(),
+                player.get_money_value(),
+                player.get_money_cards_count(),
+                player.get_cow_inventory(),
+                player.get_score(),
+                list(cow_cards.cow_finished),
+                cow_cards.get_finished_value(),
+                list(cow_cards.get_quartet_candidates()),
+                game.get_possible_cow_trades(player.get_player_idx()),
+            )
+        )
+    return (
+        players,
+        game.card_stack._card_stack,
+        game.card_stack.get_remaining_counts(),
+        game.bank._money_inflation_stage,
+        game.get_current_player_idx(),
+        game.get_current_turn(),
+        list(game._active_players),
+        set(game._changed_players),
+        set(game._players_with_cows),
+        game._checked_all_finished,
+        game.game_is_ongoing,
+    )
+
+
+class TestJournal:
+    """push and pop restore the exact game state."""
+
+    def test_pop_restores_state(self):
+        """Random turns, including donkeys and quartets, are reverted."""
+        for seed in range(10):
+            game = Game(4, ["A", "B", "C", "D"], seed=seed)
+            game.start_game()
+            bots = [BotPlayer(i, seed * 4 + i) for i in range(4)]
+
+            for _ in range(12):
+                state = get_state(game)
+                view = game.get_player_view(game.get_current_player_idx())
+
+                game.push()
+                play_turns(game, bots, 4)
+                game.pop()
+
+                assert get_state(game) == state
+                assert game.get_player_view(game.get_current_player_idx()) == view
+                play_turns(game, bots, 3)
+
+    def test_nested_push(self):
+        """Inner frames are reverted without touching the outer ones."""
+        game = Game(4, ["A", "B", "C", "D"], seed=3)
+        game.start_game()
+        bots = [BotPlayer(i, i) for i in range(4)]
+        start = get_state(game)
+
+        game.push()
+        play_turns(game, bots, 3)
+        middle = get_state(game)
+
+        game.push()
+        play_turns(game, bots, 3)
+        game.pop()
+        assert get_state(game) == middle
+
+        game.pop()
+        assert get_state(game) == start
+        assert game.journal.get_depth() == 0
+
+
+class TestGameBytes:
+    """to_bytes and from_bytes round-trip the game state."""
+
+    def test_round_trip(self):
+        """Restored games match the original at every point of the game."""
+        for seed in range(5):
+            game = Game(4, ["A", "B", "C", "D"], seed=seed)
+            game.start_game()
+            bots = [BotPlayer(i, seed * 4 + i) for i in range(4)]
+
+            for _ in range(15):
+                data = game.to_bytes()
+                assert len(data) < 400
+                restored = Game.from_bytes(data)
+                assert get_state(restored) == get_state(game)
+                assert restored.to_bytes() == data
+                assert restored.rng.getstate() == game.rng.getstate()
+                play_turns(game, bots, 3)
+
+    def test_restored_game_plays_on(self):
+        """Bots with the same seeds play the same game on the restored state."""
+        game = Game(4, ["A", "B", "C", "D"], seed=1)
+        game.start_game()
+        play_turns(game, [BotPlayer(i, i) for i in range(4)], 10)
+
+        restored = Game.from_bytes(game.to_bytes())
+        play_turns(game, [BotPlayer(i, 10 + i) for i in range(4)], 10)
+        play_turns(restored, [BotPlayer(i, 10 + i) for i in range(4)], 10)
+        assert get_state(restored) == get_state(game)
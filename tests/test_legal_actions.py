@@ -0,0 +1,112 @@
+from itertools import islice
+
+from conftest import play_turns
+
+from action_handlers.bidding import BidHandler
+from application.instrumentation import get_peak_memory
+from game.game import Game
+from game_config.game_config import GameConfig
+from interface.bot_interface import BotPlayer
+from player import packed_money
+from player.payment_solver import MoneyPay, iter_offers, iter_payments
+from return_types.action import ActionType
+
+
+def get_value(cards) -> int:
+    return sum(k * v for k, v in zip(cards, GameConfig.MONEY_CARD_VALUES))
+
+
+# far too many payments and offers to build them all
+LARGE_MONEY = [0, 1000, 1000, 1000, 1000, 1000]
+
+
+def new_game(seed: int = 0) -> Game:
+    game = Game(4, ["A", "B", "C", "D"], seed=seed)
+    game.start_game()
+    return game
+
+
+class TestPaymentGenerators:
+    """Payments and trade offers of a money inventory."""
+
+    def test_payments_are_not_dominated(self):
+        packed = packed_money.pack([1, 3, 2, 1, 1, 0])
+        payments = list(iter_payments(60, packed))
+        assert payments
+        for cards in payments:
+            assert get_value(cards) >= 60
+            assert not cards[0]  # a card without value is never needed
+            for i, k in enumerate(cards):  # no card can be left out
+                if k:
+                    assert get_value(cards) - GameConfig.MONEY_CARD_VALUES[i] < 60
+        assert len(set(payments)) == len(payments)
+
+    def test_cheapest_payment_first(self):
+        packed = packed_money.pack([0, 3, 2, 1, 1, 0])
+        for target in (10, 40, 60, 120, 300):
+            first = next(iter_payments(target, packed))
+            assert list(first) == MoneyPay().optimal_pay_packed(target, packed)
+        assert list(iter_payments(1000, packed)) == []
+
+    def test_offers(self):
+        offers = list(iter_offers(packed_money.pack([2, 2, 1, 0, 0, 0])))
+        keys = [(get_value(cards), sum(cards)) for cards in offers]
+        assert keys == sorted(set(keys))
+        assert offers[0] == (0,) * 6
+        assert (2, 2, 1, 0, 0, 0) in offers
+
+    def test_lazy(self):
+        """The first items of a large inventory come without building the rest."""
+        packed = packed_money.pack(LARGE_MONEY)
+        payments = iter_payments(100_000, packed)
+        offers = iter_offers(packed)
+        peak = get_peak_memory(lambda: (next(payments), next(offers)))
+        assert peak < 100_000
+        assert next(iter_payments(100_000, packed)) == (0, 0, 0, 0, 0, 200)
+        offers = list(islice(iter_offers(packed), 3))
+        assert offers == [(0,) * 6, (0, 1, 0, 0, 0, 0), (0, 2, 0, 0, 0, 0)]
+
+
+class TestLegalActions:
+    """The legal action generators of Game."""
+
+    def test_bids(self):
+        game = new_game()
+        bid_handler = BidHandler(0, 4, 10)
+        bids = list(game.iter_legal_actions(ActionType.BID, 1, bid_handler))
+        assert bids[0] is None
+        assert bids[1:] == list(range(10, game.get_player(1).get_money_value() + 1, 10))
+        assert list(game.iter_bids(0, bid_handler)) == []  # the bid master
+
+    def test_buy_backs(self):
+        game = new_game()
+        bid_handler = BidHandler(0, 4, 10)
+        assert list(game.iter_buy_backs(bid_handler)) == [False]
+        bid_handler.place_bid(game.get_player(2), 50)
+        assert list(game.iter_buy_backs(bid_handler)) == [False, True]
+
+    def test_trades_are_legal(self):
+        game = new_game(3)
+        play_turns(game, [BotPlayer(i, i) for i in range(4)], 6)
+        idx = game.get_current_player_idx()
+        player = game.get_player(idx)
+        trades = list(islice(game.iter_legal_actions(ActionType.TRADE), 200))
+        assert bool(trades) == (ActionType.TRADE in game.iter_actions())
+
+        values = [get_value(offer.amount) for *_, offer in trades]
+        assert values == sorted(values)
+        for enemy_idx, cow_card, amount, offer in trades:
+            assert enemy_idx != idx
+            assert player.has_cow(cow_card, amount)
+            assert game.get_player(enemy_idx).has_cow(cow_card, amount)
+            assert player.has_enough_money(offer.amount)
+
+    def test_trades_are_lazy(self):
+        cows = [[10, 10], [10], [], []]
+        game = Game.from_state(
+            ["A", "B", "C", "D"], [], [LARGE_MONEY] + [[0] * 6] * 3, cows, [[]] * 4, 0
+        )
+        trades = game.iter_trades()
+        peak = get_peak_memory(lambda: next(trades))
+        assert peak < 100_000
+        assert next(game.iter_trades())[:3] == (1, 10, 1)
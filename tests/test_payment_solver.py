@@ -0,0 +1,119 @@
+import itertools
+import random
+
+from game_config.game_config import GameConfig
+from player.payment_index import PaymentIndex
+from player.payment_solver import MoneyPay, cards_then_overpay
+from player.players import Player
+
+
+def brute_force_pay(target_value, money_cards_amount):
+    """Tries every combination of money cards"""
+    best = None
+    for payment in itertools.product(*(range(a + 1) for a in money_cards_amount)):
+        paid = sum(a * b for a, b in zip(payment, GameConfig.MONEY_CARD_VALUES))
+        if paid < target_value:
+            continue
+        key = (paid - target_value, sum(payment))
+        if best is None or key < best:
+            best = key
+    return best
+
+
+class TestMoneyPay:
+    """Tests for the payment solver."""
+
+    def test_matches_brute_force(self):
+        """The knapsack solution has the same overpay and card count as brute force."""
+        rng = random.Random(0)
+        solver = MoneyPay()
+        for _ in range(200):
+            inventory = [rng.randint(0, 3) for _ in GameConfig.MONEY_CARD_VALUES]
+            total = sum(a * b for a, b in zip(inventory, GameConfig.MONEY_CARD_VALUES))
+            target = rng.randint(0, total)
+
+            payment = solver.optimal_pay(target, inventory)
+            paid = sum(a * b for a, b in zip(payment, GameConfig.MONEY_CARD_VALUES))
+
+            assert all(p <= a for p, a in zip(payment, inventory))
+            assert (paid - target, sum(payment)) == brute_force_pay(target, inventory)
+
+    def test_not_enough_money(self):
+        """Returns None if the inventory cannot pay the target."""
+        assert MoneyPay().optimal_pay(1000, [3, 3, 2, 0, 0, 0]) is None
+
+    def test_cost_function(self):
+        """A custom cost function changes the tradeoff between cards and overpay."""
+        inventory = [0, 4, 0, 0, 0, 1]
+
+        assert MoneyPay().optimal_pay(40, inventory) == [0, 4, 0, 0, 0, 0]
+        assert MoneyPay(cards_then_overpay).optimal_pay(40, inventory) == [
+            0,
+            0,
+            0,
+            0,
+            0,
+            1,
+        ]
+
+    def test_cache_is_shared(self):
+        """Solvers of different players share the cached payments."""
+        MoneyPay.clear_cache()
+        alice = Player(0, "Alice")
+        bob = Player(1, "Bob")
+
+        alice.get_optimal_payment(40)
+        bob.get_optimal_payment(40)
+
+        info = MoneyPay.cache_info()
+        assert info.misses == 1
+        assert info.hits == 1
+
+
+class TestPaymentIndex:
+    """Tests for the reachable payment index."""
+
+    def test_matches_solver(self):
+        """The index knows the same minimal payment as the solver."""
+        rng = random.Random(1)
+        player = Player(0, "Alice")
+        for _ in range(100):
+            money = [rng.randint(0, 2) for _ in GameConfig.MONEY_CARD_VALUES]
+            if rng.random() < 0.5:
+                player.add_money(money)
+            elif player.has_enough_money(money):
+                player.remove_money(money)
+
+            target = rng.randint(0, player.get_money_value())
+            payment = player.get_optimal_payment(target)
+            paid = sum(a * b for a, b in zip(payment, GameConfig.MONEY_CARD_VALUES))
+
+            assert player.get_min_payment(target) == paid
+            assert player.get_min_payment_cards(paid) == sum(payment[1:])
+
+    def test_incremental_updates(self):
+        """Adding and removing cards in place equals building the index anew."""
+        rng = random.Random(2)
+        money = [0] * len(GameConfig.MONEY_CARD_VALUES)
+        index = PaymentIndex(money)
+        for _ in range(60):
+            change = [rng.randint(0, 2) for _ in money]
+            if rng.random() < 0.5:
+                index.add_money(change)
+                money = [a + b for a, b in zip(money, change)]
+            elif all(a >= b for a, b in zip(money, change)):
+                index.remove_money(change)
+                money = [a - b for a, b in zip(money, change)]
+
+            fresh = PaymentIndex(money)
+            total = sum(a * b for a, b in zip(money, GameConfig.MONEY_CARD_VALUES))
+            for value in range(0, total + 20, 10):
+                assert index.min_payment(value) == fresh.min_payment(value)
+                assert index.min_cards(value) == fresh.min_cards(value)
+
+    def test_unreachable_payment(self):
+        """Targets above the total money have no payment."""
+        player = Player(0, "Alice")
+
+        assert player.get_min_payment(player.get_money_value() + 10) is None
+        assert player.get_min_payment_cards(5) is None
@@ -0,0 +1,99 @@
+import pytest
+from conftest import play_turns
+
+from application.replay import ReplayEngine
+from application.simulation import play_game
+from game.event_log import EventLog, EventType
+from game.game import Game
+from interface.bot_interface import BotPlayer
+from io_handler.console_outputs import NullOutputHandler
+
+
+def record_game(seed: int, keyframe_interval: int = 3) -> tuple[Game, EventLog]:
+    game = Game(4, ["A", "B", "C", "D"], seed=seed)
+    game.start_game()
+    event_log = EventLog(keyframe_interval)
+    game.set_event_log(event_log)
+    play_game(game, [BotPlayer(i, seed * 4 + i) for i in range(4)], NullOutputHandler())
+    return game, event_log
+
+
+class TestEventLog:
+    """The binary event log."""
+
+    def test_round_trip(self):
+        event_log = EventLog()
+        event_log.record(EventType.BID, 2, 150)
+        event_log.record(EventType.TRADE_OFFER, 1, [0, 1, 2, 0, 0, 0])
+        event_log.add_keyframe(10, b"snapshot")
+        event_log.record(EventType.END_TURN)
+
+        loaded = EventLog.from_bytes(event_log.to_bytes())
+        events = [
+            (event_type, fields) for event_type, fields, _ in loaded.iter_events()
+        ]
+        assert events == [
+            (EventType.BID, (2, 150)),
+            (EventType.TRADE_OFFER, (1, [0, 1, 2, 0, 0, 0])),
+            (EventType.KEYFRAME, (10, b"snapshot")),
+            (EventType.END_TURN, ()),
+        ]
+        assert loaded.get_keyframe_offset(12) == event_log.get_keyframe_offset(10)
+        with pytest.raises(ValueError):
+            loaded.get_keyframe_offset(9)
+
+    def test_records_game(self):
+        _, event_log = record_game(0)
+        event_types = {event_type for event_type, _, _ in event_log.iter_events()}
+        assert {
+            EventType.CARD_DRAWN,
+            EventType.PAYMENT,
+            EventType.END_TURN,
+            EventType.KEYFRAME,
+        } <= event_types
+
+    def test_hypothetical_moves_are_not_recorded(self):
+        game = Game(4, ["A", "B", "C", "D"], seed=0)
+        game.start_game()
+        event_log = EventLog()
+        game.set_event_log(event_log)
+        size = len(event_log)
+        game.push()
+        play_turns(game, [BotPlayer(i, i) for i in range(4)], 3)
+        game.pop()
+        assert len(event_log) == size
+
+
+class TestReplayEngine:
+    """Replays rebuild the recorded games."""
+
+    def test_replay_matches(self):
+        for seed in range(10):
+            game, event_log = record_game(seed)
+            replayed = ReplayEngine(EventLog.from_bytes(event_log.to_bytes())).replay()
+            assert replayed.to_bytes() == game.to_bytes()
+
+    def test_seek(self):
+        game = Game(4, ["A", "B", "C", "D"], seed=1)
+        game.start_game()
+        event_log = EventLog(3)
+        game.set_event_log(event_log)
+        bots = [BotPlayer(i, 4 + i) for i in range(4)]
+        snapshots = {}
+        while game.is_game_over() is None and game.get_current_turn() < 12:
+            snapshots.setdefault(game.get_current_turn(), game.to_bytes())
+            play_turns(game, bots, 1)
+
+        engine = ReplayEngine(event_log)
+        for turn, snapshot in snapshots.items():
+            assert engine.seek(turn).to_bytes() == snapshot
+
+    def test_detects_mismatch(self):
+        _, event_log = record_game(2)
+        data = bytearray(event_log.to_bytes())
+        _, _, offset = next(
+            event for event in event_log.iter_events() if event[0] == EventType.PAYMENT
+        )
+        data[offset + 5] ^= 1  # another player gets the cow
+        with pytest.raises(ValueError):
+            ReplayEngine(EventLog.from_bytes(bytes(data))).replay()
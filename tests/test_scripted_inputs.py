@@ -0,0 +1,60 @@
+from pathlib import Path
+
+import pytest
+
+from application.simulation import play_scripted_game
+from io_handler.scripted_inputs import ScriptedInputHandler
+from return_types.action import ActionType
+
+FULL_GAME = Path(__file__).parent.parent / "data" / "full_game.txt"
+
+
+def write_transcript(tmp_path, lines: list[str]) -> str:
+    path = tmp_path / "transcript.txt"
+    path.write_text("\n".join(lines))
+    return str(path)
+
+
+class TestScriptedInputHandler:
+    """Answers from a transcript file."""
+
+    def test_skips_invalid_answers(self, tmp_path):
+        path = write_transcript(tmp_path, ["x", "t", "-5", "2", "maybe", "10", "1"])
+        handler = ScriptedInputHandler(["A", "B", "C"], path)
+        assert handler.ask_for_action(0) == ActionType.TRADE
+        assert handler.ask_for_trade({}) == (2, 10, 1)
+        assert handler.get_num_remaining() == 0
+        with pytest.raises(EOFError):
+            handler.ask_for_action(0)
+
+    def test_empty_transcript(self, tmp_path):
+        handler = ScriptedInputHandler(["A", "B"], write_transcript(tmp_path, []))
+        with pytest.raises(EOFError):
+            handler.ask_for_action(0)
+
+    def test_scripted_bid_turn(self, tmp_path):
+        path = write_transcript(tmp_path, ["b", "p", "p", "p", "n"])
+        game, finished = play_scripted_game(path, ["A", "B", "C", "D"], seed=0)
+        assert not finished  # the transcript ends after the first turn
+        assert game.get_current_turn() == 1
+
+    def test_full_game_transcript(self):
+        """The recorded 4 player game replays to the same end"""
+        game, finished = play_scripted_game(
+            str(FULL_GAME), ["Alice", "Bob", "Charlie", "David"], seed=0
+        )
+        assert finished
+        assert game.get_current_turn() == 10
+        assert [player.get_score() for player in game.get_all_players()] == [
+            0,
+            40,
+            80,
+            0,
+        ]
+        assert not game.have_players_cows()
+        assert [player.get_money_inventory() for player in game.get_all_players()] == [
+            [3, 5, 3, 1, 1, 1],
+            [3, 2, 3, 1, 1, 1],
+            [3, 2, 3, 1, 1, 1],
+            [3, 3, 3, 1, 1, 1],
+        ]
@@ -0,0 +1,60 @@
+from functools import partial
+
+import pytest
+
+from application.simulation import simulate
+from application.tournament import Tournament, play_batch
+from interface.bot_interface import BotPlayer
+
+
+def make_bots(num_players):
+    return lambda game_seed: [
+        BotPlayer(i, game_seed * 10 + i) for i in range(num_players)
+    ]
+
+
+class TestSimulation:
+    """Tests for headless bot games."""
+
+    def test_one_result_per_game(self):
+        """Every game returns scores for all players."""
+        results = simulate(20, make_bots(4), seed=5)
+
+        assert [res.seed for res in results] == list(range(5, 25))
+        for res in results:
+            assert len(res.scores) == 4
+            assert res.turns > 0
+
+    def test_games_finish(self):
+        """Four players can collect every cow, so all games finish."""
+        results = simulate(20, make_bots(4))
+
+        assert all(res.finished for res in results)
+        assert all(sum(res.scores) > 0 for res in results)
+
+    def test_same_seed_same_games(self):
+        """Games are reproducible for a given seed."""
+        assert simulate(10, make_bots(3), seed=1) == simulate(10, make_bots(3), seed=1)
+
+
+class TestTournament:
+    """Tests for the process pool tournament."""
+
+    @pytest.fixture
+    def tournament(self):
+        bots = {"random": BotPlayer, "trader": partial(BotPlayer, trade_chance=0.9)}
+        return Tournament(bots, 2, 30, batch_size=8, max_workers=2)
+
+    def test_lineups(self, tournament):
+        """Every seating with at least two different bots is played."""
+        assert tournament.get_lineups() == [("random", "trader"), ("trader", "random")]
+
+    def test_matches_serial_games(self, tournament):
+        """Merged batches give the same result as playing all games in one batch."""
+        matchups = tournament.run()
+
+        for lineup, matchup in matchups.items():
+            bots = [tournament.bots[name] for name in lineup]
+            assert matchup == play_batch(lineup, bots, 0, 30, tournament.max_turns)
+            assert matchup.games == 30
+            assert sum(matchup.get_win_rates()) == pytest.approx(1.0)